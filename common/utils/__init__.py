@@ -1,4 +1,6 @@
 from .imgbb import ImgBBAPI, ExternalAPIManager
 from .context_processors import user_context
 from .sse import *
+from .view_counter import view_count_buffer, record_view
+from .keyset import KeysetPaginator, KeysetPage, InvalidCursor, encode_cursor, decode_cursor
 from .email import send_password_reset_email
@@ -0,0 +1,162 @@
+from functools import cached_property
+from django.core import signing
+from django.db.models import Q
+from constants import KEYSET_MAX_PAGE_SIZE, KEYSET_COUNT_CAP, KEYSET_CURSOR_SALT
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was tampered with or built for another list"""
+
+
+def encode_cursor(values, direction=CURSOR_NEXT):
+    """Opaque, signed token for a position in an ordered list"""
+    return signing.Signer(salt=KEYSET_CURSOR_SALT).sign_object([direction, list(values)])
+
+
+def decode_cursor(cursor):
+    """
+    Returns:
+        Tuple of (direction, values)
+
+    Raises:
+        InvalidCursor: if the token is not a cursor issued by encode_cursor
+    """
+    try:
+        direction, values = signing.Signer(salt=KEYSET_CURSOR_SALT).unsign_object(cursor)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidCursor("Invalid pagination cursor")
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or not isinstance(values, list):
+        raise InvalidCursor("Invalid pagination cursor")
+    return direction, values
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator, iterable like a Django Page"""
+
+    def __init__(self, object_list, paginator, next_cursor=None, prev_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Seek pagination over a queryset.
+
+    Instead of `COUNT(*)` plus `OFFSET n`, a page is fetched with
+    `WHERE (ordering keys) after/before the cursor LIMIT per_page + 1`, which
+    stays an index range scan however deep the reader goes. `ordering` names
+    concrete fields of the model and must end with a unique one (usually
+    '-id' or 'id') so every row has a distinct position.
+
+    `count` is optional and approximate: it counts at most `count_cap` rows,
+    `count_capped` tells whether there are more.
+    """
+
+    def __init__(self, queryset, ordering, per_page, max_per_page=KEYSET_MAX_PAGE_SIZE,
+                 count_cap=KEYSET_COUNT_CAP):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = max(1, min(int(per_page), max_per_page))
+        self.count_cap = count_cap
+        self._fields = [
+            (name.lstrip('-'), name.startswith('-'), queryset.model._meta.get_field(name.lstrip('-')))
+            for name in self.ordering
+        ]
+
+    def _key(self, obj):
+        return [field.value_to_string(obj) for _, _, field in self._fields]
+
+    def _seek(self, values, forward):
+        """Rows strictly after (forward) or before the position `values`"""
+        if len(values) != len(self._fields):
+            raise InvalidCursor("Invalid pagination cursor")
+        try:
+            values = [field.to_python(value) for (_, _, field), value in zip(self._fields, values)]
+        except Exception:
+            raise InvalidCursor("Invalid pagination cursor")
+
+        condition = Q()
+        equal = Q()
+        for (name, descending, _), value in zip(self._fields, values):
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _reversed_ordering(self):
+        return [name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering]
+
+    def get_page(self, cursor=None):
+        """
+        Page after/before `cursor` (first page for an empty cursor).
+
+        Raises:
+            InvalidCursor: for a malformed or tampered cursor
+        """
+        if not cursor:
+            rows = list(self.queryset.order_by(*self.ordering)[:self.per_page + 1])
+            has_next, has_previous = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+        else:
+            direction, values = decode_cursor(cursor)
+            if direction == CURSOR_NEXT:
+                rows = list(
+                    self.queryset.filter(self._seek(values, forward=True))
+                    .order_by(*self.ordering)[:self.per_page + 1]
+                )
+                has_next, has_previous = len(rows) > self.per_page, True
+                rows = rows[:self.per_page]
+            else:
+                rows = list(
+                    self.queryset.filter(self._seek(values, forward=False))
+                    .order_by(*self._reversed_ordering())[:self.per_page + 1]
+                )
+                has_next, has_previous = True, len(rows) > self.per_page
+                rows = rows[:self.per_page][::-1]
+
+        return KeysetPage(
+            rows,
+            self,
+            next_cursor=encode_cursor(self._key(rows[-1]), CURSOR_NEXT) if rows and has_next else None,
+            prev_cursor=encode_cursor(self._key(rows[0]), CURSOR_PREVIOUS) if rows and has_previous else None,
+        )
+
+    @cached_property
+    def _capped_count(self):
+        if self.count_cap is None:
+            return self.queryset.count()
+        # COUNT over a LIMITed subquery: stops scanning after count_cap + 1 rows
+        return self.queryset.order_by()[:self.count_cap + 1].count()
+
+    @property
+    def count(self):
+        if self.count_cap is None:
+            return self._capped_count
+        return min(self._capped_count, self.count_cap)
+
+    @property
+    def count_capped(self):
+        return self.count_cap is not None and self._capped_count > self.count_cap
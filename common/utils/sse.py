@@ -1,8 +1,10 @@
 import json
 import asyncio
 import logging
+import time
 import weakref
-from typing import Dict, Set, Optional
+from collections import defaultdict, deque, OrderedDict
+from typing import Dict, Iterable, List, Set, Optional, Tuple
 from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.core.serializers.json import DjangoJSONEncoder
@@ -11,80 +13,196 @@ from django.apps import AppConfig
 from constants import (
     MAX_TIME_RETRY_CONNECTION,
     MAX_QUEUE_SIZE,
-    DEFAULT_TIMEOUT
+    SSE_SHARD_COUNT,
+    SSE_HEARTBEAT_TICK,
+    SSE_EVENT_LOG_SIZE,
+    SSE_EVENT_LOG_USERS,
+    SSE_REPLAY_MAX_EVENTS,
 )
+from .sse_broker import SSEBroker, InMemorySSEBroker, PostgresSSEBroker, get_sse_broker
 
 logger = logging.getLogger(__name__)
 
 
-class SSEManager:
+class _SSEShard:
+    """Connections of the users hashed to one shard, behind their own lock"""
+
     def __init__(self):
         self.connections: Dict[int, Set] = {}
-        self._lock = asyncio.Lock()
+        self.lock = asyncio.Lock()
+
+
+class SSEEventLog:
+    """
+    Bounded per-user ring buffer of the events delivered in this process.
+
+    Only events with an id are logged (notifications, whose event id is
+    the Notification id). The log of a user is complete from its floor:
+    the first id recorded, raised to each id pushed out of the ring. A
+    Last-Event-ID at or above the floor is replayed from memory, older
+    ones need the database. The least recently used logs are dropped
+    beyond `max_users`.
+    """
+
+    def __init__(self, size: int = SSE_EVENT_LOG_SIZE, max_users: int = SSE_EVENT_LOG_USERS):
+        self.size = size
+        self.max_users = max_users
+        self._events: OrderedDict = OrderedDict()
+        self._floors: Dict[int, int] = {}
+
+    def record(self, user_id: int, event_id: int, message: str):
+        events = self._events.get(user_id)
+        if events is None:
+            events = self._events[user_id] = deque(maxlen=self.size)
+            self._floors[user_id] = event_id
+            if len(self._events) > self.max_users:
+                dropped, _ = self._events.popitem(last=False)
+                del self._floors[dropped]
+        else:
+            self._events.move_to_end(user_id)
+            if len(events) == self.size:
+                self._floors[user_id] = max(self._floors[user_id], events[0][0])
+        events.append((event_id, message))
+
+    def covers(self, user_id: int, last_event_id: int) -> bool:
+        """Whether every event of the user after `last_event_id` is in the log"""
+        floor = self._floors.get(user_id)
+        return floor is not None and last_event_id >= floor
+
+    def since(self, user_id: int, last_event_id: int) -> List[Tuple[int, str]]:
+        """Logged (event_id, message) pairs of the user after `last_event_id`"""
+        return [(event_id, message) for event_id, message in self._events.get(user_id, ())
+                if event_id > last_event_id]
+
+
+class SSEManager:
+    """
+    Process-local registry of open SSE streams, sharded by user id.
+
+    Each shard has its own lock, so registering, removing and delivering
+    to users of different shards never wait on each other. Messages are
+    published through a pluggable broker (settings.SSE_BROKER): the
+    in-memory broker delivers within this process, the PostgreSQL broker
+    reaches the streams held by every worker. Delivered events with an id
+    are kept in `event_log` for Last-Event-ID replay.
+    """
+
+    def __init__(self, shard_count: int = SSE_SHARD_COUNT, broker: Optional[SSEBroker] = None,
+                 event_log: Optional[SSEEventLog] = None):
+        self._shards = [_SSEShard() for _ in range(shard_count)]
+        self._broker = broker
+        self.event_log = SSEEventLog() if event_log is None else event_log
         self._shutdown = False
 
-    async def add_connection(self, user_id: int, connection):
-        async with self._lock:
-            if user_id not in self.connections:
-                self.connections[user_id] = set()
-            self.connections[user_id].add(connection)
+    @property
+    def broker(self) -> SSEBroker:
+        if self._broker is None:
+            self._broker = get_sse_broker()
+        return self._broker
+
+    def _shard(self, user_id: int) -> _SSEShard:
+        return self._shards[user_id % len(self._shards)]
+
+    def has_connection(self, user_id: int) -> bool:
+        """Whether this process holds a stream of the user"""
+        return bool(self._shard(user_id).connections.get(user_id))
+
+    def connection_count(self) -> int:
+        return sum(len(conns) for shard in self._shards for conns in shard.connections.values())
+
+    async def add_connection(self, user_id: int, connection,
+                             last_event_id: Optional[int] = None) -> List[Tuple[int, str]]:
+        """
+        Register a stream of the user.
+
+        Returns:
+            Logged events after `last_event_id`, read under the shard lock
+            so none of them is also queued on the new connection
+        """
+        await self.broker.start(self.deliver)
+        shard = self._shard(user_id)
+        async with shard.lock:
+            shard.connections.setdefault(user_id, set()).add(connection)
+            missed = [] if last_event_id is None else self.event_log.since(user_id, last_event_id)
         logger.info(f"Added SSE connection for user {user_id}")
+        return missed
 
     async def remove_connection(self, user_id: int, connection):
-        async with self._lock:
-            if user_id in self.connections:
-                self.connections[user_id].discard(connection)
-                if not self.connections[user_id]:
-                    del self.connections[user_id]
+        shard = self._shard(user_id)
+        async with shard.lock:
+            if user_id in shard.connections:
+                shard.connections[user_id].discard(connection)
+                if not shard.connections[user_id]:
+                    del shard.connections[user_id]
         logger.info(f"Removed SSE connection for user {user_id}")
 
-    async def send_to_user(self, user_id: int, data: dict):
-        """Gửi data đến user"""
+    async def send_to_user(self, user_id: int, data: dict, event_id: Optional[int] = None):
+        """
+        Gửi data đến user (qua broker, tới mọi worker đang giữ stream của user)
+
+        Events sent with an increasing `event_id` are logged and replayed
+        to streams reconnecting with an older Last-Event-ID.
+        """
         if self._shutdown:
             return
-            
-        async with self._lock:
-            if user_id not in self.connections:
-                return
-            connections = list(self.connections[user_id])
+        await self.broker.publish(user_id, self._format_sse_message(data, event_id), event_id)
 
-        message = self._format_sse_message(data)
-        dead_connections = set()
+    async def send_to_users(self, events: Iterable[Tuple[int, dict, Optional[int]]]):
+        """Publish (user_id, data, event_id) events as one broker batch"""
+        if self._shutdown:
+            return
+        await self.broker.publish_many([
+            (user_id, self._format_sse_message(data, event_id), event_id)
+            for user_id, data, event_id in events
+        ])
+
+    async def deliver(self, user_id: int, message: str, event_id: Optional[int] = None):
+        """Put a published message on this process's streams of the user"""
+        if self._shutdown:
+            return
+        shard = self._shard(user_id)
+        async with shard.lock:
+            if event_id is not None:
+                self.event_log.record(user_id, event_id, message)
+            connections = list(shard.connections.get(user_id, ()))
 
+        dead_connections = set()
         for connection in connections:
             try:
                 if hasattr(connection, 'send_message'):
-                    await connection.send_message(message)
+                    await connection.send_message(message, event_id)
             except Exception as e:
                 logger.error(f"Error sending to connection: {e}")
                 dead_connections.add(connection)
 
         if dead_connections:
-            async with self._lock:
+            async with shard.lock:
                 for dc in dead_connections:
-                    if user_id in self.connections:
-                        self.connections[user_id].discard(dc)
-                if user_id in self.connections and not self.connections[user_id]:
-                    del self.connections[user_id]
+                    if user_id in shard.connections:
+                        shard.connections[user_id].discard(dc)
+                if user_id in shard.connections and not shard.connections[user_id]:
+                    del shard.connections[user_id]
 
     async def shutdown(self):
         """Graceful shutdown tất cả connections"""
         self._shutdown = True
-        async with self._lock:
-            all_connections = []
-            for user_connections in self.connections.values():
-                all_connections.extend(user_connections)
-            
-            for connection in all_connections:
-                try:
-                    connection.close()
-                except Exception as e:
-                    logger.error(f"Error closing connection: {e}")
-            
-            self.connections.clear()
-
-    def _format_sse_message(self, data: dict) -> str:
+        for shard in self._shards:
+            async with shard.lock:
+                for user_connections in shard.connections.values():
+                    for connection in user_connections:
+                        try:
+                            connection.close()
+                        except Exception as e:
+                            logger.error(f"Error closing connection: {e}")
+                shard.connections.clear()
+        if self._broker is not None:
+            await self._broker.stop()
+
+    @staticmethod
+    def _format_sse_message(data: dict, event_id: Optional[int] = None) -> str:
         json_data = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+        if event_id is not None:
+            return f"id: {event_id}\ndata: {json_data}\n\n"
         return f"data: {json_data}\n\n"
 
 
@@ -92,50 +210,209 @@ class SSEManager:
 sse_manager = SSEManager()
 
 
+# Queued by close(): wakes the stream's single pending get() and ends it
+_CLOSED = object()
+
+
 class ASGISSEConnection:
     def __init__(self, user_id: int):
         self.user_id = user_id
         self.message_queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)  # Giới hạn queue size
         self.closed = False
+        self.last_sent = time.monotonic()
         self._close_event = asyncio.Event()
 
-    async def send_message(self, message: str):
+    def _put(self, message) -> bool:
+        try:
+            # Never wait on a slow reader: other users share the sender
+            self.message_queue.put_nowait(message)
+        except asyncio.QueueFull:
+            return False
+        self.last_sent = time.monotonic()
+        return True
+
+    async def send_message(self, message: str, event_id: Optional[int] = None):
+        if self.closed or self._put(message):
+            return
+        if event_id is None:
+            logger.warning(f"Message queue full for user {self.user_id}, dropping message")
+        else:
+            # The client reconnects with its Last-Event-ID and gets the event replayed
+            logger.warning(f"Message queue full for user {self.user_id}, closing stream for replay")
+            self.close()
+
+    def send_heartbeat(self, message: str):
+        """Queue a heartbeat (called by HeartbeatWheel, a full queue needs none)"""
         if not self.closed:
-            try:
-                # Non-blocking put với timeout
-                await asyncio.wait_for(
-                    self.message_queue.put(message), 
-                    timeout=1.0
-                )
-            except asyncio.TimeoutError:
-                logger.warning(f"Message queue full for user {self.user_id}, dropping message")
+            self._put(message)
 
     async def get_message(self, timeout=1.0):
-        """Lấy message với timeout"""
-        if self.closed:
+        """Lấy message (None khi đóng kết nối hoặc hết timeout)"""
+        if self.closed and self.message_queue.empty():
             return None
-            
         try:
-            return await asyncio.wait_for(self.message_queue.get(), timeout=timeout)
+            message = await asyncio.wait_for(self.message_queue.get(), timeout=timeout)
         except asyncio.TimeoutError:
             return None
+        return None if message is _CLOSED else message
 
     def close(self):
+        if self.closed:
+            return
         self.closed = True
         self._close_event.set()
+        if self.message_queue.full():
+            self.message_queue.get_nowait()
+        self.message_queue.put_nowait(_CLOSED)
 
     async def wait_for_close(self):
         """Wait for connection to be closed"""
         await self._close_event.wait()
 
 
-async def sse_event_stream(user_id: int):
+class HeartbeatWheel:
+    """
+    Timer wheel sending heartbeats to idle streams.
+
+    One task per event loop ticks every `tick` seconds for all connections
+    together, instead of every stream waking up on its own timer. A
+    connection sits in the bucket of the tick its heartbeat is due; when
+    that bucket fires, connections that sent something in the meantime
+    are moved to their new due tick, idle ones get the tick's heartbeat
+    (formatted once) and are rescheduled.
+    """
+
+    def __init__(self, interval=MAX_TIME_RETRY_CONNECTION, tick=SSE_HEARTBEAT_TICK, clock=time.monotonic):
+        self.interval = interval
+        self.tick = tick
+        self.clock = clock
+        self._buckets = defaultdict(set)
+        self._last_tick = self._tick_of(clock())
+        self._task = None
+
+    def _tick_of(self, moment) -> int:
+        return int(moment // self.tick)
+
+    def _schedule(self, connection):
+        due = self._tick_of(connection.last_sent + self.interval)
+        self._buckets[max(due, self._last_tick + 1)].add(connection)
+
+    def register(self, connection):
+        self._schedule(connection)
+        if self._task is None or self._task.done():
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+            except RuntimeError:
+                self._task = None  # No loop: advance() must be called by hand
+
+    def __len__(self):
+        # Closed connections are only dropped when their bucket fires
+        return sum(1 for bucket in self._buckets.values() for conn in bucket if not conn.closed)
+
+    def advance(self, now=None) -> int:
+        """
+        Fire every bucket due by `now`.
+
+        Returns:
+            Number of heartbeats sent
+        """
+        now = self.clock() if now is None else now
+        current = self._tick_of(now)
+        due = [tick for tick in self._buckets if tick <= current]
+        self._last_tick = max(self._last_tick, current)
+        message = None
+        sent = 0
+        for tick in sorted(due):
+            for connection in self._buckets.pop(tick):
+                if connection.closed:
+                    continue
+                if now - connection.last_sent >= self.interval:
+                    if message is None:
+                        message = SSEManager._format_sse_message({
+                            'type': 'heartbeat',
+                            'data': {'timestamp': timezone.now().isoformat()}
+                        })
+                    connection.send_heartbeat(message)
+                    sent += 1
+                self._schedule(connection)
+        return sent
+
+    async def _run(self):
+        while self._buckets:
+            await asyncio.sleep(self.tick)
+            self.advance()
+        self._task = None
+
+
+heartbeat_wheel = HeartbeatWheel()
+
+
+def _notification_event(notification, redirect_url=None) -> dict:
+    notification_data = {
+        'type': 'notification',
+        'data': {
+            'id': notification.id,
+            'title': notification.title,
+            'content': notification.content,
+            'notification_type': notification.type,
+            'is_read': notification.is_read,
+            'created_at': notification.created_at.isoformat(),
+        }
+    }
+    if redirect_url:
+        notification_data['data']['redirect_url'] = redirect_url
+    return notification_data
+
+
+def _missed_notification_events(user_id: int, last_event_id: int) -> List[Tuple[int, str]]:
+    """Notifications of the user after `last_event_id` as (event_id, message), oldest first"""
+    from interactions.models import Notification
+    from interactions.services import NotificationService
+
+    notifications = list(
+        Notification.objects.filter(user_id=user_id, id__gt=last_event_id)
+        .prefetch_related('related_object')
+        .order_by('-id')[:SSE_REPLAY_MAX_EVENTS]
+    )
+    events = []
+    for notification in reversed(notifications):
+        link = NotificationService.attach_link(notification)
+        data = _notification_event(notification, link if link != '#' else None)
+        events.append((notification.id, SSEManager._format_sse_message(data, notification.id)))
+    return events
+
+
+async def sse_event_stream(user_id: int, manager: Optional[SSEManager] = None,
+                           wheel: Optional[HeartbeatWheel] = None, last_event_id: Optional[int] = None):
+    """
+    Yield the SSE messages of one stream.
+
+    The loop waits on a single queue get(): messages, the wheel's
+    heartbeats and the close sentinel all arrive through the queue, so an
+    idle stream costs no task or timer of its own.
+
+    With `last_event_id` (the client's Last-Event-ID) the events it missed
+    are sent first: from the manager's event log when it reaches back that
+    far, otherwise from the Notification table, then the log takes over
+    after the newest notification read.
+    """
+    manager = sse_manager if manager is None else manager
+    wheel = heartbeat_wheel if wheel is None else wheel
+    missed = []
+    if last_event_id is not None and not manager.event_log.covers(user_id, last_event_id):
+        try:
+            missed = await sync_to_async(_missed_notification_events)(user_id, last_event_id)
+        except Exception as e:
+            logger.error(f"Error loading missed notifications for user {user_id}: {e}")
+        if missed:
+            last_event_id = max(last_event_id, missed[-1][0])
     connection = ASGISSEConnection(user_id)
-    await sse_manager.add_connection(user_id, connection)
+    missed += await manager.add_connection(user_id, connection, last_event_id)
+    wheel.register(connection)
 
     try:
         # Initial message
-        initial_message = sse_manager._format_sse_message({
+        yield manager._format_sse_message({
             'type': 'connection',
             'data': {
                 'status': 'connected',
@@ -143,62 +420,14 @@ async def sse_event_stream(user_id: int):
                 'timestamp': timezone.now().isoformat()
             }
         })
-        yield initial_message
-
-        last_sent = timezone.now()
-        heartbeat_task = None
-
-        while not connection.closed and not sse_manager._shutdown:
-            try:
-                # Tạo timeout task cho việc lấy message
-                message_task = asyncio.create_task(connection.get_message(timeout=DEFAULT_TIMEOUT))
-                close_task = asyncio.create_task(connection.wait_for_close())
-                
-                # Wait for either message or close event
-                done, pending = await asyncio.wait(
-                    [message_task, close_task],
-                    timeout=DEFAULT_TIMEOUT,
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-                
-                # Cancel pending tasks
-                for task in pending:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-
-                if close_task in done:
-                    # Connection closed
-                    break
-
-                message = None
-                if message_task in done:
-                    try:
-                        message = await message_task
-                    except Exception:
-                        pass
-
-                if message:
-                    yield message
-                    last_sent = timezone.now()
-                else:
-                    # Check for heartbeat
-                    if (timezone.now() - last_sent).total_seconds() >= MAX_TIME_RETRY_CONNECTION:
-                        heartbeat = {
-                            'type': 'heartbeat',
-                            'data': {'timestamp': timezone.now().isoformat()}
-                        }
-                        yield sse_manager._format_sse_message(heartbeat)
-                        last_sent = timezone.now()
+        for _, message in missed:
+            yield message
 
-            except asyncio.CancelledError:
-                logger.info(f"SSE stream cancelled for user {user_id}")
-                break
-            except Exception as e:
-                logger.error(f"Error in SSE stream for user {user_id}: {e}")
+        while True:
+            message = await connection.message_queue.get()
+            if message is _CLOSED:
                 break
+            yield message
 
     except asyncio.CancelledError:
         logger.info(f"SSE stream cancelled for user {user_id}")
@@ -206,15 +435,15 @@ async def sse_event_stream(user_id: int):
         logger.error(f"Error in SSE stream for user {user_id}: {e}")
     finally:
         connection.close()
-        await sse_manager.remove_connection(user_id, connection)
+        await manager.remove_connection(user_id, connection)
 
 
-def create_sse_response(user_id: int) -> StreamingHttpResponse:
+def create_sse_response(user_id: int, last_event_id: Optional[int] = None) -> StreamingHttpResponse:
     """Tạo StreamingHttpResponse cho SSE trong môi trường ASGI"""
     
     async def async_stream():
         try:
-            async for chunk in sse_event_stream(user_id):
+            async for chunk in sse_event_stream(user_id, last_event_id=last_event_id):
                 yield chunk.encode('utf-8')
         except asyncio.CancelledError:
             logger.info(f"SSE stream cancelled for user {user_id}")
@@ -238,26 +467,25 @@ def create_sse_response(user_id: int) -> StreamingHttpResponse:
 async def send_notification_to_user(user_id: int, notification, redirect_url=None):
     """Gửi thông báo đến user qua SSE"""
     try:
-        notification_data = {
-            'type': 'notification',
-            'data': {
-                'id': notification.id,
-                'title': notification.title,
-                'content': notification.content,
-                'notification_type': notification.type,
-                'is_read': notification.is_read,
-                'created_at': notification.created_at.isoformat(),
-            }
-        }
-        if redirect_url:
-            notification_data['data']['redirect_url'] = redirect_url
-            
-        await sse_manager.send_to_user(user_id, notification_data)
+        notification_data = _notification_event(notification, redirect_url)
+        # Notification ids increase, so they double as SSE event ids
+        await sse_manager.send_to_user(user_id, notification_data, event_id=notification.id)
         logger.info(f"Sent notification to user {user_id}")
     except Exception as e:
         logger.error(f"Error sending notification via SSE: {e}")
 
 
+async def send_notifications(notifications, redirect_url=None):
+    """Gửi nhiều thông báo qua SSE trong một lần publish (mỗi thông báo tới user của nó)"""
+    try:
+        await sse_manager.send_to_users(
+            (notification.user_id, _notification_event(notification, redirect_url), notification.id)
+            for notification in notifications
+        )
+    except Exception as e:
+        logger.error(f"Error sending notifications via SSE: {e}")
+
+
 # Sync wrapper cho trường hợp cần gọi từ sync code
 def send_notification_to_user_sync(user_id: int, notification, redirect_url=None):
     """Sync wrapper cho send_notification_to_user"""
@@ -0,0 +1,81 @@
+import asyncio
+import time
+import tracemalloc
+from constants import SSE_BENCHMARK_HEARTBEAT_INTERVAL, SSE_HEARTBEAT_TICK
+from .sse import SSEManager, HeartbeatWheel, sse_event_stream
+from .sse_broker import InMemorySSEBroker
+
+
+async def _consume(stream, received):
+    async for _ in stream:
+        received[0] += 1
+
+
+async def _wait_for(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("SSE benchmark did not settle in time")
+        await asyncio.sleep(0.001)
+
+
+async def _run(connections, idle_seconds, heartbeat_interval, tick):
+    manager = SSEManager(broker=InMemorySSEBroker())
+    wheel = HeartbeatWheel(interval=heartbeat_interval, tick=tick)
+    counters = [[0] for _ in range(connections)]
+
+    # Memory: everything a connected stream keeps alive (generator, queue, task, registry entry)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(_consume(sse_event_stream(user_id, manager, wheel), counters[user_id - 1]))
+        for user_id in range(1, connections + 1)
+    ]
+    await _wait_for(lambda: all(counter[0] for counter in counters), 60)
+    connect_seconds = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    # Idle: only the heartbeat wheel runs
+    cpu = time.process_time()
+    await asyncio.sleep(idle_seconds)
+    idle_cpu = time.process_time() - cpu
+    heartbeats = sum(counter[0] for counter in counters) - connections
+
+    # Fan-out: one message to every user
+    expected = [counter[0] + 1 for counter in counters]
+    cpu = time.process_time()
+    started = time.perf_counter()
+    for user_id in range(1, connections + 1):
+        await manager.send_to_user(user_id, {'type': 'notification', 'data': {'id': user_id}})
+    await _wait_for(lambda: all(c[0] >= e for c, e in zip(counters, expected)), 60)
+    fanout_seconds = time.perf_counter() - started
+    fanout_cpu = time.process_time() - cpu
+
+    await manager.shutdown()
+    await asyncio.gather(*tasks)
+
+    return {
+        'connections': connections,
+        'connect_seconds': connect_seconds,
+        'memory_per_connection': memory / connections,
+        'idle_seconds': idle_seconds,
+        'idle_cpu_per_connection_us': idle_cpu / idle_seconds / connections * 1e6,
+        'heartbeats': heartbeats,
+        'fanout_seconds': fanout_seconds,
+        'fanout_cpu_per_message_us': fanout_cpu / connections * 1e6,
+    }
+
+
+def run_sse_benchmark(connections=1000, idle_seconds=2.0,
+                      heartbeat_interval=SSE_BENCHMARK_HEARTBEAT_INTERVAL, tick=SSE_HEARTBEAT_TICK):
+    """
+    Open `connections` simulated SSE streams in a fresh event loop.
+
+    Reports bytes allocated per connected stream, CPU spent per idle
+    connection per second (heartbeats included) and the cost of sending one
+    message to every user. The streams run the production sse_event_stream
+    over an in-memory broker, so no HTTP server or database is involved.
+    """
+    return asyncio.run(_run(connections, idle_seconds, heartbeat_interval, tick))
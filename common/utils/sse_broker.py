@@ -0,0 +1,169 @@
+import asyncio
+import json
+import logging
+from typing import Iterable, Optional, Tuple
+from django.conf import settings
+from django.db import connection, connections
+from asgiref.sync import sync_to_async
+from constants import SSE_BROKER_MEMORY, SSE_BROKER_POSTGRES, SSE_NOTIFY_CHANNEL, SSE_NOTIFY_MAX_PAYLOAD
+
+logger = logging.getLogger(__name__)
+
+
+class SSEBroker:
+    """
+    Pub/sub transport between the code that sends an SSE message and the
+    processes holding the user's streams.
+
+    start() registers `deliver(user_id, message, event_id)`, the coroutine
+    of the local SSEManager; publish() must end up calling it in every
+    process that may hold a stream of the user.
+    """
+
+    async def start(self, deliver):
+        raise NotImplementedError
+
+    async def publish(self, user_id: int, message: str, event_id: Optional[int] = None):
+        raise NotImplementedError
+
+    async def publish_many(self, items: Iterable[Tuple[int, str, Optional[int]]]):
+        """Publish (user_id, message, event_id) items; brokers override it to batch the transport"""
+        for user_id, message, event_id in items:
+            await self.publish(user_id, message, event_id)
+
+    async def stop(self):
+        pass
+
+
+class InMemorySSEBroker(SSEBroker):
+    """Single-process broker: publishing delivers directly (development, tests)"""
+
+    def __init__(self):
+        self._deliver = None
+
+    async def start(self, deliver):
+        self._deliver = deliver
+
+    async def publish(self, user_id: int, message: str, event_id: Optional[int] = None):
+        if self._deliver is not None:
+            await self._deliver(user_id, message, event_id)
+
+    async def stop(self):
+        self._deliver = None
+
+
+class PostgresSSEBroker(SSEBroker):
+    """
+    Multi-process broker over PostgreSQL LISTEN/NOTIFY.
+
+    Messages are published with pg_notify() on the caller's database
+    connection, so a notification created inside a transaction is only
+    delivered once it commits. Each process listens on a dedicated
+    autocommit connection watched by the event loop (psycopg2 API).
+    """
+
+    def __init__(self, channel=SSE_NOTIFY_CHANNEL):
+        self.channel = channel
+        self._deliver = None
+        self._listener = None
+        self._loop = None
+        # The event loop only keeps weak references to tasks
+        self._tasks = set()
+
+    async def start(self, deliver):
+        self._deliver = deliver
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return  # Listening (or connecting) in this event loop already
+        await self.stop()
+        self._loop = loop
+        try:
+            listener = await asyncio.to_thread(self._connect)
+        except Exception:
+            self._loop = None
+            raise
+        self._listener = listener
+        loop.add_reader(listener.fileno(), self._on_readable)
+        logger.info(f"Listening for SSE messages on {self.channel}")
+
+    def _connect(self):
+        wrapper = connections['default']
+        listener = wrapper.get_new_connection(wrapper.get_connection_params())
+        listener.autocommit = True
+        with listener.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return listener
+
+    def _on_readable(self):
+        try:
+            self._listener.poll()
+        except Exception as e:
+            logger.error(f"SSE listener connection lost: {e}")
+            self._loop.remove_reader(self._listener.fileno())
+            # The next add_connection reconnects
+            self._listener = None
+            self._loop = None
+            return
+        while self._listener.notifies:
+            notify = self._listener.notifies.pop(0)
+            try:
+                payload = json.loads(notify.payload)
+                task = self._loop.create_task(self._deliver(payload['u'], payload['m'], payload.get('e')))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"Malformed SSE notify payload: {e}")
+
+    @staticmethod
+    def _notify(channel, payloads):
+        with connection.cursor() as cursor:
+            if len(payloads) == 1:
+                cursor.execute("SELECT pg_notify(%s, %s)", [channel, payloads[0]])
+            else:
+                # One round trip for the whole batch
+                cursor.execute(
+                    "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+                    [channel, payloads]
+                )
+
+    async def publish(self, user_id: int, message: str, event_id: Optional[int] = None):
+        await self.publish_many([(user_id, message, event_id)])
+
+    async def publish_many(self, items: Iterable[Tuple[int, str, Optional[int]]]):
+        payloads = []
+        for user_id, message, event_id in items:
+            payload = json.dumps({'u': user_id, 'm': message, 'e': event_id}, ensure_ascii=False)
+            if len(payload.encode('utf-8')) > SSE_NOTIFY_MAX_PAYLOAD:
+                # NOTIFY payloads are limited to 8000 bytes
+                logger.warning(f"SSE message for user {user_id} too large for NOTIFY, delivering locally")
+                if self._deliver is not None:
+                    await self._deliver(user_id, message, event_id)
+                continue
+            payloads.append(payload)
+        if payloads:
+            await sync_to_async(self._notify)(self.channel, payloads)
+
+    async def stop(self):
+        if self._listener is not None:
+            try:
+                self._loop.remove_reader(self._listener.fileno())
+                self._listener.close()
+            except Exception as e:
+                logger.error(f"Error closing SSE listener: {e}")
+        self._listener = None
+        self._loop = None
+
+
+SSE_BROKERS = {
+    SSE_BROKER_MEMORY: InMemorySSEBroker,
+    SSE_BROKER_POSTGRES: PostgresSSEBroker,
+}
+
+
+def get_sse_broker(name=None) -> SSEBroker:
+    """Broker named by settings.SSE_BROKER ('memory' or 'postgres')"""
+    name = name or getattr(settings, 'SSE_BROKER', SSE_BROKER_MEMORY) or SSE_BROKER_MEMORY
+    try:
+        return SSE_BROKERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown SSE broker {name!r} (expected one of {', '.join(SSE_BROKERS)})")
@@ -0,0 +1,203 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from django.db import transaction, DatabaseError, close_old_connections
+from django.db.models import F
+from constants import (
+    VIEW_COUNT_FLUSH_INTERVAL,
+    VIEW_COUNT_DEDUP_SECONDS,
+    VIEW_COUNT_MAX_PENDING,
+    VIEW_COUNT_MAX_SEEN,
+    VIEW_COUNT_UPDATE_BATCH_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """
+    Per-process buffer for view_count increments.
+
+    Page views only touch memory; a background thread (or an explicit
+    flush()) turns the aggregated counts into a few bulk
+    `UPDATE ... SET view_count = view_count + n` statements, so hot rows are
+    not updated once per request. Increments whose UPDATE fails are put back
+    in the buffer for the next flush, up to max_pending distinct rows.
+    """
+
+    def __init__(self, flush_interval=VIEW_COUNT_FLUSH_INTERVAL,
+                 dedup_seconds=VIEW_COUNT_DEDUP_SECONDS,
+                 max_pending=VIEW_COUNT_MAX_PENDING,
+                 max_seen=VIEW_COUNT_MAX_SEEN):
+        self.flush_interval = flush_interval
+        self.dedup_seconds = dedup_seconds
+        self.max_pending = max_pending
+        self.max_seen = max_seen
+        self._pending = defaultdict(Counter)
+        self._pending_keys = 0
+        # Every entry lives dedup_seconds, so insertion order is expiry order
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._metrics = {
+            'recorded': 0,
+            'deduplicated': 0,
+            'dropped': 0,
+            'flushed': 0,
+            'flush_count': 0,
+            'last_flush_seconds': 0.0,
+            'max_flush_seconds': 0.0,
+        }
+
+    def record(self, model, obj_id, viewer_key=None):
+        """Count one view of `model` row `obj_id`; returns False if skipped"""
+        now = time.monotonic()
+        with self._lock:
+            if viewer_key is not None and self.dedup_seconds:
+                seen_key = (model, obj_id, viewer_key)
+                expires_at = self._seen.get(seen_key)
+                if expires_at is not None and expires_at > now:
+                    self._metrics['deduplicated'] += 1
+                    return False
+                self._seen[seen_key] = now + self.dedup_seconds
+                self._seen.move_to_end(seen_key)
+                if len(self._seen) > self.max_seen:
+                    self._seen.popitem(last=False)
+
+            if not self._add_pending(model, obj_id, 1):
+                self._metrics['dropped'] += 1
+                return False
+            self._metrics['recorded'] += 1
+        return True
+
+    def _add_pending(self, model, obj_id, increment):
+        # Called with self._lock held
+        counts = self._pending[model]
+        if obj_id not in counts:
+            if self._pending_keys >= self.max_pending:
+                return False
+            self._pending_keys += 1
+        counts[obj_id] += increment
+        return True
+
+    def _requeue(self, model, counts):
+        """Put back increments that could not be written, returns how many were lost"""
+        with self._lock:
+            lost = 0
+            for obj_id, increment in counts.items():
+                if not self._add_pending(model, obj_id, increment):
+                    lost += increment
+            self._metrics['dropped'] += lost
+        return lost
+
+    def _prune_seen(self, now):
+        while self._seen:
+            key, expires_at = next(iter(self._seen.items()))
+            if expires_at > now:
+                break
+            del self._seen[key]
+
+    def flush(self):
+        """Write buffered increments to the database, returns the number written"""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = defaultdict(Counter)
+                self._pending_keys = 0
+                self._prune_seen(time.monotonic())
+
+            if not pending:
+                return 0
+
+            started = time.monotonic()
+            flushed = 0
+            for model, counts in pending.items():
+                total = sum(counts.values())
+                try:
+                    ViewCountBuffer._apply(model, counts)
+                    flushed += total
+                except DatabaseError as e:
+                    lost = self._requeue(model, counts)
+                    logger.error(
+                        f"Error flushing {total} {model.__name__} views, {lost} dropped: {e}"
+                    )
+            elapsed = time.monotonic() - started
+
+            with self._lock:
+                self._metrics['flushed'] += flushed
+                self._metrics['flush_count'] += 1
+                self._metrics['last_flush_seconds'] = elapsed
+                self._metrics['max_flush_seconds'] = max(self._metrics['max_flush_seconds'], elapsed)
+
+            logger.info(f"Flushed {flushed} views in {elapsed * 1000:.1f}ms")
+            return flushed
+
+    @staticmethod
+    def _apply(model, counts):
+        # Rows sharing the same increment are updated by a single statement
+        by_increment = defaultdict(list)
+        for obj_id, increment in counts.items():
+            by_increment[increment].append(obj_id)
+
+        with transaction.atomic():
+            for increment, ids in sorted(by_increment.items()):
+                ids.sort()
+                for start in range(0, len(ids), VIEW_COUNT_UPDATE_BATCH_SIZE):
+                    model.objects.filter(
+                        id__in=ids[start:start + VIEW_COUNT_UPDATE_BATCH_SIZE]
+                    ).update(view_count=F('view_count') + increment)
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['pending'] = sum(sum(c.values()) for c in self._pending.values())
+        return metrics
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error in view count flusher: {e}")
+            finally:
+                close_old_connections()
+
+    def start(self):
+        """Start the periodic flusher and flush once more on interpreter exit"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='view-count-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self):
+        """Stop the flusher and write what is left in the buffer"""
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing views on shutdown: {e}")
+
+
+# Global view count buffer (one per worker process)
+view_count_buffer = ViewCountBuffer()
+
+
+def get_viewer_key(request):
+    """Identity used to deduplicate views: user, then session, then client IP"""
+    if request.user.is_authenticated:
+        return f"u:{request.user.pk}"
+    session_key = getattr(request, 'session', None) and request.session.session_key
+    if session_key:
+        return f"s:{session_key}"
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+def record_view(request, obj):
+    """Buffer a view of `obj` (any model with a view_count field)"""
+    return view_count_buffer.record(type(obj), obj.pk, get_viewer_key(request))
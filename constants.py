@@ -48,6 +48,37 @@ class ApprovalStatus(Enum):
         return [(i.value, i.name) for i in cls]
     
 
+class ChapterProcessingStatus(Enum):
+    READY = "r"
+    QUEUED = "q"
+    PROCESSING = "p"
+    FAILED = "f"
+
+    @classmethod
+    def choices(cls):
+        return [(i.value, i.name) for i in cls]
+
+
+class ChapterJobStatus(Enum):
+    PENDING = "p"
+    RUNNING = "r"
+    DONE = "d"
+    FAILED = "f"
+
+    @classmethod
+    def choices(cls):
+        return [(i.value, i.name) for i in cls]
+
+
+class ChapterJobKind(Enum):
+    PROCESS = "process"
+    NOTIFY_APPROVED = "notify_approved"
+
+    @classmethod
+    def choices(cls):
+        return [(i.value, i.name) for i in cls]
+
+
 class NotificationTypeChoices:
     COMMENT = 'COMMENT'
     REPLY = 'REPLY'
@@ -114,6 +145,8 @@ MAX_STATUS_LENGTH = 1
 MAX_ROLE_LENGTH = 2
 MAX_REASON_LENGTH = 20
 MAX_REPORT_STATUS_LENGTH = 20
+MAX_JOB_KIND_LENGTH = 20
+MAX_CODEC_LENGTH = 10
 MAX_SESSION_REMEMBER = 1209600
 MAX_RATE = 5
 MAX_TOKEN_LENGTH = 255
@@ -128,10 +161,83 @@ MAX_NEWUPDATE_NOVELS =12
 MAX_LATEST_CHAPTER = 12
 MIN_LATEST_CHAPTER = 1
 MAX_HOME_COMMENTS = 10  # Maximum comments to show on home page
+
+# Home snapshot cache
+HOME_SNAPSHOT_CACHE_KEY = "novels:home_snapshot"
+HOME_SNAPSHOT_INVALIDATED_KEY = "novels:home_snapshot:invalidated_at"
+HOME_SNAPSHOT_LOCK_KEY = "novels:home_snapshot:lock"
+HOME_SNAPSHOT_FRESH_SECONDS = 300  # Serve without revalidating for 5 minutes
+HOME_SNAPSHOT_MAX_AGE_SECONDS = 86400  # Hard expiry for a stale snapshot (1 day)
+HOME_SNAPSHOT_LOCK_SECONDS = 60  # Max duration of a background rebuild
+HOME_SNAPSHOT_REFRESH_INTERVAL = 300  # Default interval for warm_home_snapshot --loop
+
+# View count buffer
+VIEW_COUNT_FLUSH_INTERVAL = 10  # Seconds between bulk view_count flushes
+VIEW_COUNT_DEDUP_SECONDS = 1800  # Same viewer counts once per 30 minutes (0 disables)
+VIEW_COUNT_MAX_PENDING = 10000  # Max distinct rows buffered before increments are dropped
+VIEW_COUNT_MAX_SEEN = 100000  # Max (row, viewer) pairs remembered for deduplication
+VIEW_COUNT_UPDATE_BATCH_SIZE = 500  # Max ids per UPDATE statement
+
+# Latest chapter pointers
+LATEST_CHAPTER_REBUILD_BATCH_SIZE = 500  # Novels per batch in rebuild_latest_chapters
+
+# Novel search index
+SEARCH_INDEX_BATCH_SIZE = 500  # Novels per batch in rebuild_search_index
+SEARCH_MAX_MATCHES = 1000  # Max ranked matches returned by the SQLite FTS backend
+
+# Search suggestions (autocomplete)
+SUGGEST_RESULTS_LIMIT = 8  # Default number of suggestions
+SUGGEST_MAX_RESULTS = 20  # Upper bound for the ?limit= parameter
+SUGGEST_MAX_SCAN = 5000  # Max index entries walked per lookup
+SUGGEST_REFRESH_SECONDS = 60  # Catch up with other workers' changes this often
+SUGGEST_FULL_REBUILD_SECONDS = 3600  # Full reload (view counts, hard deletes)
+
+# Chunk delivery cache
+CHUNK_CACHE_POINTER_KEY = 'chapter_chunks:{chapter_id}:pointer'
+CHUNK_CACHE_CONTENT_KEY = 'chapter_chunks:{chapter_id}:v{version}'
+CHUNK_CACHE_TIMEOUT = 86400  # Chapter chunks are immutable per content_version
+CHUNK_RESPONSE_MAX_AGE = 300  # Browser/CDN max-age of published chunk windows
+CHUNK_CACHE_WINDOW_KEY = 'chapter_chunks:{chapter_id}:v{version}:{built_at}:w{start}-{limit}'
+CHUNK_RESPONSE_ENCODINGS = ('br', 'gzip')  # Precompressed window encodings, most preferred first
+CHUNK_GZIP_LEVEL = 9  # Windows are compressed once, so use the best ratio
+CHUNK_BROTLI_QUALITY = 9  # 10-11 are several times slower for a few percent
+MAX_CHUNK_WINDOW_LIMIT = 20  # Upper bound on the ?limit of a chunk window
+
+# Chapter table of contents (navigation index)
+CHAPTER_TOC_KEY = 'novel_toc:{novel_id}'
+CHAPTER_TOC_VERSION_KEY = 'novel_toc:{novel_id}:version'
+CHAPTER_TOC_TIMEOUT = 86400  # Rebuilt at most daily; changes bump the version
+
+# Streaming chapter renderer
+CHUNK_STREAM_MARKER = '<!-- chapter-chunks -->'  # Where streamed chunks are spliced into the page
+CHUNK_STREAM_FETCH_SIZE = 50  # Chunk rows fetched per database round trip
+CHAPTER_STREAM_MODE = 'stream'  # ?mode= value selecting the streamed reader
+
+# Stored chapter chunk statistics
+CHAPTER_STATS_BACKFILL_BATCH_SIZE = 500  # Chapters per batch in backfill_chapter_stats
+
+# Novel rating/favorite aggregates
+NOVEL_STATS_RECONCILE_BATCH_SIZE = 500  # Novels per batch in reconcile_novel_stats
+NOVEL_STATS_RECONCILE_INTERVAL = 3600  # Default interval for reconcile_novel_stats --loop
 MAX_RANDOM_STRING_LENGTH = 10
 MAX_SESSION_REMEMBER = 2592000  # 30 days
 MAX_TIME_RETRY_CONNECTION = 30
 MAX_QUEUE_SIZE = 1000
+
+# Server-sent events fan-out
+SSE_SHARD_COUNT = 64  # Connection registry shards, each with its own lock
+SSE_HEARTBEAT_TICK = 1.0  # Seconds between heartbeat wheel ticks (heartbeats every MAX_TIME_RETRY_CONNECTION)
+SSE_BROKER_MEMORY = 'memory'  # Delivers within the sending process only
+SSE_BROKER_POSTGRES = 'postgres'  # LISTEN/NOTIFY, reaches every worker
+SSE_NOTIFY_CHANNEL = 'docwn_sse'
+SSE_NOTIFY_MAX_PAYLOAD = 7999  # PostgreSQL rejects NOTIFY payloads of 8000+ bytes
+SSE_BENCHMARK_HEARTBEAT_INTERVAL = 1.0  # Short interval so benchmark runs include heartbeats
+SSE_EVENT_LOG_SIZE = 100  # Recent events kept per user for Last-Event-ID replay
+SSE_EVENT_LOG_USERS = 10000  # Users with an in-memory event log per process (least recent dropped first)
+SSE_REPLAY_MAX_EVENTS = 100  # Most notifications replayed from the database on reconnect
+
+# Notification fan-out
+NOTIFICATION_FANOUT_BATCH_SIZE = 1000  # Notifications written and published per batch
 MAX_IMAGE_SIZE = 16 * 1024 * 1024  # 16MB
 MAX_IMAGE_SIZE_MB = 16  # 16MB
 MAX_LIKE_NOVELS_PAGE = 8
@@ -166,6 +272,11 @@ PAGINATOR_COMMON_LIST = 10  # Increased for better consistency
 PAGINATOR_REVIEW_LIST = 10
 DEFAULT_PAGE_NUMBER = 1
 
+# Keyset (cursor) pagination
+KEYSET_MAX_PAGE_SIZE = 100  # Upper bound on any requested page size
+KEYSET_COUNT_CAP = 1000  # Approximate counts stop after this many rows
+KEYSET_CURSOR_SALT = 'keyset-cursor'
+
 # Allowed image types for novel uploads
 ALLOWED_IMAGE_TYPES = [
     "image/jpeg",
@@ -188,11 +299,35 @@ PAGINATION_MIN_PAGES_TO_SHOW = 1  # Minimum number of pages required to show pag
 
 # Chunking configuration
 MAX_CHUNK_SIZE = 10000  # Maximum size for a chunk in characters
+CHUNK_WRITE_BATCH_SIZE = 200  # Chunk rows per bulk_create/bulk_update statement
+
+# Compressed chunk storage
+CHUNK_CODEC_RAW = 'raw'  # Chunk.content holds the HTML
+CHUNK_CODEC_ZLIB = 'zlib'  # Chunk.compressed_content holds zlib-compressed UTF-8
+CHUNK_CODEC_ZSTD = 'zstd'  # Same with zstd (needs the zstandard package)
+CHUNK_COMPRESSION_LEVEL = 6  # zlib/zstd compression level
+CHUNK_COMPRESS_BATCH_SIZE = 500  # Chunks per batch in compress_chunks
 
 # HTML Chunker constants
 HTML_TAG_OVERHEAD = 20  # Buffer size for HTML tags like <p></p>
 BEAUTIFULSOUP_PARSER = 'html.parser'
 HTML_BLOCK_ELEMENTS = ['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+HTML_CHUNKER_FEED_SIZE = 65536  # Characters handed to the HTML parser at a time
+
+# Bulk chapter import
+CHAPTER_IMPORT_BATCH_SIZE = 50  # Chapters written per transaction by import_chapters
+CHAPTER_IMPORT_DEFAULT_VOLUME = 'Tập 1'  # Volume of chapter files at the top level of an import
+
+# Chapter background jobs
+CHAPTER_JOB_MAX_ATTEMPTS = 5  # Attempts before a job is marked failed
+CHAPTER_JOB_RETRY_DELAY = 30  # Seconds before the first retry, doubled on every attempt
+CHAPTER_JOB_LOCK_TIMEOUT = 600  # A running job older than this is considered abandoned
+CHAPTER_JOB_BATCH_SIZE = 20  # Jobs claimed at a time by process_chapter_jobs
+CHAPTER_JOB_POLL_INTERVAL = 5  # Seconds between polls for process_chapter_jobs --loop
+
+# Chunker benchmarks
+CHUNKER_BENCHMARK_REPEAT = 3  # Timed runs per document, the best one is reported
+CHUNKER_BENCHMARK_REGRESSION_THRESHOLD = 0.25  # Allowed throughput drop against a baseline
 
 # Reading constants
 WORDS_PER_MINUTE = 200  # Average reading speed for time estimation
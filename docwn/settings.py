@@ -164,6 +164,26 @@ else:
         }
 
 
+# Cache
+# Precomputed structures (homepage snapshot, ...) must be shared between web
+# workers in production, so use the database cache there (run
+# `createcachetable`). Local development keeps a per-process memory cache.
+if IS_HEROKU or IS_PRODUCTION:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "docwn_cache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "docwn-default",
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -293,6 +313,18 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 
 IMGBB_API_KEY = os.getenv('IMGBB_API_KEY')
 
+# Codec new chapter chunks are stored with: raw, zlib or zstd (zstd needs the zstandard package).
+# Existing chunks are converted with `manage.py compress_chunks`.
+CHUNK_STORAGE_CODEC = os.getenv('CHUNK_STORAGE_CODEC', 'raw')
+
+# SSE pub/sub broker: 'memory' (single process) or 'postgres' (LISTEN/NOTIFY,
+# needed when streams and senders live in different workers). Defaults to
+# 'postgres' when the database is PostgreSQL.
+SSE_BROKER = os.getenv(
+    'SSE_BROKER',
+    'postgres' if DATABASES['default']['ENGINE'].startswith('django.db.backends.postgresql') else 'memory'
+)
+
 # Avatar settings
 AVATAR_UPLOAD_SETTINGS = {
     'ALLOWED_EXTENSIONS': ['jpg', 'jpeg', 'png', 'gif'],
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "docwn.settings")
 
 application = get_wsgi_application()
+
+# Periodically write buffered view counts in server processes
+from common.utils.view_counter import view_count_buffer  # noqa: E402
+
+view_count_buffer.start()
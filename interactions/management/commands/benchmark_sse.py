@@ -0,0 +1,69 @@
+"""
+Django management command to load-test the SSE stream loop with simulated connections
+"""
+import json
+from django.core.management.base import BaseCommand, CommandError
+
+from common.utils.sse_benchmark import run_sse_benchmark
+from constants import SSE_BENCHMARK_HEARTBEAT_INTERVAL, SSE_HEARTBEAT_TICK
+
+
+class Command(BaseCommand):
+    help = 'Open N simulated SSE streams and report memory and CPU per connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--connections',
+            default='1000,10000',
+            help='Comma separated numbers of simultaneous streams (default: 1000,10000)'
+        )
+        parser.add_argument(
+            '--idle-seconds',
+            type=float,
+            default=2.0,
+            help='How long the streams stay idle while CPU is measured (default: 2)'
+        )
+        parser.add_argument(
+            '--heartbeat-interval',
+            type=float,
+            default=SSE_BENCHMARK_HEARTBEAT_INTERVAL,
+            help=f'Heartbeat interval during the run (default: {SSE_BENCHMARK_HEARTBEAT_INTERVAL}s)'
+        )
+        parser.add_argument(
+            '--tick',
+            type=float,
+            default=SSE_HEARTBEAT_TICK,
+            help=f'Heartbeat wheel tick (default: {SSE_HEARTBEAT_TICK}s)'
+        )
+        parser.add_argument(
+            '--save',
+            help='Write the results to this JSON file'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            counts = [int(count) for count in options['connections'].split(',')]
+        except ValueError:
+            raise CommandError("--connections must be comma separated integers")
+
+        results = []
+        self.stdout.write(
+            f"{'streams':>8} {'connect s':>10} {'B/stream':>9} {'idle µs/stream/s':>17} "
+            f"{'heartbeats':>10} {'fan-out s':>10} {'µs/message':>10}"
+        )
+        for count in counts:
+            row = run_sse_benchmark(
+                count, options['idle_seconds'], options['heartbeat_interval'], options['tick']
+            )
+            results.append(row)
+            self.stdout.write(
+                f"{row['connections']:8d} {row['connect_seconds']:10.3f} {row['memory_per_connection']:9.0f} "
+                f"{row['idle_cpu_per_connection_us']:17.3f} {row['heartbeats']:10d} "
+                f"{row['fanout_seconds']:10.3f} {row['fanout_cpu_per_message_us']:10.1f}"
+            )
+
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results saved to {options['save']}")
+        self.stdout.write(self.style.SUCCESS(f"Benchmarked {len(results)} SSE loads"))
@@ -1,16 +1,28 @@
 from django.core.paginator import Paginator
+from common.utils.keyset import KeysetPaginator
 from interactions.models import Comment
 from constants import  PAGINATOR_COMMENT_LIST, DEFAULT_PAGE_NUMBER
 
 class CommentService:
     @staticmethod
-    def get_novel_comments(novel, page=DEFAULT_PAGE_NUMBER):
-        """Lấy comment cha theo phân trang"""
+    def get_novel_comments(novel, page=DEFAULT_PAGE_NUMBER, cursor=None):
+        """
+        Lấy comment cha theo phân trang.
+
+        With a `cursor` (empty for the first page) the page is seeked by
+        (created_at, id) instead of counted and offset; the result is a
+        KeysetPage. Raises InvalidCursor for a bad cursor.
+        """
         comments_qs = Comment.objects.filter(
             novel=novel,
             parent_comment__isnull=True,
             is_active=True
-        ).select_related("user").prefetch_related("replies__user").order_by("-created_at")
+        ).select_related("user").prefetch_related("replies__user").order_by("-created_at", "-id")
+
+        if cursor is not None:
+            return KeysetPaginator(
+                comments_qs, ("-created_at", "-id"), PAGINATOR_COMMENT_LIST
+            ).get_page(cursor)
 
         paginator = Paginator(comments_qs, PAGINATOR_COMMENT_LIST)
         page_obj = paginator.get_page(page)
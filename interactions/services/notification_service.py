@@ -1,13 +1,22 @@
-from typing import List
+import logging
+from itertools import islice
+from typing import Iterable, List, Optional
+from asgiref.sync import async_to_sync
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Max
+from common.utils.sse import send_notifications
+from accounts.models import User
 from interactions.models import Notification
 from constants import (
-    NotificationTypeChoices
+    NotificationTypeChoices,
+    NOTIFICATION_FANOUT_BATCH_SIZE,
 )
 from novels.models.chapter import Chapter
 from novels.models.novel import Novel
 from django.urls import reverse
 
+logger = logging.getLogger(__name__)
+
 class NotificationService:
     @staticmethod
     def get_user_notifications(user, limit: int, offset: int) -> List[Notification]:
@@ -53,3 +62,121 @@ class NotificationService:
                     }
                 )
         return "#"
+
+    @staticmethod
+    def publish(notifications: List[Notification], redirect_url=None):
+        """Push saved notifications over SSE as one broker batch"""
+        try:
+            async_to_sync(send_notifications)(notifications, redirect_url)
+        except Exception as e:
+            logger.exception("Lỗi khi gửi SSE cho %s thông báo: %s", len(notifications), e)
+
+    @staticmethod
+    def _load_ids(notifications: List[Notification], fields: dict):
+        """
+        Fill in the ids of bulk-inserted notifications.
+
+        For backends that do not return primary keys from bulk inserts
+        (MySQL): the newest matching row of each user since the batch was
+        built is the one just inserted.
+        """
+        by_user = {notification.user_id: notification for notification in notifications}
+        rows = Notification.objects.filter(
+            user_id__in=by_user,
+            created_at__gte=min(notification.created_at for notification in notifications),
+            **fields
+        ).values('user_id').annotate(last_id=Max('id')).values_list('user_id', 'last_id')
+        for user_id, last_id in rows:
+            by_user[user_id].pk = last_id
+
+    @staticmethod
+    def fan_out(
+        user_ids: Iterable[int],
+        title: str,
+        content: str,
+        notification_type: str,
+        related_object=None,
+        redirect_url=None,
+        batch_size: int = NOTIFICATION_FANOUT_BATCH_SIZE,
+        total: Optional[int] = None,
+        progress=None,
+    ) -> int:
+        """
+        Create the same notification for many users and push it over SSE.
+
+        `user_ids` is consumed lazily (pass a values_list(...).iterator()),
+        so the audience is never held in memory: every batch is written
+        with one bulk_create and published with one broker call before the
+        next is read. `progress(sent, total)` is called after each batch.
+
+        Returns:
+            Number of notifications created
+        """
+        fields = {'title': title, 'content': content, 'type': notification_type}
+        if related_object is not None:
+            fields['content_type'] = ContentType.objects.get_for_model(related_object)
+            fields['object_id'] = related_object.pk
+
+        user_ids = iter(user_ids)
+        sent = 0
+        while True:
+            batch = list(islice(user_ids, batch_size))
+            if not batch:
+                break
+            notifications = Notification.objects.bulk_create(
+                [Notification(user_id=user_id, **fields) for user_id in batch]
+            )
+            if notifications[0].pk is None:
+                # The SSE event id and the dropdown's mark-as-read need the ids
+                NotificationService._load_ids(notifications, fields)
+            NotificationService.publish(notifications, redirect_url)
+            sent += len(notifications)
+            logger.info("Notification fan-out '%s': %s/%s", title, sent, total if total is not None else '?')
+            if progress is not None:
+                progress(sent, total)
+        return sent
+
+    @staticmethod
+    def broadcast(
+        recipients,
+        title: str,
+        content: str,
+        notification_type: str,
+        related_object=None,
+        redirect_url=None,
+        progress=None,
+    ) -> int:
+        """
+        Send the same notification to every user of a queryset.
+
+        The primitive for every broadcast-style notification: audiences up
+        to NOTIFICATION_FANOUT_BATCH_SIZE users get one bulk_create and one
+        SSE publish, larger ones are streamed through fan_out in batches.
+
+        Returns:
+            Number of notifications created
+        """
+        user_ids = recipients.order_by('id').values_list('id', flat=True)
+        return NotificationService.fan_out(
+            user_ids.iterator(chunk_size=NOTIFICATION_FANOUT_BATCH_SIZE),
+            title=title,
+            content=content,
+            notification_type=notification_type,
+            related_object=related_object,
+            redirect_url=redirect_url,
+            total=user_ids.count() if progress is not None else None,
+            progress=progress,
+        )
+
+    @staticmethod
+    def notify_role(role: str, title: str, content: str, notification_type: str,
+                    related_object=None, redirect_url=None) -> int:
+        """Broadcast a notification to every user with the given role (UserRole value)"""
+        return NotificationService.broadcast(
+            User.objects.filter(role=role),
+            title=title,
+            content=content,
+            notification_type=notification_type,
+            related_object=related_object,
+            redirect_url=redirect_url,
+        )
@@ -1,11 +1,13 @@
 from django.core.paginator import Paginator
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 
+from common.utils.keyset import KeysetPaginator
 from interactions.models import Review
 from interactions.forms import ReviewForm
 from novels.models import Novel
+from novels.services.novel_stats_service import NovelStatsService
 from constants import (
     PAGINATOR_REVIEW_LIST,
     MIN_RATE,
@@ -16,9 +18,26 @@ from constants import (
 
 class ReviewService:
     @staticmethod
-    def get_novel_reviews_data(novel_slug, rating_filter=None, page=1):
+    def get_novel_reviews_data(novel_slug, rating_filter=None, page=1, cursor=None):
+        """
+        A `cursor` (empty for the first page) switches to keyset pagination:
+        page_obj is a KeysetPage, next_cursor continues the list and
+        total_reviews is capped (total_reviews_capped). Raises InvalidCursor
+        for a bad cursor.
+        """
         novel = get_object_or_404(Novel, slug=novel_slug)
         reviews = ReviewService._get_novel_reviews_queryset(novel, rating_filter)
+        if cursor is not None:
+            paginator = KeysetPaginator(reviews, ('-created_at', '-id'), PAGINATOR_REVIEW_LIST)
+            page_obj = paginator.get_page(cursor)
+            return {
+                'novel': novel,
+                'page_obj': page_obj,
+                'next_cursor': page_obj.next_cursor,
+                'rating_filter': rating_filter,
+                'total_reviews': paginator.count,
+                'total_reviews_capped': paginator.count_capped,
+            }
         paginator = Paginator(reviews, PAGINATOR_REVIEW_LIST)
         page_obj = paginator.get_page(page)
         return {
@@ -104,6 +123,7 @@ class ReviewService:
         )
 
     @staticmethod
+    @transaction.atomic
     def create_review(user, novel_slug, data):
         novel = get_object_or_404(Novel, slug=novel_slug, deleted_at__isnull=True)
 
@@ -113,11 +133,14 @@ class ReviewService:
 
         form = ReviewForm(data, user=user, novel=novel)
         if form.is_valid():
-            return form.save()
+            review = form.save()
+            NovelStatsService.review_added(review)
+            return review
         else:
             return form.errors
 
     @staticmethod
+    @transaction.atomic
     def edit_review(user, novel_slug, review_id, rating, content):
         novel = get_object_or_404(Novel, slug=novel_slug, deleted_at__isnull=True)
         review = get_object_or_404(Review, pk=review_id, novel=novel, is_active=True)
@@ -140,16 +163,20 @@ class ReviewService:
         if len(content) > MAX_LENGTH_REVIEW_CONTENT:
             return None, "too_long"
 
+        old_rating = review.rating
         review.rating = rating_value
         review.content = content.strip()
         review.save()
+        NovelStatsService.review_rating_changed(review, old_rating)
         return review, "ok"
 
     @staticmethod
+    @transaction.atomic
     def delete_review(novel_slug, review_id):
         novel = get_object_or_404(Novel, slug=novel_slug, deleted_at__isnull=True)
         review = get_object_or_404(Review, pk=review_id, novel=novel, is_active=True)
         review.delete()
+        NovelStatsService.review_removed(review)
         return True
     
     @staticmethod
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from common.utils.keyset import KeysetPaginator, InvalidCursor, encode_cursor
+from novels.models import Novel
+from interactions.models import Comment, Review
+from interactions.services.comment_service import CommentService
+from interactions.services.review_service import ReviewService
+from constants import PAGINATOR_COMMENT_LIST, KEYSET_MAX_PAGE_SIZE
+
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='12345', email='testuser@example.com')
+        self.novel = Novel.objects.create(name="Test Novel", slug="test-novel", created_by=self.user)
+        now = timezone.now()
+        self.comments = []
+        for i in range(15):
+            comment = Comment.objects.create(novel=self.novel, user=self.user, content=f"Comment {i+1}")
+            # Pairs of comments share a timestamp, so the id breaks ties
+            Comment.objects.filter(pk=comment.pk).update(created_at=now - timedelta(minutes=i // 2))
+            self.comments.append(comment)
+        self.expected = list(
+            Comment.objects.filter(novel=self.novel).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+
+    def paginator(self, per_page=4, **kwargs):
+        return KeysetPaginator(Comment.objects.filter(novel=self.novel), ('-created_at', '-id'), per_page, **kwargs)
+
+    def test_walks_forward_and_back_without_gaps(self):
+        paginator = self.paginator()
+        seen, pages = [], []
+        page = paginator.get_page()
+        self.assertFalse(page.has_previous())
+        while True:
+            pages.append(page)
+            seen.extend(comment.id for comment in page)
+            if not page.has_next():
+                break
+            page = paginator.get_page(page.next_cursor)
+        self.assertEqual(seen, self.expected)
+        self.assertEqual([len(page) for page in pages], [4, 4, 4, 3])
+
+        back = paginator.get_page(pages[-1].prev_cursor)
+        self.assertEqual([comment.id for comment in back], [comment.id for comment in pages[-2]])
+        first = paginator.get_page(pages[1].prev_cursor)
+        self.assertEqual([comment.id for comment in first], self.expected[:4])
+        self.assertFalse(first.has_previous())
+
+    def test_page_size_is_bounded(self):
+        self.assertEqual(self.paginator(per_page=10 ** 6).per_page, KEYSET_MAX_PAGE_SIZE)
+        self.assertEqual(self.paginator(per_page=0).per_page, 1)
+
+    def test_page_does_not_count(self):
+        paginator = self.paginator()
+        with self.assertNumQueries(1):
+            paginator.get_page()
+
+    def test_approximate_count(self):
+        self.assertEqual((self.paginator().count, self.paginator().count_capped), (15, False))
+        capped = self.paginator(count_cap=10)
+        self.assertEqual((capped.count, capped.count_capped), (10, True))
+        self.assertEqual(self.paginator(count_cap=None).count, 15)
+
+    def test_tampered_cursor_is_rejected(self):
+        cursor = self.paginator().get_page().next_cursor
+        for bad in (cursor[:-2] + 'xx', 'garbage', encode_cursor(['not a date', 'x'])):
+            with self.assertRaises(InvalidCursor):
+                self.paginator().get_page(bad)
+
+    def test_comment_service_cursor(self):
+        page = CommentService.get_novel_comments(self.novel, cursor="")
+        self.assertEqual([comment.id for comment in page], self.expected[:PAGINATOR_COMMENT_LIST])
+        page = CommentService.get_novel_comments(self.novel, cursor=page.next_cursor)
+        self.assertEqual([comment.id for comment in page], self.expected[PAGINATOR_COMMENT_LIST:2 * PAGINATOR_COMMENT_LIST])
+
+    def test_comments_view_cursor(self):
+        url = reverse('interactions:novel_comments', kwargs={'novel_slug': self.novel.slug})
+        data = self.client.get(url, {'cursor': ''}).json()
+        self.assertTrue(data['has_next'])
+        self.assertIsNone(data['prev_cursor'])
+        self.assertIn(f'data-cursor="{data["next_cursor"]}"', data['html'])
+
+        data = self.client.get(url, {'cursor': data['next_cursor']}).json()
+        self.assertTrue(data['has_prev'])
+
+        self.assertEqual(self.client.get(url, {'cursor': 'garbage'}).status_code, 400)
+
+    def test_reviews_cursor(self):
+        for i in range(12):
+            user = User.objects.create_user(username=f'reviewer{i}', password='12345', email=f'r{i}@example.com')
+            Review.objects.create(novel=self.novel, user=user, rating=5, content=f"Review {i}")
+        url = reverse('interactions:novel_reviews', kwargs={'novel_slug': self.novel.slug})
+
+        first = self.client.get(url, {'cursor': ''}).json()
+        second = self.client.get(url, {'cursor': first['next_cursor']}).json()
+
+        self.assertEqual(first['total_reviews'], 12)
+        self.assertTrue(first['has_next'])
+        self.assertFalse(second['has_next'])
+        self.assertIsNone(second['next_cursor'])
+        ids = [review['id'] for review in first['reviews'] + second['reviews']]
+        self.assertEqual(sorted(ids), sorted(Review.objects.values_list('id', flat=True)))
+
+        result = ReviewService.get_novel_reviews_data(self.novel.slug, cursor='')
+        self.assertFalse(result['total_reviews_capped'])
+        self.assertEqual(self.client.get(url, {'cursor': 'garbage'}).status_code, 400)
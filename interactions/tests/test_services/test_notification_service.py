@@ -1,10 +1,14 @@
+from unittest.mock import patch
+from django.db import connection
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from interactions.models import Notification
 from interactions.services import NotificationService
+from common.utils.sse import SSEManager
 from constants import (
     NotificationTypeChoices,
+    UserRole,
     LIMIT_DEFAULT,
     OFFSET_DEFAULT
 )
@@ -65,3 +69,82 @@ class NotificationServiceTest(TestCase):
         )
         
         self.assertEqual(len(notifications), 0)
+
+
+class NotificationFanOutTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'fan{i}', email=f'fan{i}@example.com', password='testpass123')
+            for i in range(5)
+        ]
+
+    @patch('interactions.services.notification_service.send_notifications')
+    def test_fan_out_writes_and_publishes_in_batches(self, mock_send):
+        progress = []
+        user_ids = User.objects.filter(username__startswith='fan').order_by('id').values_list('id', flat=True)
+
+        ContentType.objects.get_for_model(User)
+        # The streamed ids, then one INSERT per batch
+        with self.assertNumQueries(1 + 3):
+            sent = NotificationService.fan_out(
+                user_ids.iterator(),
+                title='Broadcast',
+                content='Hello',
+                notification_type=NotificationTypeChoices.SYSTEM,
+                related_object=self.users[0],
+                batch_size=2,
+                total=5,
+                progress=lambda done, total: progress.append((done, total)),
+            )
+
+        self.assertEqual(sent, 5)
+        self.assertEqual(progress, [(2, 5), (4, 5), (5, 5)])
+        self.assertEqual(mock_send.call_count, 3)
+        self.assertEqual([len(call.args[0]) for call in mock_send.call_args_list], [2, 2, 1])
+        self.assertTrue(all(n.pk for call in mock_send.call_args_list for n in call.args[0]))
+        self.assertEqual(
+            set(Notification.objects.filter(title='Broadcast').values_list('user_id', flat=True)),
+            {user.id for user in self.users}
+        )
+
+    @patch('interactions.services.notification_service.send_notifications')
+    def test_fan_out_loads_ids_when_bulk_insert_returns_none(self, mock_send):
+        # An older identical notification must not be mistaken for the new one
+        Notification.objects.create(
+            user=self.users[0], type=NotificationTypeChoices.SYSTEM, title='Broadcast', content='Hello'
+        )
+        user_ids = [user.id for user in self.users]
+
+        with patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            NotificationService.fan_out(
+                user_ids,
+                title='Broadcast',
+                content='Hello',
+                notification_type=NotificationTypeChoices.SYSTEM,
+                batch_size=2,
+            )
+
+        published = [n for call in mock_send.call_args_list for n in call.args[0]]
+        self.assertEqual(
+            {(n.user_id, n.pk) for n in published},
+            set(Notification.objects.filter(title='Broadcast').order_by('id').values_list('user_id', 'id')[1:])
+        )
+        self.assertTrue(all(SSEManager._format_sse_message({}, n.pk).startswith(f'id: {n.pk}\n') for n in published))
+
+    @patch('interactions.services.notification_service.send_notifications')
+    def test_notify_role_reaches_only_that_role(self, mock_send):
+        admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123',
+            role=UserRole.WEBSITE_ADMIN.value
+        )
+
+        sent = NotificationService.notify_role(
+            UserRole.WEBSITE_ADMIN.value,
+            title='Admins only',
+            content='Hello',
+            notification_type=NotificationTypeChoices.SYSTEM,
+        )
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(list(Notification.objects.filter(title='Admins only').values_list('user_id', flat=True)), [admin.id])
+        mock_send.assert_called_once()
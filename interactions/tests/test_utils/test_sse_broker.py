@@ -0,0 +1,131 @@
+import asyncio
+from types import SimpleNamespace
+from django.test import SimpleTestCase, override_settings
+
+from common.utils.sse import SSEManager, ASGISSEConnection
+from common.utils.sse_broker import InMemorySSEBroker, PostgresSSEBroker, get_sse_broker
+from constants import SSE_NOTIFY_MAX_PAYLOAD
+
+
+class SSEManagerTest(SimpleTestCase):
+    def run_async(self, coroutine):
+        return asyncio.run(asyncio.wait_for(coroutine, timeout=5))
+
+    def test_message_reaches_only_its_user(self):
+        async def scenario():
+            manager = SSEManager(shard_count=4, broker=InMemorySSEBroker())
+            alice, bob = ASGISSEConnection(1), ASGISSEConnection(2)
+            await manager.add_connection(1, alice)
+            await manager.add_connection(2, bob)
+
+            await manager.send_to_user(1, {'type': 'notification', 'data': {'id': 7}})
+
+            self.assertTrue(manager.has_connection(1))
+            self.assertEqual(manager.connection_count(), 2)
+            self.assertIn('"id": 7', await alice.get_message(timeout=0.1))
+            self.assertIsNone(await bob.get_message(timeout=0.01))
+
+            await manager.remove_connection(1, alice)
+            self.assertFalse(manager.has_connection(1))
+
+        self.run_async(scenario())
+
+    def test_batch_reaches_each_user(self):
+        async def scenario():
+            manager = SSEManager(shard_count=4, broker=InMemorySSEBroker())
+            alice, bob = ASGISSEConnection(1), ASGISSEConnection(2)
+            await manager.add_connection(1, alice)
+            await manager.add_connection(2, bob)
+
+            await manager.send_to_users([(1, {'n': 'a'}, 10), (2, {'n': 'b'}, 11)])
+
+            self.assertTrue((await alice.get_message(timeout=0.1)).startswith('id: 10\n'))
+            self.assertTrue((await bob.get_message(timeout=0.1)).startswith('id: 11\n'))
+            self.assertEqual(manager.event_log.since(2, 0)[0][0], 11)
+
+        self.run_async(scenario())
+
+    def test_busy_shard_does_not_block_other_users(self):
+        async def scenario():
+            manager = SSEManager(shard_count=4, broker=InMemorySSEBroker())
+            connection = ASGISSEConnection(2)
+            await manager.add_connection(2, connection)
+
+            # User 1 lives in shard 1, user 2 in shard 2
+            async with manager._shard(1).lock:
+                await manager.send_to_user(2, {'type': 'ping'})
+            self.assertIsNotNone(await connection.get_message(timeout=0.1))
+
+        self.run_async(scenario())
+
+    def test_full_queue_drops_instead_of_waiting(self):
+        async def scenario():
+            manager = SSEManager(shard_count=4, broker=InMemorySSEBroker())
+            slow, fast = ASGISSEConnection(1), ASGISSEConnection(1)
+            slow.message_queue = asyncio.Queue(maxsize=1)
+            await manager.add_connection(1, slow)
+            await manager.add_connection(1, fast)
+
+            with self.assertLogs('common.utils.sse', level='WARNING'):
+                for i in range(3):
+                    await asyncio.wait_for(manager.send_to_user(1, {'n': i}), timeout=0.5)
+
+            self.assertEqual(slow.message_queue.qsize(), 1)
+            self.assertEqual(fast.message_queue.qsize(), 3)
+
+        self.run_async(scenario())
+
+    def test_broker_selection(self):
+        with override_settings(SSE_BROKER='memory'):
+            self.assertIsInstance(get_sse_broker(), InMemorySSEBroker)
+        with override_settings(SSE_BROKER='postgres'):
+            self.assertIsInstance(get_sse_broker(), PostgresSSEBroker)
+        with self.assertRaises(ValueError):
+            get_sse_broker('redis')
+
+    def test_oversized_postgres_message_is_delivered_locally(self):
+        delivered = []
+
+        async def deliver(user_id, message, event_id=None):
+            delivered.append((user_id, message))
+
+        async def scenario():
+            broker = PostgresSSEBroker()
+            broker._deliver = deliver
+            with self.assertLogs('common.utils.sse_broker', level='WARNING'):
+                await broker.publish(3, 'x' * SSE_NOTIFY_MAX_PAYLOAD)
+
+        self.run_async(scenario())
+        self.assertEqual(delivered, [(3, 'x' * SSE_NOTIFY_MAX_PAYLOAD)])
+
+    def test_postgres_listener_keeps_delivery_tasks(self):
+        delivered = []
+
+        class Listener:
+            def __init__(self):
+                self.notifies = [SimpleNamespace(payload='{"u": 4, "m": "hello", "e": 9}')]
+
+            def poll(self):
+                pass
+
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def deliver(user_id, message, event_id=None):
+                await gate.wait()
+                delivered.append((user_id, message, event_id))
+
+            broker = PostgresSSEBroker()
+            broker._deliver = deliver
+            broker._listener = Listener()
+            broker._loop = asyncio.get_running_loop()
+            broker._on_readable()
+
+            self.assertEqual(len(broker._tasks), 1)
+            gate.set()
+            await asyncio.gather(*broker._tasks)
+            await asyncio.sleep(0)
+            self.assertEqual(broker._tasks, set())
+
+        self.run_async(scenario())
+        self.assertEqual(delivered, [(4, 'hello', 9)])
@@ -0,0 +1,137 @@
+import asyncio
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from common.utils.sse import (
+    SSEManager,
+    SSEEventLog,
+    ASGISSEConnection,
+    HeartbeatWheel,
+    sse_event_stream,
+    _missed_notification_events,
+)
+from common.utils.sse_broker import InMemorySSEBroker
+from interactions.models import Notification
+from constants import NotificationTypeChoices
+
+User = get_user_model()
+
+
+class SSEEventLogTest(SimpleTestCase):
+    def test_ring_is_complete_from_its_floor(self):
+        log = SSEEventLog(size=3)
+        for event_id in (10, 11, 12):
+            log.record(1, event_id, f'm{event_id}')
+
+        self.assertTrue(log.covers(1, 10))
+        self.assertFalse(log.covers(1, 9))
+        self.assertFalse(log.covers(2, 10))
+        self.assertEqual(log.since(1, 10), [(11, 'm11'), (12, 'm12')])
+
+        log.record(1, 13, 'm13')
+        # 10 was pushed out: a client at 10 still has everything it needs, 9 does not
+        self.assertTrue(log.covers(1, 10))
+        self.assertFalse(log.covers(1, 9))
+        log.record(1, 14, 'm14')
+        self.assertFalse(log.covers(1, 10))
+        self.assertEqual(log.since(1, 11), [(12, 'm12'), (13, 'm13'), (14, 'm14')])
+
+    def test_least_recent_users_are_dropped(self):
+        log = SSEEventLog(size=3, max_users=2)
+        log.record(1, 1, 'a')
+        log.record(2, 2, 'b')
+        log.record(1, 3, 'c')
+        log.record(3, 4, 'd')
+
+        self.assertFalse(log.covers(2, 2))
+        self.assertTrue(log.covers(1, 1))
+        self.assertTrue(log.covers(3, 4))
+
+
+class SSEReplayTest(SimpleTestCase):
+    def run_async(self, coroutine):
+        return asyncio.run(asyncio.wait_for(coroutine, timeout=5))
+
+    def test_events_have_ids(self):
+        self.assertTrue(SSEManager._format_sse_message({'a': 1}, 5).startswith('id: 5\ndata: '))
+        self.assertTrue(SSEManager._format_sse_message({'a': 1}).startswith('data: '))
+
+    def test_reconnect_replays_missed_events_from_memory(self):
+        async def scenario():
+            manager = SSEManager(shard_count=4, broker=InMemorySSEBroker())
+            wheel = HeartbeatWheel(interval=30, tick=1)
+            # Register the broker callback, as a first stream would
+            await manager.add_connection(9, ASGISSEConnection(9))
+            for event_id in (1, 2, 3):
+                await manager.send_to_user(5, {'type': 'notification', 'n': event_id}, event_id=event_id)
+
+            with patch('common.utils.sse._missed_notification_events') as from_db:
+                stream = sse_event_stream(5, manager, wheel, last_event_id=1)
+                self.assertIn('"connected"', await stream.__anext__())
+                self.assertTrue((await stream.__anext__()).startswith('id: 2\n'))
+                self.assertTrue((await stream.__anext__()).startswith('id: 3\n'))
+            from_db.assert_not_called()
+
+            await manager.send_to_user(5, {'type': 'notification'}, event_id=4)
+            self.assertTrue((await stream.__anext__()).startswith('id: 4\n'))
+            await manager.shutdown()
+            await stream.aclose()
+
+        self.run_async(scenario())
+
+    def test_reconnect_beyond_the_log_reads_the_database(self):
+        async def scenario():
+            manager = SSEManager(shard_count=4, broker=InMemorySSEBroker())
+            wheel = HeartbeatWheel(interval=30, tick=1)
+            await manager.add_connection(9, ASGISSEConnection(9))
+            for event_id in (5, 6):
+                await manager.send_to_user(5, {'type': 'notification'}, event_id=event_id)
+
+            db_events = [(3, 'id: 3\ndata: {}\n\n'), (5, 'id: 5\ndata: {}\n\n')]
+            with patch('common.utils.sse._missed_notification_events', return_value=db_events) as from_db:
+                stream = sse_event_stream(5, manager, wheel, last_event_id=2)
+                await stream.__anext__()
+                replayed = [await stream.__anext__() for _ in range(3)]
+            from_db.assert_called_once_with(5, 2)
+            # The log continues after the newest notification read
+            self.assertEqual([m.split('\n')[0] for m in replayed], ['id: 3', 'id: 5', 'id: 6'])
+            await manager.shutdown()
+            await stream.aclose()
+
+        self.run_async(scenario())
+
+    def test_full_queue_closes_stream_instead_of_losing_event(self):
+        async def scenario():
+            manager = SSEManager(shard_count=4, broker=InMemorySSEBroker())
+            slow = ASGISSEConnection(1)
+            slow.message_queue = asyncio.Queue(maxsize=1)
+            await manager.add_connection(1, slow)
+
+            await manager.send_to_user(1, {'n': 1}, event_id=1)
+            with self.assertLogs('common.utils.sse', level='WARNING'):
+                await manager.send_to_user(1, {'n': 2}, event_id=2)
+
+            self.assertTrue(slow.closed)
+            self.assertEqual([event_id for event_id, _ in manager.event_log.since(1, 0)], [1, 2])
+
+        self.run_async(scenario())
+
+
+class MissedNotificationEventsTest(TestCase):
+    def test_reads_notifications_after_last_event_id(self):
+        user = User.objects.create_user(username='reader', email='reader@example.com', password='pass12345')
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        notifications = [
+            Notification.objects.create(
+                user=user, type=NotificationTypeChoices.SYSTEM, title=f'N{i}', content='c'
+            )
+            for i in range(3)
+        ]
+        Notification.objects.create(user=other, type=NotificationTypeChoices.SYSTEM, title='X', content='c')
+
+        events = _missed_notification_events(user.id, notifications[0].id)
+
+        self.assertEqual([event_id for event_id, _ in events], [n.id for n in notifications[1:]])
+        self.assertTrue(events[0][1].startswith(f'id: {notifications[1].id}\ndata: '))
+        self.assertIn('"N1"', events[0][1])
@@ -0,0 +1,86 @@
+import asyncio
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from common.utils.sse import SSEManager, ASGISSEConnection, HeartbeatWheel, sse_event_stream
+from common.utils.sse_benchmark import run_sse_benchmark
+from common.utils.sse_broker import InMemorySSEBroker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class HeartbeatWheelTest(SimpleTestCase):
+    def test_only_idle_connections_get_heartbeats(self):
+        async def scenario():
+            clock = FakeClock()
+            wheel = HeartbeatWheel(interval=30, tick=1, clock=clock)
+            idle, active, closed = ASGISSEConnection(1), ASGISSEConnection(2), ASGISSEConnection(3)
+            for connection in (idle, active, closed):
+                connection.last_sent = clock.now
+                wheel.register(connection)
+            wheel._task.cancel()
+            closed.close()
+
+            clock.now += 10
+            active.last_sent = clock.now
+            self.assertEqual(wheel.advance(), 0)
+
+            clock.now += 21
+            self.assertEqual(wheel.advance(), 1)
+            self.assertIn('"heartbeat"', idle.message_queue.get_nowait())
+            self.assertTrue(active.message_queue.empty())
+            self.assertEqual(len(wheel), 2)
+
+            # The active one is due 30s after its last message
+            clock.now += 10
+            self.assertEqual(wheel.advance(), 1)
+            self.assertIn('"heartbeat"', active.message_queue.get_nowait())
+
+        asyncio.run(scenario())
+
+
+class SSEStreamTest(SimpleTestCase):
+    def test_stream_delivers_and_stops_on_close(self):
+        async def scenario():
+            manager = SSEManager(shard_count=4, broker=InMemorySSEBroker())
+            wheel = HeartbeatWheel(interval=30, tick=1)
+            stream = sse_event_stream(5, manager, wheel)
+
+            self.assertIn('"connected"', await stream.__anext__())
+            tasks = len(asyncio.all_tasks())
+            next_message = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0.05)
+            # Waiting costs no extra task besides the pending get()
+            self.assertEqual(len(asyncio.all_tasks()), tasks + 1)
+
+            await manager.send_to_user(5, {'type': 'notification'})
+            self.assertIn('"notification"', await next_message)
+
+            await manager.shutdown()
+            with self.assertRaises(StopAsyncIteration):
+                await stream.__anext__()
+            self.assertFalse(manager.has_connection(5))
+
+        asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+
+class SSEBenchmarkTest(SimpleTestCase):
+    def test_benchmark_reports_per_connection_costs(self):
+        result = run_sse_benchmark(connections=20, idle_seconds=0.3, heartbeat_interval=0.1, tick=0.05)
+
+        self.assertEqual(result['connections'], 20)
+        self.assertGreater(result['memory_per_connection'], 0)
+        self.assertGreater(result['heartbeats'], 0)
+        self.assertGreaterEqual(result['idle_cpu_per_connection_us'], 0)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('benchmark_sse', '--connections', '5,10', '--idle-seconds', '0.01', stdout=out)
+        self.assertIn("Benchmarked 2 SSE loads", out.getvalue())
@@ -144,7 +144,21 @@ class NotificationViewTest(TestCase):
 
         response = self.client.get('/interactions/sse/stream/')
 
-        mock_sse.assert_called_once_with(self.user.id)
+        mock_sse.assert_called_once_with(self.user.id, last_event_id=None)
         self.assertEqual(response, mock_response)
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertEqual(response["Content-Type"], "text/event-stream")
+
+    @patch('interactions.views.public.notification_view.create_sse_response')
+    def test_sse_stream_passes_last_event_id(self, mock_sse):
+        self.client.force_login(self.user)
+        mock_sse.return_value = HttpResponse("mock stream", content_type="text/event-stream")
+
+        self.client.get('/interactions/sse/stream/', HTTP_LAST_EVENT_ID='42')
+        mock_sse.assert_called_with(self.user.id, last_event_id=42)
+
+        self.client.get('/interactions/sse/stream/?last_event_id=7')
+        mock_sse.assert_called_with(self.user.id, last_event_id=7)
+
+        self.client.get('/interactions/sse/stream/', HTTP_LAST_EVENT_ID='abc')
+        mock_sse.assert_called_with(self.user.id, last_event_id=None)
@@ -8,6 +8,7 @@ from interactions.forms.comment_form import CommentForm
 from novels.models import Novel
 from interactions.services.comment_service import CommentService
 from django.http import JsonResponse, HttpResponseNotAllowed
+from common.utils.keyset import InvalidCursor
 from django.template.loader import render_to_string
 from constants import DEFAULT_PAGE_NUMBER
 from django.urls import reverse
@@ -15,11 +16,15 @@ from interactions.forms.report_form import ReportForm
 from django.core.paginator import Paginator
 
 def novel_comments(request, novel_slug):
-    """API trả về HTML comment phân trang"""
+    """API trả về HTML comment phân trang (?cursor= theo keyset, ?page= theo số trang)"""
     page = request.GET.get("page", DEFAULT_PAGE_NUMBER)
+    cursor = request.GET.get("cursor")
     novel = get_object_or_404(Novel, slug=novel_slug)
 
-    comments_page = CommentService.get_novel_comments(novel, page=page)
+    try:
+        comments_page = CommentService.get_novel_comments(novel, page=page, cursor=cursor)
+    except InvalidCursor as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
     report_form = ReportForm()
     html = render_to_string("novels/includes/comment_list.html", {
         "comments": comments_page,
@@ -27,13 +32,18 @@ def novel_comments(request, novel_slug):
         "report_form": report_form,
     }, request=request)
 
-    return JsonResponse({
+    data = {
         "html": html,
         "has_next": comments_page.has_next(),
         "has_prev": comments_page.has_previous(),
-        "page": comments_page.number,
-        "num_pages": comments_page.paginator.num_pages,
-    })
+    }
+    if cursor is not None:
+        data["next_cursor"] = comments_page.next_cursor
+        data["prev_cursor"] = comments_page.prev_cursor
+    else:
+        data["page"] = comments_page.number
+        data["num_pages"] = comments_page.paginator.num_pages
+    return JsonResponse(data)
 
 @login_required
 def add_comment(request, novel_slug):
@@ -52,7 +62,7 @@ def add_comment(request, novel_slug):
                 parent_comment=parent_comment
             )
 
-            comments_page = CommentService.get_novel_comments(novel, page=DEFAULT_PAGE_NUMBER)
+            comments_page = CommentService.get_novel_comments(novel, cursor="")
             report_form = ReportForm()
             html = render_to_string("novels/includes/comment_list.html", {
                 "comments": comments_page,
@@ -65,8 +75,7 @@ def add_comment(request, novel_slug):
                 "html": html,
                 "has_next": comments_page.has_next(),
                 "has_prev": comments_page.has_previous(),
-                "page": comments_page.number,
-                "num_pages": comments_page.paginator.num_pages,
+                "next_cursor": comments_page.next_cursor,
                 "content": comment.content,
                 "parent_id": comment.parent_comment.id if comment.parent_comment else None,
             })
@@ -45,7 +45,14 @@ def notification_mark_read(request, pk):
 @csrf_exempt
 def sse_stream(request):
     user_id = request.user.id
-    return create_sse_response(user_id)
+    # EventSource resends the header on its own reconnects, the page script
+    # passes the id as a parameter when it opens a new EventSource
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    return create_sse_response(user_id, last_event_id=last_event_id)
 
 @require_http_methods(["POST"])
 @login_required
@@ -53,10 +60,8 @@ def sse_ping(request):
     try:
         user_id = request.user.id
         
-        # Kiểm tra xem user có active SSE connections không
-        has_connection = False
-        if user_id in sse_manager.connections:
-            has_connection = len(sse_manager.connections[user_id]) > 0
+        # Kiểm tra xem user có active SSE connections không (trong worker này)
+        has_connection = sse_manager.has_connection(user_id)
         
         if has_connection:
             heartbeat_data = {
@@ -7,7 +7,7 @@ from django.views.decorators.http import require_http_methods
 from interactions.services import ReviewService, NotificationService
 from common.decorators import require_login, require_owner_or_admin
 from novels.models import Novel
-from common.utils import send_notification_to_user
+from common.utils import send_notification_to_user, InvalidCursor
 from asgiref.sync import async_to_sync
 from django.db import IntegrityError
 from constants import (
@@ -21,16 +21,23 @@ from constants import (
 
 @require_http_methods(["GET"])
 def novel_reviews(request, novel_slug):
-    """Danh sách review của 1 novel"""
+    """Danh sách review của 1 novel (?cursor= theo keyset, ?page= theo số trang)"""
     try:
-        page = int(request.GET.get("page", DEFAULT_PAGE_NUMBER))
         rating_filter = request.GET.get("rating", "").strip()
-
-        result = ReviewService.get_novel_reviews_data(
-            novel_slug=novel_slug,
-            rating_filter=rating_filter,
-            page=page
-        )
+        cursor = request.GET.get("cursor")
+
+        if cursor is not None:
+            result = ReviewService.get_novel_reviews_data(
+                novel_slug=novel_slug,
+                rating_filter=rating_filter,
+                cursor=cursor
+            )
+        else:
+            result = ReviewService.get_novel_reviews_data(
+                novel_slug=novel_slug,
+                rating_filter=rating_filter,
+                page=int(request.GET.get("page", DEFAULT_PAGE_NUMBER))
+            )
 
         reviews_data = []
         for review in result["page_obj"]:
@@ -50,12 +57,16 @@ def novel_reviews(request, novel_slug):
             "success": True,
             "reviews": reviews_data,
             "has_next": result["page_obj"].has_next(),
+            "next_cursor": result.get("next_cursor"),
             "total_reviews": result["total_reviews"],
+            "total_reviews_capped": result.get("total_reviews_capped", False),
             "filters": {
                 "rating": rating_filter,
                 "sort": "-created_at",  # mặc định service đang order '-created_at'
             },
         })
+    except InvalidCursor as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=HTTPStatus.BAD_REQUEST)
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)}, status=500)
 
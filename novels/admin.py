@@ -4,8 +4,10 @@ from django.urls import reverse
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.http import HttpResponseRedirect
-from .models import Novel, Author, Artist, Tag, Chapter, Chunk, Volume
+from .models import Novel, Author, Artist, Tag, Chapter, Chunk, Volume, ChapterJob
 from .utils import ChunkManager
+from .services import ChapterService
+from constants import CHUNK_CODEC_RAW
 
 # Register your models here.
 
@@ -51,11 +53,11 @@ class VolumeAdmin(admin.ModelAdmin):
 
 @admin.register(Chapter)
 class ChapterAdmin(admin.ModelAdmin):
-    list_display = ("title", "volume", "position", "word_count", "chunk_count", "approved", "is_deleted", "created_at")
+    list_display = ("title", "volume", "position", "word_count", "chunk_count", "approved", "processing_status", "is_deleted", "created_at")
     search_fields = ("title", "volume__name", "volume__novel__name")
-    list_filter = ("approved", "is_hidden", "volume__novel", "deleted_at")
+    list_filter = ("approved", "is_hidden", "processing_status", "volume__novel", "deleted_at")
     ordering = ("volume__novel", "volume__position", "position")
-    actions = ["rechunk_chapters", "soft_delete_chapters", "restore_chapters"]
+    actions = ["rechunk_chapters", "soft_delete_chapters", "restore_chapters", "hide_chapters", "unhide_chapters"]
     
     def chunk_count(self, obj):
         return obj.chunks.count()
@@ -95,28 +97,82 @@ class ChapterAdmin(admin.ModelAdmin):
     
     rechunk_chapters.short_description = "Re-chunk selected chapters normally"
     
+    # Chapters go through ChapterService one by one (not queryset.update()) so the
+    # novel's latest chapter pointer is maintained and post_save drops the TOC,
+    # chunk cache and home snapshot
     def soft_delete_chapters(self, request, queryset):
         """Action to soft delete selected chapters."""
-        from django.utils import timezone
-        updated = queryset.filter(deleted_at__isnull=True).update(deleted_at=timezone.now())
+        updated = 0
+        for chapter in queryset.filter(deleted_at__isnull=True).select_related('volume__novel'):
+            ChapterService.soft_delete_chapter(chapter)
+            updated += 1
         messages.success(request, f"Successfully soft deleted {updated} chapters.")
     soft_delete_chapters.short_description = "Soft delete selected chapters"
     
     def restore_chapters(self, request, queryset):
         """Action to restore soft deleted chapters."""
-        updated = queryset.filter(deleted_at__isnull=False).update(deleted_at=None)
+        updated = 0
+        for chapter in queryset.filter(deleted_at__isnull=False).select_related('volume__novel'):
+            ChapterService.restore_chapter(chapter)
+            updated += 1
         messages.success(request, f"Successfully restored {updated} chapters.")
     restore_chapters.short_description = "Restore selected chapters"
+    
+    def hide_chapters(self, request, queryset):
+        """Action to hide selected chapters."""
+        updated = 0
+        for chapter in queryset.filter(is_hidden=False).select_related('volume__novel'):
+            ChapterService.set_chapter_hidden(chapter, True)
+            updated += 1
+        messages.success(request, f"Successfully hid {updated} chapters.")
+    hide_chapters.short_description = "Hide selected chapters"
+    
+    def unhide_chapters(self, request, queryset):
+        """Action to unhide selected chapters."""
+        updated = 0
+        for chapter in queryset.filter(is_hidden=True).select_related('volume__novel'):
+            ChapterService.set_chapter_hidden(chapter, False)
+            updated += 1
+        messages.success(request, f"Successfully unhid {updated} chapters.")
+    unhide_chapters.short_description = "Unhide selected chapters"
 
 
 @admin.register(Chunk)
 class ChunkAdmin(admin.ModelAdmin):
-    list_display = ("chapter", "position", "word_count", "content_preview")
+    list_display = ("chapter", "position", "word_count", "codec", "content_preview")
     search_fields = ("chapter__title", "chapter__volume__name", "content")
     list_filter = ("chapter__volume__novel",)
     ordering = ("chapter__volume__novel", "chapter__volume__position", "chapter__position", "position")
-    readonly_fields = ("word_count",)
+    readonly_fields = ("word_count", "codec")
+    exclude = ("compressed_content",)
+    
+    def get_readonly_fields(self, request, obj=None):
+        # The content column of a compressed chunk is empty and not read
+        if obj is not None and obj.codec != CHUNK_CODEC_RAW:
+            return (*self.readonly_fields, "content")
+        return self.readonly_fields
     
     def content_preview(self, obj):
-        return obj.content[:100] + "..." if len(obj.content) > 100 else obj.content
+        content = obj.get_content()
+        return content[:100] + "..." if len(content) > 100 else content
     content_preview.short_description = "Content Preview"
+
+
+@admin.register(ChapterJob)
+class ChapterJobAdmin(admin.ModelAdmin):
+    list_display = ("chapter", "kind", "status", "attempts", "run_after", "finished_at", "last_error")
+    search_fields = ("chapter__title", "chapter__volume__novel__name")
+    list_filter = ("kind", "status")
+    ordering = ("-created_at",)
+    readonly_fields = ("attempts", "locked_at", "finished_at", "last_error")
+    actions = ["retry_jobs"]
+
+    def retry_jobs(self, request, queryset):
+        """Action to queue the selected jobs again."""
+        from django.utils import timezone
+        from constants import ChapterJobStatus
+        updated = queryset.exclude(status=ChapterJobStatus.RUNNING.value).update(
+            status=ChapterJobStatus.PENDING.value, attempts=0, run_after=timezone.now(), finished_at=None
+        )
+        messages.success(request, f"Successfully queued {updated} jobs again.")
+    retry_jobs.short_description = "Retry selected jobs"
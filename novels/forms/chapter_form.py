@@ -2,11 +2,10 @@ from django import forms
 from django.utils.translation import gettext_lazy as _
 from novels.models import Chapter, Volume
 from django.utils.text import slugify
-from novels.utils import ChunkManager, HtmlChunker
+from novels.services import ChapterJobService
 from tinymce.widgets import TinyMCE
 from constants import (
     MAX_VOLUME_NAME_LENGTH,
-    MAX_CHUNK_SIZE,
     TINYMCE_COLS,
     TINYMCE_ROWS,
 )
@@ -193,17 +192,8 @@ class ChapterForm(forms.ModelForm):
         if commit:
             chapter.save()
             
-            # Use HTML chunking for rich text content
-            # Create HTML chunker with database limit
-            chunker = HtmlChunker(max_chunk_size=MAX_CHUNK_SIZE)  # Database TEXT field limit
-            
-            # Create chunks using HTML-aware chunking
-            chunk_count = ChunkManager.create_html_chunks_for_chapter(
-                chapter=chapter,
-                content=content,
-                chunker=chunker
-            )
-            
-            # Note: chapter.word_count is updated automatically by ChunkManager
+            # Chunking, word counting and stats run in the process_chapter_jobs
+            # worker; the raw content waits in the job until then
+            ChapterJobService.enqueue_processing(chapter, content)
         
         return chapter
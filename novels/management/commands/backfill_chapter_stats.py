@@ -0,0 +1,41 @@
+"""
+Django management command to backfill the chunk statistics stored on each chapter
+"""
+from django.core.management.base import BaseCommand
+
+from novels.models import Chapter
+from novels.utils import ChunkManager
+from constants import CHAPTER_STATS_BACKFILL_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Recompute chunk_count/avg_chunk_words/max_chunk_words/char_count/reading_minutes from chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=CHAPTER_STATS_BACKFILL_BATCH_SIZE,
+            help=f'Chapters per batch (default: {CHAPTER_STATS_BACKFILL_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every chapter, not only chapters without stored statistics'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        chapter_ids = Chapter.objects.order_by('id').values_list('id', flat=True)
+        if not options['all']:
+            chapter_ids = chapter_ids.filter(chunk_count=0, chunks__isnull=False).distinct()
+
+        chapter_ids = list(chapter_ids)
+        changed = 0
+
+        for start in range(0, len(chapter_ids), batch_size):
+            changed += ChunkManager.refresh_chunk_stats(chapter_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Chunk stats updated for {changed} of {len(chapter_ids)} chapters"
+        ))
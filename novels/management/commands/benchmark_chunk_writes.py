@@ -0,0 +1,109 @@
+"""
+Django management command to measure chunk write throughput for large chapters
+"""
+import random
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from novels.models import Novel, Volume, Chapter, Chunk
+from novels.utils import ChunkManager, HtmlChunker
+from novels.utils.chunker_benchmark import parse_size, build_synthetic_html
+from constants import ApprovalStatus
+
+
+class BenchmarkRollback(Exception):
+    """Raised to roll back the benchmark's writes"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ChunkManager writes (bulk path vs one INSERT per chunk) on synthetic chapters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='100KB,1MB,5MB',
+            help='Comma separated chapter sizes (default: 100KB,1MB,5MB)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Random seed of the synthetic chapters'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [(size.strip(), parse_size(size)) for size in options['sizes'].split(',')]
+        except ValueError as e:
+            raise CommandError(e)
+        rng = random.Random(options['seed'])
+
+        try:
+            with transaction.atomic():
+                volume = self.create_volume()
+                for label, size in sizes:
+                    self.benchmark(volume, label, build_synthetic_html(rng, size))
+                raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+
+    def create_volume(self):
+        novel = Novel.objects.create(
+            name="Chunk write benchmark",
+            summary="Benchmark",
+            approval_status=ApprovalStatus.DRAFT.value
+        )
+        return Volume.objects.create(novel=novel, name="Benchmark", position=1)
+
+    def benchmark(self, volume, label, content):
+        position = volume.chapters.count() + 1
+        chapter = Chapter.objects.create(volume=volume, title=f"Chapter {label}", position=position)
+
+        started = time.perf_counter()
+        chunks_data, total_words = HtmlChunker().split_with_word_count(content)
+        chunk_seconds = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{label}: {len(content) / 1024:.0f} KB, {len(chunks_data)} chunks, "
+            f"chunking {chunk_seconds * 1000:.1f} ms"
+        )
+
+        self.report("per-row insert", len(content), lambda: self.write_row_by_row(chapter, chunks_data))
+        Chunk.objects.filter(chapter=chapter).delete()
+        self.report("bulk insert", len(content), lambda: ChunkManager.write_chunks(
+            chapter, chunks_data, total_words
+        ))
+        self.report("rewrite, unchanged", len(content), lambda: ChunkManager.write_chunks(
+            chapter, chunks_data, total_words
+        ))
+
+        edited = list(chunks_data)
+        edited[len(edited) // 2] = ("<p>Edited paragraph.</p>", 2)
+        self.report("rewrite, one chunk edited", len(content), lambda: ChunkManager.write_chunks(
+            chapter, edited, total_words
+        ))
+
+    def write_row_by_row(self, chapter, chunks_data):
+        """The previous write path: delete everything, one INSERT per chunk"""
+        Chunk.objects.filter(chapter=chapter).delete()
+        for position, (chunk_content, word_count) in enumerate(chunks_data, 1):
+            Chunk.objects.create(
+                chapter=chapter,
+                position=position,
+                content=chunk_content,
+                word_count=word_count
+            )
+
+    def report(self, name, content_size, write):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            write()
+            elapsed = time.perf_counter() - started
+
+        throughput = content_size / (1024 * 1024) / elapsed if elapsed else float('inf')
+        self.stdout.write(
+            f"  {name:<26} {elapsed * 1000:9.1f} ms  {throughput:8.1f} MB/s  "
+            f"{len(queries.captured_queries):5d} queries"
+        )
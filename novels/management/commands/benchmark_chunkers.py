@@ -0,0 +1,86 @@
+"""
+Django management command to benchmark the chunkers and catch throughput regressions
+"""
+import json
+from django.core.management.base import BaseCommand, CommandError
+
+from novels.utils.chunker_benchmark import build_corpus, run_benchmarks, find_regressions, TARGET_KINDS
+from constants import CHUNKER_BENCHMARK_REPEAT, CHUNKER_BENCHMARK_REGRESSION_THRESHOLD
+
+
+class Command(BaseCommand):
+    help = 'Benchmark HtmlChunker, SimpleChunker and count_words on a synthetic/TinyMCE corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10KB,100KB,1MB',
+            help='Comma separated document sizes (default: 10KB,100KB,1MB)'
+        )
+        parser.add_argument(
+            '--target',
+            action='append',
+            choices=sorted(TARGET_KINDS),
+            help='Only benchmark this target (repeatable)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=CHUNKER_BENCHMARK_REPEAT,
+            help=f'Timed runs per document, the best one is kept (default: {CHUNKER_BENCHMARK_REPEAT})'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Random seed of the corpus'
+        )
+        parser.add_argument(
+            '--save',
+            help='Write the results to this JSON file (to be used as a --baseline later)'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON results of an earlier run; fail if throughput regressed past --threshold'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=CHUNKER_BENCHMARK_REGRESSION_THRESHOLD,
+            help=f'Allowed throughput drop against the baseline (default: {CHUNKER_BENCHMARK_REGRESSION_THRESHOLD})'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            corpus = build_corpus(options['sizes'].split(','), options['seed'])
+        except ValueError as e:
+            raise CommandError(e)
+
+        results = run_benchmarks(corpus, options['target'], options['repeat'])
+
+        self.stdout.write(
+            f"{'target':<15} {'document':<17} {'size KB':>8} {'ms':>9} {'MB/s':>8} "
+            f"{'peak KB':>8} {'chunks':>6}  chunk size min/median/p95/max"
+        )
+        for row in results:
+            sizes = row['chunk_sizes']
+            self.stdout.write(
+                f"{row['target']:<15} {row['document']:<17} {row['size'] / 1024:8.0f} "
+                f"{row['seconds'] * 1000:9.2f} {row['throughput']:8.1f} {row['peak_memory_kb']:8d} "
+                f"{row['chunks']:6d}  {sizes['min']}/{sizes['median']}/{sizes['p95']}/{sizes['max']}"
+            )
+
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results saved to {options['save']}")
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+            regressions = find_regressions(results, baseline, options['threshold'])
+            if regressions:
+                raise CommandError(
+                    "Throughput regressed past the threshold:\n" + '\n'.join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS("No throughput regression against the baseline"))
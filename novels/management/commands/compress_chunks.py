@@ -0,0 +1,48 @@
+"""
+Django management command to convert stored chunks to another storage codec
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from novels.utils import ChunkCodec, ChunkManager
+from constants import CHUNK_COMPRESS_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Re-encode existing chunks with a storage codec (raw, zlib or zstd), in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--codec',
+            default=None,
+            help='Target codec (default: settings.CHUNK_STORAGE_CODEC); "raw" decompresses'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=CHUNK_COMPRESS_BATCH_SIZE,
+            help=f'Chunks per batch (default: {CHUNK_COMPRESS_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        codec = options['codec'] or ChunkCodec.storage_codec()
+        try:
+            ChunkCodec.check(codec)
+        except ValueError as e:
+            raise CommandError(e)
+
+        after_id = 0
+        converted = stored_before = stored_after = 0
+        while True:
+            result = ChunkManager.convert_chunk_batch(codec, after_id, options['batch_size'])
+            if result['last_id'] is None:
+                break
+            after_id = result['last_id']
+            converted += result['converted']
+            stored_before += result['stored_before']
+            stored_after += result['stored_after']
+            self.stdout.write(f"  up to chunk #{after_id}: {converted} converted")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Converted {converted} chunks to {codec}: "
+            f"{stored_before / 1024:.0f} KB -> {stored_after / 1024:.0f} KB"
+        ))
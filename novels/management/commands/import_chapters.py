@@ -0,0 +1,67 @@
+"""
+Django management command to bulk import chapter files into a novel
+"""
+import os
+from django.core.management.base import BaseCommand, CommandError
+
+from novels.models import Novel
+from novels.services import ChapterImportService
+from constants import CHAPTER_IMPORT_BATCH_SIZE, CHAPTER_IMPORT_DEFAULT_VOLUME
+
+
+class Command(BaseCommand):
+    help = (
+        'Import chapters (.html/.htm/.txt files, one directory per volume) from a directory, '
+        'zip or tar archive; chunking runs on all cores. Re-run to resume a failed import.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('novel', help='Slug of the target novel')
+        parser.add_argument('path', help='Directory, .zip or tar archive of chapter files')
+        parser.add_argument(
+            '--volume',
+            default=CHAPTER_IMPORT_DEFAULT_VOLUME,
+            help=f'Volume for files at the top level (default: {CHAPTER_IMPORT_DEFAULT_VOLUME})'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=CHAPTER_IMPORT_BATCH_SIZE,
+            help=f'Chapters per transaction (default: {CHAPTER_IMPORT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Chunking processes (default: number of CPUs, 0 = no pool)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            novel = Novel.objects.get(slug=options['novel'], deleted_at__isnull=True)
+        except Novel.DoesNotExist:
+            raise CommandError(f"Novel '{options['novel']}' does not exist")
+        if not os.path.exists(options['path']):
+            raise CommandError(f"{options['path']} does not exist")
+
+        try:
+            result = ChapterImportService.import_chapters(
+                novel,
+                options['path'],
+                default_volume=options['volume'],
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                progress=self.report_progress,
+            )
+        except Exception as e:
+            raise CommandError(
+                f"Import stopped: {e}. Chapters written so far are kept; "
+                f"run the command again to resume."
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['imported']} of {result['total']} chapters into '{novel.name}' "
+            f"({result['skipped']} already present)"
+        ))
+
+    def report_progress(self, done, total, elapsed):
+        self.stdout.write(f"  {done}/{total} chapters ({done / total:.0%}) in {elapsed:.1f}s")
@@ -0,0 +1,67 @@
+"""
+Django management command to run queued chapter jobs (chunking, notifications)
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from novels.services import ChapterJobService
+from constants import CHAPTER_JOB_BATCH_SIZE, CHAPTER_JOB_POLL_INTERVAL
+
+
+class Command(BaseCommand):
+    help = 'Run pending chapter jobs: chunk submitted chapters and send approval notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=CHAPTER_JOB_BATCH_SIZE,
+            help=f'Jobs claimed at a time (default: {CHAPTER_JOB_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for jobs every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=CHAPTER_JOB_POLL_INTERVAL,
+            help=f'Seconds between polls in --loop mode (default: {CHAPTER_JOB_POLL_INTERVAL})'
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Queue failed jobs again before running'
+        )
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            requeued = ChapterJobService.retry_failed()
+            self.stdout.write(f"Queued {requeued} failed jobs again")
+
+        while True:
+            if options['loop']:
+                # Long-lived worker: honour CONN_MAX_AGE and drop broken connections
+                close_old_connections()
+            started = time.monotonic()
+            claimed = done = failed = 0
+            # Drain everything that is due before sleeping
+            while True:
+                result = ChapterJobService.run_pending(options['batch_size'])
+                if not result['claimed']:
+                    break
+                claimed += result['claimed']
+                done += result['done']
+                failed += result['failed']
+
+            if claimed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Ran {claimed} chapter jobs in {time.monotonic() - started:.2f}s "
+                    f"({done} done, {failed} failed)"
+                ))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
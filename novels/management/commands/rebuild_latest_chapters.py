@@ -0,0 +1,42 @@
+"""
+Django management command to backfill or repair Novel.latest_chapter pointers
+"""
+from django.core.management.base import BaseCommand
+
+from novels.models import Novel
+from novels.services import LatestChapterService
+from constants import LATEST_CHAPTER_REBUILD_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Backfill/repair the latest chapter, volume and timestamp stored on each novel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=LATEST_CHAPTER_REBUILD_BATCH_SIZE,
+            help=f'Novels per batch (default: {LATEST_CHAPTER_REBUILD_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--novel',
+            help='Only repair the novel with this slug'
+        )
+
+    def handle(self, *args, **options):
+        novel_ids = Novel.objects.order_by('id').values_list('id', flat=True)
+        if options['novel']:
+            novel_ids = novel_ids.filter(slug=options['novel'])
+
+        batch_size = options['batch_size']
+        novel_ids = list(novel_ids)
+        changed = 0
+
+        for start in range(0, len(novel_ids), batch_size):
+            batch = novel_ids[start:start + batch_size]
+            changed += LatestChapterService.rebuild(batch)
+            self.stdout.write(f"Processed {min(start + batch_size, len(novel_ids))}/{len(novel_ids)} novels")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Latest chapter pointers repaired for {changed} of {len(novel_ids)} novels"
+        ))
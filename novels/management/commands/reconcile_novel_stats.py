@@ -0,0 +1,58 @@
+"""
+Django management command to repair the rating and favorite aggregates stored on each novel
+"""
+import time
+from django.core.management.base import BaseCommand
+
+from novels.models import Novel
+from novels.services import NovelStatsService
+from constants import NOVEL_STATS_RECONCILE_BATCH_SIZE, NOVEL_STATS_RECONCILE_INTERVAL
+
+
+class Command(BaseCommand):
+    help = 'Recompute rating_sum/rating_count/rating_avg and favorite_count from reviews and favorites'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=NOVEL_STATS_RECONCILE_BATCH_SIZE,
+            help=f'Novels per batch (default: {NOVEL_STATS_RECONCILE_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--novel',
+            help='Only repair the novel with this slug'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep reconciling every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=NOVEL_STATS_RECONCILE_INTERVAL,
+            help=f'Seconds between runs in --loop mode (default: {NOVEL_STATS_RECONCILE_INTERVAL})'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.reconcile(options['batch_size'], options['novel'])
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def reconcile(self, batch_size, novel_slug=None):
+        novel_ids = Novel.objects.order_by('id').values_list('id', flat=True)
+        if novel_slug:
+            novel_ids = novel_ids.filter(slug=novel_slug)
+
+        novel_ids = list(novel_ids)
+        changed = 0
+
+        for start in range(0, len(novel_ids), batch_size):
+            changed += NovelStatsService.reconcile(novel_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Novel stats repaired for {changed} of {len(novel_ids)} novels"
+        ))
@@ -15,6 +15,7 @@ from novels.models import (
     Author, Artist, Tag, Novel, Volume, Chapter, Chunk, Chapter
 )
 from novels.utils.chunk_manager import ChunkManager
+from novels.services import LatestChapterService, NovelStatsService
 from interactions.models import Comment, Review
 from interactions.models import Comment, Review
 from constants import (
@@ -114,11 +115,13 @@ class Command(BaseCommand):
             
             # Create novels with volumes, chapters, and chunks
             novels = self.create_novels(novel_count, volumes_per_novel, chapters_per_volume, with_content)
+            LatestChapterService.rebuild([novel.id for novel in novels])
             
             # Create interactions
             users = list(User.objects.all())
             self.create_comments(comment_count, users, novels)
             self.create_reviews(review_count, users, novels)
+            NovelStatsService.reconcile([novel.id for novel in novels])
             
             self.stdout.write(
                 self.style.SUCCESS("Seed data generation completed successfully!")
@@ -298,9 +301,7 @@ class Command(BaseCommand):
                     author=random.choice(authors),
                     artist=random.choice(artists) if random.choice([True, False]) else None,
                     view_count=random.randint(0, 10000),
-                    rating_avg=random.uniform(3.0, 5.0),
                     word_count=random.randint(1000, 100000),
-                    favorite_count=random.randint(0, 1000),
                     is_anonymous=random.choice([True, False])
                 )
                 
@@ -465,4 +466,5 @@ class Command(BaseCommand):
                     self.style.WARNING(f"Warning: Could not create chunks for chapter ID {chapter_id}: {e}")
                 )
         
+        ChunkManager.refresh_chunk_stats([chapter_id for chapter_id, _ in self._chapters_to_chunk])
         self.stdout.write(f"Created {chunk_count} chunks")
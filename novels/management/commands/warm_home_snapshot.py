@@ -0,0 +1,43 @@
+"""
+Django management command to build the homepage snapshot ahead of traffic
+"""
+import time
+from django.core.management.base import BaseCommand
+
+from novels.services import HomeSnapshotService
+from constants import HOME_SNAPSHOT_REFRESH_INTERVAL
+
+
+class Command(BaseCommand):
+    help = 'Build the homepage snapshot (run after deploys or on a schedule)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep refreshing the snapshot every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=HOME_SNAPSHOT_REFRESH_INTERVAL,
+            help=f'Seconds between refreshes in --loop mode (default: {HOME_SNAPSHOT_REFRESH_INTERVAL})'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            snapshot = HomeSnapshotService.rebuild()
+            elapsed = time.monotonic() - started
+
+            self.stdout.write(self.style.SUCCESS(
+                f"Home snapshot built in {elapsed:.2f}s "
+                f"({len(snapshot['trend_novels'])} trending, "
+                f"{len(snapshot['finish_novels'])} finished, "
+                f"{len(snapshot['newupdate_novels'])} updated, "
+                f"{len(snapshot['comments'])} comments)"
+            ))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
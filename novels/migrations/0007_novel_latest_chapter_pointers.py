@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0006_novel_tags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="novel",
+            name="latest_chapter",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="novels.chapter",
+            ),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="latest_chapter_at",
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="latest_volume",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="novels.volume",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="novel",
+            index=models.Index(
+                fields=["-latest_chapter_at"], name="novels_nove_latest__6ae0ac_idx"
+            ),
+        ),
+    ]
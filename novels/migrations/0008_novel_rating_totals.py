@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0007_novel_latest_chapter_pointers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="novel",
+            name="rating_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="rating_sum",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="novel",
+            index=models.Index(
+                fields=["-favorite_count"], name="novels_nove_favorit_8219c4_idx"
+            ),
+        ),
+    ]
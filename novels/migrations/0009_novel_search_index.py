@@ -0,0 +1,91 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE novels_novelsearchdocument ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', title), 'A') ||
+        setweight(to_tsvector('simple', document), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX novels_novelsearch_vector_idx ON novels_novelsearchdocument USING GIN (search_vector)",
+    "CREATE INDEX novels_novelsearch_trgm_idx ON novels_novelsearchdocument USING GIN (document gin_trgm_ops)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS novels_novelsearch_trgm_idx",
+    "DROP INDEX IF EXISTS novels_novelsearch_vector_idx",
+    "ALTER TABLE novels_novelsearchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS novels_novelsearch_fts
+    USING fts5(title, document, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS novels_novelsearch_fts",
+]
+
+
+def _run(schema_editor, postgres_sql, sqlite_sql):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = postgres_sql
+    elif vendor == 'sqlite':
+        statements = sqlite_sql
+    else:
+        # Other backends fall back to LIKE over the document table
+        return
+    for sql in statements:
+        try:
+            schema_editor.execute(sql)
+        except Exception:
+            if vendor == 'sqlite':
+                # SQLite built without FTS5: the LIKE fallback is used instead
+                return
+            raise
+
+
+def create_search_structures(apps, schema_editor):
+    _run(schema_editor, POSTGRES_FORWARD, SQLITE_FORWARD)
+
+
+def drop_search_structures(apps, schema_editor):
+    _run(schema_editor, POSTGRES_BACKWARD, SQLITE_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0008_novel_rating_totals"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NovelSearchDocument",
+            fields=[
+                (
+                    "novel",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="novels.novel",
+                    ),
+                ),
+                ("title", models.TextField(blank=True)),
+                ("document", models.TextField(blank=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_search_structures, drop_search_structures),
+    ]
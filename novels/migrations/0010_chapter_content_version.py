@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0009_novel_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chapter",
+            name="content_version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
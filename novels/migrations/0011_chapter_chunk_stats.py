@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0010_chapter_content_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chapter",
+            name="chunk_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="chapter",
+            name="avg_chunk_words",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="chapter",
+            name="max_chunk_words",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="chapter",
+            name="char_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="chapter",
+            name="reading_minutes",
+            field=models.FloatField(default=0),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0011_chapter_chunk_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chapter",
+            name="processing_status",
+            field=models.CharField(
+                choices=[("r", "READY"), ("q", "QUEUED"), ("p", "PROCESSING"), ("f", "FAILED")],
+                default="r",
+                max_length=1,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ChapterJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("process", "PROCESS"), ("notify_approved", "NOTIFY_APPROVED")],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("p", "PENDING"), ("r", "RUNNING"), ("d", "DONE"), ("f", "FAILED")],
+                        default="p",
+                        max_length=1,
+                    ),
+                ),
+                ("content", models.TextField(blank=True, default="")),
+                ("attempts", models.IntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "chapter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="jobs",
+                        to="novels.chapter",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["run_after", "id"],
+                "indexes": [
+                    models.Index(fields=["status", "run_after"], name="novels_chap_status_5acfec_idx"),
+                    models.Index(fields=["chapter", "kind", "status"], name="novels_chap_chapter_ed738f_idx"),
+                ],
+            },
+        ),
+    ]
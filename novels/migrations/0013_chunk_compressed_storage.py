@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0012_chapter_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chunk",
+            name="codec",
+            field=models.CharField(default="raw", max_length=10),
+        ),
+        migrations.AddField(
+            model_name="chunk",
+            name="compressed_content",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="chunk",
+            name="content",
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -7,3 +7,5 @@ from .volume import Volume
 from .reading_history import ReadingHistory
 from .chunk import Chunk
 from .chapter import Chapter
+from .novel_search import NovelSearchDocument
+from .chapter_job import ChapterJob
@@ -4,12 +4,16 @@ from django.utils.text import slugify
 from django.utils.crypto import get_random_string
 from django.db.models import Q
 from .volume import Volume
+from novels.utils.chunk_codec import ChunkCodec
 from constants import (
     MAX_TITLE_LENGTH,
     MAX_SLUG_LENGTH,
     MAX_RANDOM_STRING_LENGTH,
     COUNT_DEFAULT,
-    MAX_ATTEMPTS
+    MAX_ATTEMPTS,
+    MAX_STATUS_LENGTH,
+    CHUNK_STREAM_FETCH_SIZE,
+    ChapterProcessingStatus,
 )
 
 class Chapter(models.Model):
@@ -23,6 +27,20 @@ class Chapter(models.Model):
     rejected_reason = models.TextField(null=True, blank=True)
     is_hidden = models.BooleanField(default=False, db_index=True)
     deleted_at = models.DateTimeField(default=None, null=True)
+    # Bumped by ChunkManager whenever the chunks are rewritten (chunk cache key / ETag)
+    content_version = models.PositiveIntegerField(default=1)
+    # Chunk statistics, written by ChunkManager when the chunks are rewritten
+    chunk_count = models.IntegerField(default=COUNT_DEFAULT)
+    avg_chunk_words = models.FloatField(default=COUNT_DEFAULT)
+    max_chunk_words = models.IntegerField(default=COUNT_DEFAULT)
+    char_count = models.IntegerField(default=COUNT_DEFAULT)
+    reading_minutes = models.FloatField(default=COUNT_DEFAULT)
+    # Whether the submitted content has been chunked yet (see ChapterJobService)
+    processing_status = models.CharField(
+        max_length=MAX_STATUS_LENGTH,
+        choices=ChapterProcessingStatus.choices(),
+        default=ChapterProcessingStatus.READY.value,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -73,9 +91,30 @@ class Chapter(models.Model):
     def novel(self):
         return self.volume.novel
     
+    def _chunk_rows(self):
+        return self.chunks.order_by('position').values(
+            'position', 'content', 'codec', 'compressed_content'
+        )
+
+    @staticmethod
+    def _decode_chunk_row(row):
+        return {
+            'position': row['position'],
+            'content': ChunkCodec.decode(row['codec'], row['content'], row['compressed_content']),
+        }
+
+    def iter_chunks(self):
+        """Yield decoded chunks as dicts in reading order without caching the queryset"""
+        for row in self._chunk_rows().iterator(chunk_size=CHUNK_STREAM_FETCH_SIZE):
+            yield self._decode_chunk_row(row)
+
+    async def aiter_chunks(self):
+        """Async counterpart of iter_chunks, for responses served by an ASGI server"""
+        async for row in self._chunk_rows().aiterator(chunk_size=CHUNK_STREAM_FETCH_SIZE):
+            yield self._decode_chunk_row(row)
+
     def get_content(self):
-        chunks = self.chunks.all().order_by('position')
-        return '\n'.join([chunk.content for chunk in chunks])
+        return '\n'.join(chunk['content'] for chunk in self.iter_chunks())
 
     def get_next_chapter(self):
         next_in_volume = Chapter.objects.filter(
@@ -0,0 +1,39 @@
+from django.db import models
+from django.utils import timezone
+from .chapter import Chapter
+from constants import (
+    MAX_JOB_KIND_LENGTH,
+    MAX_STATUS_LENGTH,
+    COUNT_DEFAULT,
+    ChapterJobKind,
+    ChapterJobStatus,
+)
+
+class ChapterJob(models.Model):
+    """Background work for a chapter, run by the process_chapter_jobs command"""
+    chapter = models.ForeignKey(Chapter, on_delete=models.CASCADE, related_name='jobs')
+    kind = models.CharField(max_length=MAX_JOB_KIND_LENGTH, choices=ChapterJobKind.choices())
+    status = models.CharField(
+        max_length=MAX_STATUS_LENGTH,
+        choices=ChapterJobStatus.choices(),
+        default=ChapterJobStatus.PENDING.value,
+    )
+    # Raw submitted content for PROCESS jobs, cleared once the chunks are written
+    content = models.TextField(blank=True, default='')
+    attempts = models.IntegerField(default=COUNT_DEFAULT)
+    last_error = models.TextField(blank=True, default='')
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+            models.Index(fields=['chapter', 'kind', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.chapter_id} ({self.get_status_display()})"
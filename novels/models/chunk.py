@@ -1,13 +1,19 @@
 from django.db import models
 from .chapter import Chapter
+from novels.utils.chunk_codec import ChunkCodec
 from constants import (
     COUNT_DEFAULT,
+    MAX_CODEC_LENGTH,
+    CHUNK_CODEC_RAW,
 )
 
 class Chunk(models.Model):
     chapter = models.ForeignKey(Chapter, on_delete=models.RESTRICT, related_name='chunks')
     position = models.IntegerField()
-    content = models.TextField()
+    # Raw HTML; empty when the chunk is stored compressed (see ChunkCodec)
+    content = models.TextField(blank=True)
+    codec = models.CharField(max_length=MAX_CODEC_LENGTH, default=CHUNK_CODEC_RAW)
+    compressed_content = models.BinaryField(null=True, blank=True)
     word_count = models.IntegerField(default=COUNT_DEFAULT)
     
     class Meta:
@@ -17,5 +23,11 @@ class Chunk(models.Model):
             models.Index(fields=['chapter', 'position']),
         ]
         
+    # Fields to select when reading content with ChunkCodec.decode
+    STORAGE_FIELDS = ('content', 'codec', 'compressed_content')
+
     def __str__(self):
         return f"{self.chapter.title} - Chunk {self.position}"
+
+    def get_content(self):
+        return ChunkCodec.decode(self.codec, self.content, self.compressed_content)
@@ -48,6 +48,9 @@ class Novel(models.Model):
         default=COUNT_DEFAULT,
         validators=[MinValueValidator(MIN_RATE), MaxValueValidator(MAX_RATE)]
     )
+    # Active review totals backing rating_avg (maintained by NovelStatsService)
+    rating_sum = models.IntegerField(default=COUNT_DEFAULT)
+    rating_count = models.IntegerField(default=COUNT_DEFAULT)
     
     created_by = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_novels'
@@ -61,14 +64,25 @@ class Novel(models.Model):
     rejected_reason = models.TextField(null=True, blank=True)
     deleted_at = models.DateTimeField(default=None, null=True)
 
+    # Latest approved, visible chapter (maintained by LatestChapterService)
+    latest_chapter = models.ForeignKey(
+        'novels.Chapter', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    latest_volume = models.ForeignKey(
+        'novels.Volume', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    latest_chapter_at = models.DateTimeField(default=None, null=True, blank=True)
+
     class Meta:
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['-view_count']),
             models.Index(fields=['-rating_avg']),
+            models.Index(fields=['-favorite_count']),
             models.Index(fields=['approval_status', '-created_at']),
             models.Index(fields=['progress_status']),
-            models.Index(fields=['deleted_at'])
+            models.Index(fields=['deleted_at']),
+            models.Index(fields=['-latest_chapter_at']),
         ]
         
     def __str__(self):
@@ -0,0 +1,23 @@
+from django.db import models
+from .novel import Novel
+
+
+class NovelSearchDocument(models.Model):
+    """
+    Diacritic-folded search text of a visible novel (maintained by NovelSearchService).
+
+    On PostgreSQL the migration adds a generated, weighted `search_vector`
+    tsvector column with a GIN index plus a trigram index on `document`; on
+    SQLite the rows are mirrored into the `novels_novelsearch_fts` FTS5 table.
+    """
+    novel = models.OneToOneField(
+        Novel, on_delete=models.CASCADE, primary_key=True, related_name='search_document'
+    )
+    # Name and other names
+    title = models.TextField(blank=True)
+    # Authors, artists, tags and summary
+    document = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Search document for novel {self.novel_id}"
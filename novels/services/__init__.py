@@ -1,5 +1,14 @@
+from .latest_chapter_service import LatestChapterService
+from .novel_stats_service import NovelStatsService
+from .novel_search_service import NovelSearchService
+from .novel_suggestion_service import NovelSuggestionService
+from .chunk_cache_service import ChunkCacheService
+from .chapter_toc_service import ChapterTocService
 from .chapter_service import ChapterService
+from .chapter_import_service import ChapterImportService
 from .novel_service import NovelService
 from .reading_service import ReadingService
 from .reading_history_service import ReadingHistoryService
 from .novel_filter_service import NovelFilterService
+from .home_snapshot_service import HomeSnapshotService
+from .chapter_job_service import ChapterJobService
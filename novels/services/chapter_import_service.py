@@ -0,0 +1,128 @@
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from django.db import transaction
+from django.db.models import Max
+from novels.models import Chapter, Volume
+from novels.utils import ChunkManager
+from novels.utils.chapter_import import ChapterSourceReader, chunk_chapter_source
+from constants import (
+    MAX_CHUNK_SIZE,
+    MAX_NAME_LENGTH,
+    MAX_TITLE_LENGTH,
+    CHAPTER_IMPORT_BATCH_SIZE,
+    CHAPTER_IMPORT_DEFAULT_VOLUME,
+)
+
+
+class _InlineExecutor:
+    """Executor stand-in that chunks in the calling process (workers=0)"""
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class ChapterImportService:
+    """
+    Bulk import of chapter files into a novel.
+
+    Chapters are chunked in a process pool and written in order, one
+    transaction per batch; the next batch is chunked while the current one is
+    written. A chapter whose title already exists in its volume is skipped,
+    so an import that failed half-way can simply be run again.
+    """
+
+    @staticmethod
+    def _volume_for(novel, name, volumes):
+        name = name[:MAX_NAME_LENGTH]
+        if name not in volumes:
+            volume = Volume.objects.filter(novel=novel, name=name).first()
+            if volume is None:
+                last = Volume.objects.filter(novel=novel).aggregate(last=Max('position'))['last']
+                volume = Volume.objects.create(novel=novel, name=name, position=(last or 0) + 1)
+            volume.last_position = volume.chapters.aggregate(last=Max('position'))['last'] or 0
+            volumes[name] = volume
+        return volumes[name]
+
+    @staticmethod
+    def _write_batch(novel, batch, volumes):
+        with transaction.atomic():
+            for source, volume_name, future in batch:
+                chunks_data, total_word_count = future.result()
+                volume = ChapterImportService._volume_for(novel, volume_name, volumes)
+                volume.last_position += 1
+                chapter = Chapter.objects.create(
+                    volume=volume,
+                    title=source.title[:MAX_TITLE_LENGTH],
+                    position=volume.last_position
+                )
+                ChunkManager.write_chunks(chapter, chunks_data, total_word_count)
+
+    @staticmethod
+    def import_chapters(novel, path, default_volume=CHAPTER_IMPORT_DEFAULT_VOLUME,
+                        batch_size=CHAPTER_IMPORT_BATCH_SIZE, workers=None, progress=None):
+        """
+        Import every chapter file of a directory or archive into a novel.
+
+        Args:
+            novel: Target Novel
+            path: Directory, .zip or tar archive (see ChapterSourceReader)
+            default_volume: Volume name for files at the top level
+            batch_size: Chapters written per transaction
+            workers: Worker processes (default: all cores, 0 = chunk in this process)
+            progress: Optional callable(done, total, elapsed_seconds) called after each batch
+
+        Returns:
+            Dict with total, imported and skipped counts
+        """
+        existing = set(Chapter.objects.filter(
+            volume__novel=novel, deleted_at__isnull=True
+        ).values_list('volume__name', 'title'))
+
+        with ChapterSourceReader(path) as reader:
+            sources = reader.sources()
+            pending = []
+            seen = set()
+            for source in sources:
+                volume_name = (source.volume_name or default_volume)[:MAX_NAME_LENGTH]
+                key = (volume_name, source.title[:MAX_TITLE_LENGTH])
+                if key not in existing and key not in seen:
+                    seen.add(key)
+                    pending.append((source, volume_name))
+
+            skipped = len(sources) - len(pending)
+            started = time.monotonic()
+            volumes = {}
+            done = 0
+
+            workers = os.cpu_count() if workers is None else workers
+            executor = ProcessPoolExecutor(max_workers=workers) if workers else _InlineExecutor()
+            with executor:
+                in_flight = None
+                for start in range(0, len(pending) + batch_size, batch_size):
+                    # Submit the next batch before writing the previous one
+                    batch = [
+                        (source, volume_name, executor.submit(
+                            chunk_chapter_source, source.kind, reader.read(source), MAX_CHUNK_SIZE
+                        ))
+                        for source, volume_name in pending[start:start + batch_size]
+                    ]
+                    if in_flight:
+                        ChapterImportService._write_batch(novel, in_flight, volumes)
+                        done += len(in_flight)
+                        if progress:
+                            progress(done, len(pending), time.monotonic() - started)
+                    in_flight = batch
+
+        return {'total': len(sources), 'imported': done, 'skipped': skipped}
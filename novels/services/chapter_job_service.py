@@ -0,0 +1,200 @@
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from novels.models import Chapter, ChapterJob
+from novels.services.chapter_service import ChapterService
+from novels.utils import ChunkManager, HtmlChunker
+from constants import (
+    MAX_CHUNK_SIZE,
+    CHAPTER_JOB_MAX_ATTEMPTS,
+    CHAPTER_JOB_RETRY_DELAY,
+    CHAPTER_JOB_LOCK_TIMEOUT,
+    CHAPTER_JOB_BATCH_SIZE,
+    ChapterJobKind,
+    ChapterJobStatus,
+    ChapterProcessingStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ChapterJobService:
+    """
+    Database-backed queue for the slow parts of publishing a chapter.
+
+    The chapter form stores the raw content in a PROCESS job and returns; the
+    process_chapter_jobs worker chunks it, counts words and, after approval,
+    fans the new-chapter notification out to the novel's followers. Failed
+    jobs are retried with an exponential backoff. Every job can be run more
+    than once: chunk writes only touch changed rows and users who were
+    already notified are skipped.
+    """
+
+    @staticmethod
+    def _set_processing_status(chapter, status):
+        Chapter.objects.filter(pk=chapter.pk).update(processing_status=status.value)
+        chapter.processing_status = status.value
+
+    @staticmethod
+    def enqueue(chapter, kind, content=''):
+        """
+        Queue a job for a chapter.
+
+        A pending job of the same kind is reused (with the new content), so
+        submitting twice before the worker runs processes the chapter once.
+        """
+        with transaction.atomic():
+            job = ChapterJob.objects.select_for_update().filter(
+                chapter=chapter, kind=kind.value, status=ChapterJobStatus.PENDING.value
+            ).first()
+            if job is None:
+                job = ChapterJob.objects.create(chapter=chapter, kind=kind.value, content=content)
+            else:
+                job.content = content
+                job.attempts = 0
+                job.last_error = ''
+                job.run_after = timezone.now()
+                job.save(update_fields=['content', 'attempts', 'last_error', 'run_after', 'updated_at'])
+
+            if kind == ChapterJobKind.PROCESS:
+                ChapterJobService._set_processing_status(chapter, ChapterProcessingStatus.QUEUED)
+        return job
+
+    @staticmethod
+    def enqueue_processing(chapter, content=''):
+        """Queue chunking of submitted content (empty content re-chunks the stored chunks)"""
+        return ChapterJobService.enqueue(chapter, ChapterJobKind.PROCESS, content)
+
+    @staticmethod
+    def enqueue_approved_notification(chapter):
+        return ChapterJobService.enqueue(chapter, ChapterJobKind.NOTIFY_APPROVED)
+
+    @staticmethod
+    def claim(batch_size=CHAPTER_JOB_BATCH_SIZE):
+        """
+        Claim up to batch_size due jobs for this worker.
+
+        Each job is taken with a conditional UPDATE on its current state, so
+        two workers never run the same job. Running jobs whose worker died
+        (locked for longer than CHAPTER_JOB_LOCK_TIMEOUT) are claimed again.
+        """
+        now = timezone.now()
+        stale = now - timedelta(seconds=CHAPTER_JOB_LOCK_TIMEOUT)
+        candidates = ChapterJob.objects.filter(
+            Q(status=ChapterJobStatus.PENDING.value, run_after__lte=now) |
+            Q(status=ChapterJobStatus.RUNNING.value, locked_at__lt=stale)
+        ).order_by('run_after', 'id').values_list('id', 'status', 'locked_at')[:batch_size]
+
+        claimed = []
+        for job_id, status, locked_at in candidates:
+            updated = ChapterJob.objects.filter(id=job_id, status=status, locked_at=locked_at).update(
+                status=ChapterJobStatus.RUNNING.value,
+                locked_at=now,
+                attempts=F('attempts') + 1,
+                updated_at=now
+            )
+            if updated:
+                claimed.append(job_id)
+
+        return list(ChapterJob.objects.filter(id__in=claimed).select_related(
+            'chapter__volume__novel'
+        ).order_by('run_after', 'id'))
+
+    @staticmethod
+    def _process(job):
+        chapter = job.chapter
+        superseded = ChapterJob.objects.filter(
+            chapter=chapter, kind=job.kind, id__gt=job.id,
+            status__in=[ChapterJobStatus.PENDING.value, ChapterJobStatus.RUNNING.value]
+        ).exists()
+        if superseded:
+            return
+
+        ChapterJobService._set_processing_status(chapter, ChapterProcessingStatus.PROCESSING)
+        content = job.content or chapter.get_content()
+        ChunkManager.create_html_chunks_for_chapter(
+            chapter=chapter,
+            content=content,
+            chunker=HtmlChunker(max_chunk_size=MAX_CHUNK_SIZE)
+        )
+        ChapterJobService._set_processing_status(chapter, ChapterProcessingStatus.READY)
+
+    @staticmethod
+    def _notify_approved(job):
+        if not job.chapter.approved:
+            return
+
+        def progress(sent, total):
+            # A large audience can outlast CHAPTER_JOB_LOCK_TIMEOUT: keep the claim fresh
+            now = timezone.now()
+            ChapterJob.objects.filter(pk=job.pk).update(locked_at=now, updated_at=now)
+            logger.info("Chapter job %s notified %s/%s followers", job.id, sent, total)
+
+        ChapterService.notify_favorites_chapter_approved(job.chapter, progress=progress)
+
+    HANDLERS = {
+        ChapterJobKind.PROCESS.value: _process,
+        ChapterJobKind.NOTIFY_APPROVED.value: _notify_approved,
+    }
+
+    @staticmethod
+    def run(job):
+        """Run a claimed job; returns True when it succeeded"""
+        try:
+            ChapterJobService.HANDLERS[job.kind](job)
+        except Exception as e:
+            logger.exception("Chapter job %s (%s) failed: %s", job.id, job.kind, e)
+            now = timezone.now()
+            job.last_error = f"{type(e).__name__}: {e}"
+            job.locked_at = None
+            if job.attempts >= CHAPTER_JOB_MAX_ATTEMPTS:
+                job.status = ChapterJobStatus.FAILED.value
+                job.finished_at = now
+                if job.kind == ChapterJobKind.PROCESS.value:
+                    ChapterJobService._set_processing_status(job.chapter, ChapterProcessingStatus.FAILED)
+            else:
+                job.status = ChapterJobStatus.PENDING.value
+                job.run_after = now + timedelta(
+                    seconds=CHAPTER_JOB_RETRY_DELAY * 2 ** max(job.attempts - 1, 0)
+                )
+                if job.kind == ChapterJobKind.PROCESS.value:
+                    ChapterJobService._set_processing_status(job.chapter, ChapterProcessingStatus.QUEUED)
+            job.save(update_fields=['status', 'last_error', 'locked_at', 'finished_at', 'run_after', 'updated_at'])
+            return False
+
+        job.status = ChapterJobStatus.DONE.value
+        job.content = ''
+        job.last_error = ''
+        job.locked_at = None
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'content', 'last_error', 'locked_at', 'finished_at', 'updated_at'])
+        return True
+
+    @staticmethod
+    def run_pending(batch_size=CHAPTER_JOB_BATCH_SIZE):
+        """
+        Claim and run one batch of due jobs.
+
+        Returns:
+            Dict with claimed, done and failed counts
+        """
+        jobs = ChapterJobService.claim(batch_size)
+        done = sum(1 for job in jobs if ChapterJobService.run(job))
+        return {'claimed': len(jobs), 'done': done, 'failed': len(jobs) - done}
+
+    @staticmethod
+    def retry_failed():
+        """Put failed jobs back in the queue with a fresh attempt budget"""
+        failed = ChapterJob.objects.filter(status=ChapterJobStatus.FAILED.value)
+        Chapter.objects.filter(
+            jobs__in=failed.filter(kind=ChapterJobKind.PROCESS.value)
+        ).update(processing_status=ChapterProcessingStatus.QUEUED.value)
+        return failed.update(
+            status=ChapterJobStatus.PENDING.value,
+            attempts=0,
+            run_after=timezone.now(),
+            finished_at=None,
+            updated_at=timezone.now()
+        )
@@ -1,13 +1,27 @@
+import logging
 from django.shortcuts import get_object_or_404
 from django.http import Http404
 from django.core.paginator import Paginator
 from django.db.models import Q
-from common.utils.sse import send_notification_to_user
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+from interactions.models.notification import Notification
+from interactions.services.notification_service import NotificationService
+from accounts.models import User
 from novels.models import Chapter
+from novels.services.latest_chapter_service import LatestChapterService
+from novels.services.chunk_cache_service import ChunkCacheService
+from novels.services.chapter_toc_service import ChapterTocService
 from constants import (
     PAGINATOR_COMMON_LIST,
     DEFAULT_PAGE_NUMBER,
+    ChapterProcessingStatus,
 )
+
+logger = logging.getLogger(__name__)
+
 class ChapterService:
     @staticmethod
     def get_chapter_for_user(chapter_slug, novel_slug, user=None):
@@ -37,11 +51,18 @@ class ChapterService:
     
     @staticmethod
     def get_chapter_navigation(chapter):
-        """Get next and previous chapters"""
-        return {
-            'next_chapter': chapter.get_next_chapter(),
-            'prev_chapter': chapter.get_previous_chapter()
-        }
+        """Get next and previous chapters (TOC entries, from the cached TOC)"""
+        return ChapterTocService.get_navigation(chapter)
+    
+    @staticmethod
+    def get_sidebar_chapters(novel, user=None):
+        """
+        Chapters listed in the reader sidebar: the cached TOC, except for the
+        owner, who also sees unapproved and hidden chapters
+        """
+        if user and user.is_authenticated and novel.created_by_id == user.pk:
+            return ChapterService.get_all_chapters_for_novel(novel, user)
+        return ChapterTocService.get_chapters(novel.pk)
     
     @staticmethod
     def get_all_chapters_for_novel(novel, user=None):
@@ -63,23 +84,13 @@ class ChapterService:
     
     @staticmethod
     def get_chapter_chunks_stats(chapter):
-        """Calculate chapter chunking statistics"""
-        from constants import WORDS_PER_MINUTE
-        
-        all_chunks = chapter.chunks.all()
-        total_chunks = all_chunks.count()
-        
-        chunk_word_counts = [chunk.word_count for chunk in all_chunks]
-        avg_chunk_size = sum(chunk_word_counts) / len(chunk_word_counts) if chunk_word_counts else 0
-        max_chunk_words = max(chunk_word_counts) if chunk_word_counts else 0
-        estimated_reading_time = chapter.word_count / WORDS_PER_MINUTE
-        
+        """Chapter chunking statistics, as stored by ChunkManager (no chunk scan)"""
         return {
-            'all_chunks': all_chunks,
-            'total_chunks': total_chunks,
-            'avg_chunk_size': avg_chunk_size,
-            'max_chunk_words': max_chunk_words,
-            'estimated_reading_time': estimated_reading_time
+            'total_chunks': chapter.chunk_count,
+            'avg_chunk_size': chapter.avg_chunk_words,
+            'max_chunk_words': chapter.max_chunk_words,
+            'char_count': chapter.char_count,
+            'estimated_reading_time': chapter.reading_minutes
         }
 
     @staticmethod
@@ -88,7 +99,8 @@ class ChapterService:
         chapters = Chapter.objects.filter(
             approved=False,
             is_hidden=False,
-            rejected_reason__isnull=True
+            rejected_reason__isnull=True,
+            processing_status=ChapterProcessingStatus.READY.value
         ).select_related(
             'volume__novel',  
             'volume__novel__created_by'  
@@ -156,6 +168,10 @@ class ChapterService:
         chapter.approved = True
         chapter.rejected_reason = None
         chapter.save()
+        if not chapter.is_hidden and chapter.deleted_at is None:
+            LatestChapterService.chapter_published(chapter)
+            # Approved content no longer changes: encode and compress the reader's windows now
+            ChunkCacheService.warm_windows(chapter)
         return chapter
 
     @staticmethod
@@ -164,23 +180,57 @@ class ChapterService:
         chapter.approved = False
         chapter.rejected_reason = rejected_reason
         chapter.save()
+        LatestChapterService.chapter_withdrawn(chapter)
+        return chapter
+
+    @staticmethod
+    def set_chapter_hidden(chapter, is_hidden):
+        """Hide or unhide a chapter"""
+        chapter.is_hidden = is_hidden
+        chapter.save(update_fields=['is_hidden', 'updated_at'])
+        if is_hidden:
+            LatestChapterService.chapter_withdrawn(chapter)
+        elif chapter.approved and chapter.deleted_at is None:
+            LatestChapterService.chapter_published(chapter)
         return chapter
 
     @staticmethod
-    def get_chapter_review_context(chapter):
-        """Get complete context for chapter review"""
-        chunks = chapter.chunks.all().order_by('position')
+    def soft_delete_chapter(chapter):
+        """Soft delete a chapter"""
+        chapter.deleted_at = timezone.now()
+        chapter.save(update_fields=['deleted_at'])
+        LatestChapterService.chapter_withdrawn(chapter)
+        return chapter
+
+    @staticmethod
+    def restore_chapter(chapter):
+        """Restore a soft deleted chapter"""
+        chapter.deleted_at = None
+        chapter.save(update_fields=['deleted_at'])
+        if chapter.approved and not chapter.is_hidden:
+            LatestChapterService.chapter_published(chapter)
+        return chapter
+
+    @staticmethod
+    def get_chapter_review_context(chapter, stream=False):
+        """
+        Get complete context for chapter review.
+
+        With stream=True the chunks are left out: the page is rendered with
+        ChapterStreamer, which writes them straight from the database.
+        """
         navigation = ChapterService.get_chapter_navigation(chapter)
         
-        return {
+        context = {
             'chapter': chapter,
             'novel': chapter.volume.novel,
             'volume': chapter.volume,
-            'content': chapter.get_content(),
             'next_chapter': navigation['next_chapter'],
             'previous_chapter': navigation['prev_chapter'],
-            'chunks': chunks,
         }
+        if not stream:
+            context['chunks'] = list(chapter.iter_chunks())
+        return context
         
     @staticmethod
     def get_earliest_unapproved_chapter():
@@ -188,5 +238,40 @@ class ChapterService:
             approved=False,
             rejected_reason__isnull=True,
             is_hidden=False,
-            deleted_at__isnull=True
+            deleted_at__isnull=True,
+            processing_status=ChapterProcessingStatus.READY.value
         ).order_by('created_at').first()
+
+    @staticmethod
+    def notify_favorites_chapter_approved(chapter, progress=None):
+        """
+        Notify every user who favorited the novel that an approved chapter is out.
+
+        Users who already have the notification for this chapter are skipped,
+        so the chapter job running it can be retried safely. The followers
+        are streamed and notified in batches (NotificationService.broadcast);
+        `progress(sent, total)` is called after each batch.
+
+        Returns:
+            Number of users notified
+        """
+        novel = chapter.volume.novel
+        content_type = ContentType.objects.get_for_model(chapter)
+        notified = Notification.objects.filter(
+            type="NEW_CHAPTER", content_type=content_type, object_id=chapter.id
+        ).values('user_id')
+        followers = User.objects.filter(favorites__novel=novel).exclude(id__in=notified)
+        redirect_url = reverse(
+            "novels:chapter_detail",
+            kwargs={"novel_slug": novel.slug, "chapter_slug": chapter.slug},
+        )
+
+        return NotificationService.broadcast(
+            followers,
+            title=_("Truyện '%(novel_name)s' có chương mới") % {"novel_name": novel.name},
+            content=_("Chương '%(chapter_title)s' vừa được duyệt và hiển thị.") % {"chapter_title": chapter.title},
+            notification_type="NEW_CHAPTER",
+            related_object=chapter,
+            redirect_url=redirect_url,
+            progress=progress,
+        )
@@ -0,0 +1,148 @@
+import time
+from bisect import bisect_left, bisect_right
+from django.core.cache import cache
+from novels.models import Chapter, Volume
+from constants import CHAPTER_TOC_KEY, CHAPTER_TOC_VERSION_KEY, CHAPTER_TOC_TIMEOUT, MAX_CHAPTER_LIST
+
+
+class ChapterTocService:
+    """
+    Cached table of contents of a novel: its visible chapters in reading order.
+
+    Next/previous navigation and the reader sidebar are resolved from one
+    cache round trip (the TOC and its version are fetched with get_many).
+    Any chapter or volume change bumps the novel's version, so a TOC built
+    from data read before the change is never served after it.
+
+    Entries are plain dicts (id, slug, title, position, created_at and a
+    volume dict with id/name/position) that templates use like Chapter
+    instances. The TOC also lists every volume of the novel with its
+    chapter_list/remaining_chapters, as the novel detail page shows them.
+    """
+
+    # Chapter fields a TOC entry depends on
+    FIELDS = {'slug', 'title', 'position', 'volume', 'approved', 'is_hidden', 'deleted_at'}
+
+    @staticmethod
+    def _toc_key(novel_id):
+        return CHAPTER_TOC_KEY.format(novel_id=novel_id)
+
+    @staticmethod
+    def _version_key(novel_id):
+        return CHAPTER_TOC_VERSION_KEY.format(novel_id=novel_id)
+
+    @staticmethod
+    def _new_version():
+        # Starts from the clock, so a version evicted from the cache cannot
+        # come back with a value an old TOC was stored under
+        return time.time_ns()
+
+    @staticmethod
+    def build(novel_id, version):
+        volumes = {
+            volume['id']: {**volume, 'chapter_list': []}
+            for volume in Volume.objects.filter(novel_id=novel_id).order_by(
+                'position', 'created_at'
+            ).values('id', 'name', 'position')
+        }
+        chapters = Chapter.objects.filter(
+            volume__novel_id=novel_id,
+            approved=True,
+            is_hidden=False,
+            deleted_at__isnull=True
+        ).order_by('volume__position', 'position', 'created_at').values(
+            'id', 'slug', 'title', 'position', 'created_at', 'volume_id'
+        )
+        entries = []
+        for chapter in chapters:
+            volume = volumes[chapter['volume_id']]
+            entry = {
+                'id': chapter['id'],
+                'slug': chapter['slug'],
+                'title': chapter['title'],
+                'position': chapter['position'],
+                'created_at': chapter['created_at'],
+                'approved': True,
+                'is_hidden': False,
+                'volume': {'id': volume['id'], 'name': volume['name'], 'position': volume['position']},
+            }
+            volume['chapter_list'].append(entry)
+            entries.append(entry)
+        for volume in volumes.values():
+            volume['remaining_chapters'] = max(len(volume['chapter_list']) - MAX_CHAPTER_LIST, 0)
+
+        return {
+            'version': version,
+            'volumes': list(volumes.values()),
+            'chapters': entries,
+            'index': {entry['id']: i for i, entry in enumerate(entries)},
+            'keys': [(entry['volume']['position'], entry['position']) for entry in entries],
+        }
+
+    @staticmethod
+    def get_toc(novel_id):
+        toc_key = ChapterTocService._toc_key(novel_id)
+        version_key = ChapterTocService._version_key(novel_id)
+        cached = cache.get_many([toc_key, version_key])
+        version = cached.get(version_key)
+        toc = cached.get(toc_key)
+        if version is not None and toc is not None and toc['version'] == version:
+            return toc
+
+        if version is None:
+            version = ChapterTocService._new_version()
+            if not cache.add(version_key, version, CHAPTER_TOC_TIMEOUT):
+                version = cache.get(version_key, version)
+        # Read after the version: a concurrent change bumps it and the
+        # TOC stored below is rebuilt on the next request
+        toc = ChapterTocService.build(novel_id, version)
+        cache.set(toc_key, toc, CHAPTER_TOC_TIMEOUT)
+        return toc
+
+    @staticmethod
+    def get_chapters(novel_id):
+        """Visible chapters of a novel in reading order"""
+        return ChapterTocService.get_toc(novel_id)['chapters']
+
+    @staticmethod
+    def get_volumes(novel_id):
+        """Volumes of a novel in order, each with the chapter_list of its visible chapters"""
+        return ChapterTocService.get_toc(novel_id)['volumes']
+
+    @staticmethod
+    def get_navigation(chapter):
+        """Previous and next visible chapters of `chapter` (entries or None)"""
+        toc = ChapterTocService.get_toc(chapter.volume.novel_id)
+        entries = toc['chapters']
+        i = toc['index'].get(chapter.id)
+        if i is not None:
+            before, after = i, i + 1
+        else:
+            # Not visible itself (e.g. an admin reviewing a pending chapter)
+            key = (chapter.volume.position, chapter.position)
+            before, after = bisect_left(toc['keys'], key), bisect_right(toc['keys'], key)
+        return {
+            'next_chapter': entries[after] if after < len(entries) else None,
+            'prev_chapter': entries[before - 1] if before > 0 else None,
+        }
+
+    @staticmethod
+    def novel_changed(novel_id):
+        """Invalidate the TOC of a novel by moving its version forward"""
+        version_key = ChapterTocService._version_key(novel_id)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            cache.set(version_key, ChapterTocService._new_version(), CHAPTER_TOC_TIMEOUT)
+
+    @staticmethod
+    def chapter_changed(chapter, update_fields=None):
+        """A chapter was saved or deleted (approve, hide, delete, move, rename)"""
+        if update_fields is not None and not ChapterTocService.FIELDS.intersection(update_fields):
+            return
+        if Chapter.volume.is_cached(chapter):
+            novel_id = chapter.volume.novel_id
+        else:
+            novel_id = Volume.objects.filter(pk=chapter.volume_id).values_list('novel_id', flat=True).first()
+        if novel_id is not None:
+            ChapterTocService.novel_changed(novel_id)
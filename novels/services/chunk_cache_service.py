@@ -0,0 +1,197 @@
+import gzip
+import json
+import time
+from bisect import bisect_left
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from common.utils.keyset import encode_cursor
+from novels.models import Chapter, Chunk
+from novels.utils import ChunkCodec
+from constants import (
+    CHUNK_CACHE_POINTER_KEY,
+    CHUNK_CACHE_CONTENT_KEY,
+    CHUNK_CACHE_WINDOW_KEY,
+    CHUNK_CACHE_TIMEOUT,
+    CHUNK_RESPONSE_ENCODINGS,
+    CHUNK_GZIP_LEVEL,
+    CHUNK_BROTLI_QUALITY,
+    MAX_LIMIT_CHUNKS,
+    START_POSITION_DEFAULT,
+)
+
+try:
+    import brotli
+except ImportError:  # br is optional, gzip ships with Python
+    brotli = None
+
+
+class ChunkCacheService:
+    """
+    Content-addressed cache of chapter chunks.
+
+    A small pointer entry maps a chapter id to its current content_version
+    (and whether it is publicly readable); the chunks themselves are cached
+    under chapter id + content_version, so an entry never has to be
+    invalidated: rewriting the chunks bumps the version and drops the pointer.
+    """
+
+    @staticmethod
+    def _pointer_key(chapter_id):
+        return CHUNK_CACHE_POINTER_KEY.format(chapter_id=chapter_id)
+
+    @staticmethod
+    def _content_key(chapter_id, version):
+        return CHUNK_CACHE_CONTENT_KEY.format(chapter_id=chapter_id, version=version)
+
+    @staticmethod
+    def get_pointer(chapter_id):
+        """Return {'version', 'public'} of a chapter, or None if it does not exist"""
+        key = ChunkCacheService._pointer_key(chapter_id)
+        pointer = cache.get(key)
+        if pointer is None:
+            row = Chapter.objects.filter(pk=chapter_id).values(
+                'content_version', 'approved', 'is_hidden', 'deleted_at'
+            ).first()
+            if row is None:
+                return None
+            pointer = {
+                'version': row['content_version'],
+                'public': row['approved'] and not row['is_hidden'] and row['deleted_at'] is None,
+            }
+            cache.set(key, pointer, CHUNK_CACHE_TIMEOUT)
+        return pointer
+
+    @staticmethod
+    def build_content(chapter_id):
+        # Cached decoded, compressed chunks are only inflated once per content version
+        chunks = [
+            {
+                'position': row['position'],
+                'content': ChunkCodec.decode(row['codec'], row['content'], row['compressed_content']),
+                'word_count': row['word_count'],
+            }
+            for row in Chunk.objects.filter(chapter_id=chapter_id).order_by('position').values(
+                'position', 'word_count', *Chunk.STORAGE_FIELDS
+            )
+        ]
+        return {
+            'built_at': time.time(),
+            'chunks': chunks,
+            'positions': [chunk['position'] for chunk in chunks],
+            'total_chunks': len(chunks),
+        }
+
+    @staticmethod
+    def get_content(chapter_id, version):
+        """Return the cached chunks of one content version"""
+        key = ChunkCacheService._content_key(chapter_id, version)
+        content = cache.get(key)
+        if content is None:
+            content = ChunkCacheService.build_content(chapter_id)
+            cache.set(key, content, CHUNK_CACHE_TIMEOUT)
+        return content
+
+    @staticmethod
+    def get_chapter_content(chapter):
+        return ChunkCacheService.get_content(chapter.id, chapter.content_version)
+
+    @staticmethod
+    def get_window(content, start, limit):
+        """
+        Chunks with start <= position < start + limit, plus has_more/next_start
+        and the opaque cursor of the next window (None on the last one)
+        """
+        positions = content['positions']
+        first = bisect_left(positions, start)
+        last = bisect_left(positions, start + limit)
+        has_more = last < len(positions)
+        return {
+            'chunks': content['chunks'][first:last],
+            'has_more': has_more,
+            'next_start': start + limit,
+            'next_cursor': encode_cursor([start + limit]) if has_more else None,
+        }
+
+    @staticmethod
+    def _compress(encoding, body):
+        if encoding == 'gzip':
+            return gzip.compress(body, compresslevel=CHUNK_GZIP_LEVEL, mtime=0)
+        if encoding == 'br' and brotli is not None:
+            return brotli.compress(body, quality=CHUNK_BROTLI_QUALITY)
+        return None
+
+    @staticmethod
+    def get_window_payloads(chapter_id, version, content, start, limit):
+        """
+        JSON body of a window, encoded once and cached with its compressed forms.
+
+        Returns:
+            Dict mapping 'identity' and each available content-coding to bytes
+        """
+        key = CHUNK_CACHE_WINDOW_KEY.format(
+            chapter_id=chapter_id, version=version, built_at=int(content['built_at'] * 1000),
+            start=start, limit=limit
+        )
+        payloads = cache.get(key)
+        if payloads is None:
+            window = ChunkCacheService.get_window(content, start, limit)
+            body = json.dumps(window, cls=DjangoJSONEncoder).encode('utf-8')
+            payloads = {'identity': body}
+            for encoding in CHUNK_RESPONSE_ENCODINGS:
+                compressed = ChunkCacheService._compress(encoding, body)
+                if compressed is not None and len(compressed) < len(body):
+                    payloads[encoding] = compressed
+            cache.set(key, payloads, CHUNK_CACHE_TIMEOUT)
+        return payloads
+
+    @staticmethod
+    def negotiate_encoding(accept_encoding, available):
+        """Best content-coding of `available` allowed by an Accept-Encoding header, else 'identity'"""
+        accepted = {}
+        for item in accept_encoding.split(','):
+            coding, _, params = item.strip().partition(';')
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            if coding:
+                accepted[coding.strip().lower()] = quality
+
+        for encoding in CHUNK_RESPONSE_ENCODINGS:
+            if encoding in available and accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding
+        return 'identity'
+
+    @staticmethod
+    def warm_windows(chapter, limit=MAX_LIMIT_CHUNKS):
+        """
+        Build the pointer and the cached (precompressed) windows the reader requests.
+
+        The page renders the first `limit` chunks, then the reader follows
+        next_cursor through windows starting every `limit` positions.
+
+        Returns:
+            Number of windows built
+        """
+        ChunkCacheService.get_pointer(chapter.id)
+        content = ChunkCacheService.get_chapter_content(chapter)
+        last_position = content['positions'][-1] if content['positions'] else 0
+        starts = range(START_POSITION_DEFAULT + limit, last_position + 1, limit)
+        for start in starts:
+            ChunkCacheService.get_window_payloads(chapter.id, chapter.content_version, content, start, limit)
+        return len(starts)
+
+    @staticmethod
+    def etag(chapter_id, pointer):
+        return f"chapter-{chapter_id}-v{pointer['version']}"
+
+    @staticmethod
+    def chapter_changed(chapter, created=False):
+        """Drop the pointer so visibility/version are re-read on the next request"""
+        cache.delete(ChunkCacheService._pointer_key(chapter.pk))
+        if created:
+            # Database ids can be reused after a delete
+            cache.delete(ChunkCacheService._content_key(chapter.pk, chapter.content_version))
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from django.core.cache import cache
+from django.db import close_old_connections
+from interactions.models import Comment
+from novels.utils import format_comments_for_template, get_relative_time
+from .novel_service import NovelService
+from constants import (
+    ApprovalStatus,
+    MAX_FINISH_NOVELS,
+    MAX_HOME_COMMENTS,
+    MAX_NEW_NOVELS_ROW,
+    HOME_SNAPSHOT_CACHE_KEY,
+    HOME_SNAPSHOT_INVALIDATED_KEY,
+    HOME_SNAPSHOT_LOCK_KEY,
+    HOME_SNAPSHOT_FRESH_SECONDS,
+    HOME_SNAPSHOT_MAX_AGE_SECONDS,
+    HOME_SNAPSHOT_LOCK_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HomeSnapshotService:
+    """
+    Precomputed homepage sections served from a single cache entry.
+
+    The snapshot is a plain dict of lists/dicts so it can be pickled by any
+    cache backend. A snapshot older than HOME_SNAPSHOT_FRESH_SECONDS (or older
+    than the last invalidation) is still served while one background thread
+    rebuilds it (stale-while-revalidate).
+    """
+
+    @staticmethod
+    def _novel_card(novel):
+        return {
+            'id': novel.id,
+            'name': novel.name,
+            'slug': novel.slug,
+            'image_url': novel.image_url,
+            'summary': novel.summary,
+        }
+
+    @staticmethod
+    def _finished_card(novel):
+        card = HomeSnapshotService._novel_card(novel)
+        recent_volume = getattr(novel, 'recent_volume', None)
+        recent_chapter = getattr(novel, 'recent_chapter', None)
+        card['recent_volume'] = {'name': recent_volume.name} if recent_volume else None
+        card['recent_chapter'] = {'title': recent_chapter.title} if recent_chapter else None
+        return card
+
+    @staticmethod
+    def _recent_comments():
+        comments = Comment.objects.select_related('user', 'novel', 'user__profile').filter(
+            novel__approval_status=ApprovalStatus.APPROVED.value,
+            novel__deleted_at__isnull=True,
+            is_reported=False
+        ).exclude(
+            user__isnull=True
+        ).order_by('-created_at')[:MAX_HOME_COMMENTS]
+
+        comments_data = format_comments_for_template(comments)
+        # Relative time is computed when serving, keep the raw timestamp instead
+        for comment, data in zip(comments, comments_data):
+            data['created_at'] = comment.created_at
+            data.pop('time', None)
+        return comments_data
+
+    @staticmethod
+    def build_snapshot():
+        """Run every homepage query once and return the serializable snapshot"""
+        # Taken before querying so changes made during the build keep it stale
+        built_at = time.time()
+        finish_novels = NovelService.get_finished_novels_with_chapters(MAX_FINISH_NOVELS)
+
+        return {
+            'built_at': built_at,
+            'trend_novels': [
+                HomeSnapshotService._novel_card(n) for n in NovelService.get_trend_novels()
+            ],
+            'new_novels': [
+                HomeSnapshotService._novel_card(n)
+                for n in NovelService.get_new_novels()[:MAX_NEW_NOVELS_ROW]
+            ],
+            'like_novels': [
+                HomeSnapshotService._novel_card(n) for n in NovelService.get_like_novels()
+            ],
+            'finish_novels': [
+                HomeSnapshotService._finished_card(n) for n in finish_novels
+            ],
+            'newupdate_novels': NovelService.get_recent_volumes_for_cards(),
+            'comments': HomeSnapshotService._recent_comments(),
+        }
+
+    @staticmethod
+    def rebuild():
+        """Build a fresh snapshot and store it"""
+        snapshot = HomeSnapshotService.build_snapshot()
+        cache.set(HOME_SNAPSHOT_CACHE_KEY, snapshot, HOME_SNAPSHOT_MAX_AGE_SECONDS)
+        return snapshot
+
+    @staticmethod
+    def invalidate():
+        """Mark the current snapshot as stale without dropping it"""
+        cache.set(HOME_SNAPSHOT_INVALIDATED_KEY, time.time(), HOME_SNAPSHOT_MAX_AGE_SECONDS)
+
+    @staticmethod
+    def is_stale(snapshot, invalidated_at=None):
+        built_at = snapshot.get('built_at', 0)
+        if invalidated_at and built_at <= invalidated_at:
+            return True
+        return time.time() - built_at >= HOME_SNAPSHOT_FRESH_SECONDS
+
+    @staticmethod
+    def _rebuild_in_background():
+        try:
+            HomeSnapshotService.rebuild()
+        except Exception as e:
+            logger.exception("Error rebuilding home snapshot: %s", e)
+        finally:
+            cache.delete(HOME_SNAPSHOT_LOCK_KEY)
+            close_old_connections()
+
+    @staticmethod
+    def schedule_rebuild():
+        """Start a background rebuild unless another one is already running"""
+        if not cache.add(HOME_SNAPSHOT_LOCK_KEY, True, HOME_SNAPSHOT_LOCK_SECONDS):
+            return False
+        thread = threading.Thread(target=HomeSnapshotService._rebuild_in_background, daemon=True)
+        thread.start()
+        return True
+
+    @staticmethod
+    def get_snapshot():
+        """Return the homepage snapshot, building it only on a cold cache"""
+        values = cache.get_many([HOME_SNAPSHOT_CACHE_KEY, HOME_SNAPSHOT_INVALIDATED_KEY])
+        snapshot = values.get(HOME_SNAPSHOT_CACHE_KEY)
+
+        if snapshot is None:
+            return HomeSnapshotService.rebuild()
+
+        if HomeSnapshotService.is_stale(snapshot, values.get(HOME_SNAPSHOT_INVALIDATED_KEY)):
+            HomeSnapshotService.schedule_rebuild()
+
+        return snapshot
+
+    @staticmethod
+    def get_home_context():
+        """Homepage context built from the snapshot"""
+        snapshot = HomeSnapshotService.get_snapshot()
+        comments = [
+            {**comment, 'time': get_relative_time(comment['created_at'])}
+            for comment in snapshot['comments']
+        ]
+        return {
+            'trend_novels': snapshot['trend_novels'],
+            'new_novels': snapshot['new_novels'],
+            'like_novels': snapshot['like_novels'],
+            'finish_novels': snapshot['finish_novels'],
+            'newupdate_novels': snapshot['newupdate_novels'],
+            'comments': comments,
+        }
@@ -0,0 +1,88 @@
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from novels.models import Novel, Chapter
+
+
+class LatestChapterService:
+    """Maintain Novel.latest_chapter / latest_volume / latest_chapter_at"""
+
+    @staticmethod
+    def visible_chapters():
+        return Chapter.objects.filter(
+            approved=True,
+            is_hidden=False,
+            deleted_at__isnull=True
+        )
+
+    @staticmethod
+    def get_latest_chapters(novel_ids):
+        """Latest visible chapter per novel in one window-function query"""
+        latest_chapters = LatestChapterService.visible_chapters().filter(
+            volume__novel_id__in=novel_ids
+        ).annotate(
+            novel_rank=Window(
+                expression=RowNumber(),
+                partition_by=[F('volume__novel_id')],
+                order_by=[F('updated_at').desc(), F('id').desc()],
+            )
+        ).filter(novel_rank=1).select_related('volume')
+
+        return {chapter.volume.novel_id: chapter for chapter in latest_chapters}
+
+    @staticmethod
+    def _set_pointer(novel, chapter):
+        values = {
+            'latest_chapter': chapter,
+            'latest_volume_id': chapter.volume_id if chapter else None,
+            'latest_chapter_at': chapter.updated_at if chapter else None,
+        }
+        # update() keeps Novel.updated_at (the "finished" ordering) untouched
+        Novel.objects.filter(pk=novel.pk).update(**values)
+        for field, value in values.items():
+            setattr(novel, field, value)
+
+    @staticmethod
+    def refresh(novel):
+        """Recompute the pointer of a single novel"""
+        chapter = LatestChapterService.visible_chapters().filter(
+            volume__novel_id=novel.pk
+        ).order_by('-updated_at', '-id').first()
+        LatestChapterService._set_pointer(novel, chapter)
+        return chapter
+
+    @staticmethod
+    def chapter_published(chapter):
+        """A chapter became visible: move the pointer forward if it is newer"""
+        novel = chapter.volume.novel
+        if (
+            novel.latest_chapter_at is None
+            or chapter.updated_at >= novel.latest_chapter_at
+        ):
+            LatestChapterService._set_pointer(novel, chapter)
+
+    @staticmethod
+    def chapter_withdrawn(chapter):
+        """A chapter was hidden, rejected or deleted: recompute only if it was the latest"""
+        novel = chapter.volume.novel
+        if novel.latest_chapter_id == chapter.id:
+            LatestChapterService.refresh(novel)
+
+    @staticmethod
+    def rebuild(novel_ids):
+        """Repair the pointers of the given novels, returns how many changed"""
+        latest_chapters = LatestChapterService.get_latest_chapters(novel_ids)
+        changed = 0
+        for novel in Novel.objects.filter(id__in=novel_ids).only(
+            'id', 'latest_chapter_id', 'latest_volume_id', 'latest_chapter_at'
+        ):
+            chapter = latest_chapters.get(novel.id)
+            expected = (
+                chapter.id if chapter else None,
+                chapter.volume_id if chapter else None,
+                chapter.updated_at if chapter else None,
+            )
+            current = (novel.latest_chapter_id, novel.latest_volume_id, novel.latest_chapter_at)
+            if expected != current:
+                LatestChapterService._set_pointer(novel, chapter)
+                changed += 1
+        return changed
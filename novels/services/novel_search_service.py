@@ -0,0 +1,219 @@
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+from novels.models import Novel, NovelSearchDocument
+from novels.utils import fold_search_text
+from constants import (
+    ApprovalStatus,
+    SEARCH_INDEX_BATCH_SIZE,
+    SEARCH_MAX_MATCHES,
+)
+
+FTS_TABLE = 'novels_novelsearch_fts'
+
+
+class NovelSearchService:
+    """
+    Ranked full-text search over NovelSearchDocument.
+
+    Only approved, non-deleted novels are indexed, so every backend can return
+    the top SEARCH_MAX_MATCHES ids without joining back to the novel table:
+    PostgreSQL uses the weighted tsvector with a trigram fallback for typos,
+    SQLite uses the FTS5 mirror table, anything else a LIKE scan of the
+    (single, narrow) document table.
+    """
+
+    _fts_available = {}
+
+    @staticmethod
+    def build_document(novel):
+        """Return the folded (title, document) pair of a novel"""
+        title = ' '.join(filter(None, [novel.name, novel.other_names]))
+        people = [
+            person_name
+            for person in (novel.author, novel.artist) if person
+            for person_name in (person.name, person.pen_name)
+        ]
+        document = ' '.join(filter(None, [
+            *people,
+            *(tag.name for tag in novel.tags.all()),
+            novel.summary,
+        ]))
+        return fold_search_text(title), fold_search_text(document)
+
+    @staticmethod
+    def is_indexed(novel):
+        return (
+            novel.approval_status == ApprovalStatus.APPROVED.value
+            and novel.deleted_at is None
+        )
+
+    @staticmethod
+    def _use_fts():
+        if connection.vendor != 'sqlite':
+            return False
+        alias = connection.alias
+        if alias not in NovelSearchService._fts_available:
+            NovelSearchService._fts_available[alias] = (
+                FTS_TABLE in connection.introspection.table_names()
+            )
+        return NovelSearchService._fts_available[alias]
+
+    @staticmethod
+    def _upsert_documents(documents):
+        if not documents:
+            return
+        update_fields = ['title', 'document', 'updated_at']
+        features = connection.features
+        if features.supports_update_conflicts_with_target:
+            NovelSearchDocument.objects.bulk_create(
+                documents, update_conflicts=True, unique_fields=['novel'], update_fields=update_fields
+            )
+        elif features.supports_update_conflicts:
+            # MySQL: ON DUPLICATE KEY UPDATE takes no conflict target, the
+            # primary key (novel_id) is the only unique key of the table
+            NovelSearchDocument.objects.bulk_create(
+                documents, update_conflicts=True, update_fields=update_fields
+            )
+        else:
+            NovelSearchDocument.objects.filter(novel_id__in=[doc.novel_id for doc in documents]).delete()
+            NovelSearchDocument.objects.bulk_create(documents)
+
+    @staticmethod
+    def index_novels(novel_ids):
+        """(Re)index the given novels, dropping the ones no longer searchable"""
+        novel_ids = list(novel_ids)
+        if not novel_ids:
+            return 0
+
+        novels = Novel.objects.filter(id__in=novel_ids).select_related(
+            'author', 'artist'
+        ).prefetch_related('tags')
+
+        documents = []
+        for novel in novels:
+            if NovelSearchService.is_indexed(novel):
+                title, document = NovelSearchService.build_document(novel)
+                documents.append(NovelSearchDocument(novel=novel, title=title, document=document))
+
+        indexed_ids = {doc.novel_id for doc in documents}
+        NovelSearchService.remove_novels([i for i in novel_ids if i not in indexed_ids])
+        NovelSearchService._upsert_documents(documents)
+
+        if NovelSearchService._use_fts() and documents:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(documents))})",
+                    [doc.novel_id for doc in documents]
+                )
+                cursor.executemany(
+                    f"INSERT INTO {FTS_TABLE} (rowid, title, document) VALUES (%s, %s, %s)",
+                    [(doc.novel_id, doc.title, doc.document) for doc in documents]
+                )
+        return len(documents)
+
+    @staticmethod
+    def index_novel(novel):
+        NovelSearchService.index_novels([novel.pk])
+
+    @staticmethod
+    def remove_novels(novel_ids):
+        novel_ids = list(novel_ids)
+        if not novel_ids:
+            return
+        NovelSearchDocument.objects.filter(novel_id__in=novel_ids).delete()
+        if NovelSearchService._use_fts():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(novel_ids))})",
+                    novel_ids
+                )
+
+    @staticmethod
+    def rebuild(batch_size=SEARCH_INDEX_BATCH_SIZE):
+        """Reindex every novel in batches, returns the number of indexed novels"""
+        novel_ids = list(Novel.objects.order_by('id').values_list('id', flat=True))
+        NovelSearchDocument.objects.exclude(novel_id__in=novel_ids).delete()
+        if NovelSearchService._use_fts():
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+        indexed = 0
+        for start in range(0, len(novel_ids), batch_size):
+            indexed += NovelSearchService.index_novels(novel_ids[start:start + batch_size])
+        return indexed
+
+    @staticmethod
+    def _match_postgres(terms, folded, limit):
+        tsquery = ' & '.join(f"{term}:*" for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT novel_id, ts_rank(search_vector, query) + word_similarity(%s, document) AS rank
+                FROM novels_novelsearchdocument, to_tsquery('simple', %s) query
+                WHERE search_vector @@ query OR %s <%% document
+                ORDER BY rank DESC
+                LIMIT %s
+                """,
+                [folded, tsquery, folded, limit]
+            )
+            return cursor.fetchall()
+
+    @staticmethod
+    def _match_fts(terms, limit):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT rowid, -bm25({FTS_TABLE}, 10.0, 1.0) AS rank
+                FROM {FTS_TABLE}
+                WHERE {FTS_TABLE} MATCH %s
+                ORDER BY rank DESC
+                LIMIT %s
+                """,
+                [match, limit]
+            )
+            return cursor.fetchall()
+
+    @staticmethod
+    def _match_like(terms, folded, limit):
+        documents = NovelSearchDocument.objects.all()
+        for term in terms:
+            documents = documents.filter(Q(title__contains=term) | Q(document__contains=term))
+        return list(documents.annotate(
+            rank=Case(
+                When(title__contains=folded, then=Value(2.0)),
+                default=Value(1.0),
+                output_field=FloatField(),
+            )
+        ).order_by('-rank', '-novel__view_count').values_list('novel_id', 'rank')[:limit])
+
+    @staticmethod
+    def match(query, limit=SEARCH_MAX_MATCHES):
+        """Return up to `limit` (novel_id, rank) pairs, best match first"""
+        folded = fold_search_text(query)
+        terms = folded.split()
+        if not terms:
+            return []
+        if connection.vendor == 'postgresql':
+            return NovelSearchService._match_postgres(terms, folded, limit)
+        if NovelSearchService._use_fts():
+            return NovelSearchService._match_fts(terms, limit)
+        return NovelSearchService._match_like(terms, folded, limit)
+
+    @staticmethod
+    def search(query):
+        """Visible novels matching `query`, annotated with search_rank and ranked"""
+        matches = NovelSearchService.match(query)
+        if not matches:
+            return Novel.objects.none()
+
+        return Novel.objects.filter(
+            id__in=[novel_id for novel_id, _ in matches],
+            approval_status=ApprovalStatus.APPROVED.value,
+            deleted_at__isnull=True
+        ).annotate(
+            search_rank=Case(
+                *[When(id=novel_id, then=Value(float(rank))) for novel_id, rank in matches],
+                output_field=FloatField(),
+            )
+        ).order_by('-search_rank', '-view_count')
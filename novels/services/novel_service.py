@@ -1,6 +1,6 @@
 from django.utils import timezone
 
-from django.db.models import OuterRef, Subquery, Q, Prefetch
+from django.db.models import Q, Prefetch
 from django.core.paginator import Paginator
 from novels.models import Novel, Volume, Chapter, Tag, Favorite
 from django.db import IntegrityError
@@ -13,6 +13,9 @@ from constants import (
     MAX_CHAPTER_LIST,MAX_LIKE_NOVELS_PAGE, NotificationTypeChoices
 )
 from interactions.services.notification_service import NotificationService
+from .novel_stats_service import NovelStatsService
+from .novel_search_service import NovelSearchService
+from .chapter_toc_service import ChapterTocService
 from django.utils.translation import gettext_lazy as _
 from common.utils.sse import SSEManager
 from asgiref.sync import async_to_sync
@@ -47,80 +50,51 @@ class NovelService:
         return NovelService.get_approved_novels().order_by('-favorite_count')[:MAX_LIKE_NOVELS]
     
     @staticmethod
-    def get_finished_novels_with_chapters():
+    def get_finished_novels():
+        """Get approved, completed novels ordered by last update"""
+        return NovelService.get_approved_novels().filter(
+            progress_status=ProgressStatus.COMPLETED.value
+        ).select_related('latest_chapter', 'latest_volume').order_by('-updated_at', '-id')
+
+    @staticmethod
+    def attach_latest_chapters(novels):
+        """
+        Attach recent_volume / recent_chapter to each novel.
+
+        Reads the denormalized Novel.latest_* pointers, so no extra query is
+        needed when the queryset select_related them.
+        """
+        novels = list(novels)
+        for novel in novels:
+            novel.recent_chapter = novel.latest_chapter
+            novel.recent_volume = novel.latest_volume
+        return novels
+
+    @staticmethod
+    def get_finished_novels_with_chapters(limit=MAX_FINISH_NOVELS):
         """Get finished novels with their latest volumes and chapters"""
-        finish_novels = Novel.objects.filter(
-            progress_status=ProgressStatus.COMPLETED.value,
-            approval_status=ApprovalStatus.APPROVED.value
-        ).order_by('-updated_at')
-        
-        novel_ids = list(finish_novels.values_list('id', flat=True)[:MAX_FINISH_NOVELS])
-        
-        all_volumes = Volume.objects.filter(novel_id__in=novel_ids).order_by('-updated_at')
-        all_chapters = Chapter.objects.filter(volume__novel_id__in=novel_ids).order_by('-updated_at')
-        
-        # Build dictionaries for efficient lookup
-        recent_volume_dict = {}
-        for volume in all_volumes:
-            if volume.novel_id not in recent_volume_dict:
-                recent_volume_dict[volume.novel_id] = volume
-        
-        recent_chapter_dict = {}
-        for chapter in all_chapters:
-            vol_id = chapter.volume_id
-            if vol_id in [v.id for v in recent_volume_dict.values()]:
-                if vol_id not in recent_chapter_dict:
-                    recent_chapter_dict[vol_id] = chapter
-        
-        # Attach recent volumes and chapters to novels
-        for novel in finish_novels:
-            recent_volume = recent_volume_dict.get(novel.id)
-            novel.recent_volume = recent_volume
-            if recent_volume:
-                recent_chapter = Chapter.objects.filter(
-                    volume=recent_volume
-                ).order_by('-updated_at').first()
-                novel.recent_chapter = recent_chapter
-        
-        return finish_novels
+        return NovelService.attach_latest_chapters(
+            NovelService.get_finished_novels()[:limit]
+        )
     
     @staticmethod
     def get_recent_volumes_for_cards(limit=MAX_LATEST_CHAPTER):
-        """Get recent volumes with their latest chapters for homepage cards"""
-        
-        # Get the most recent chapter for each volume
-        latest_chapter_subquery = Chapter.objects.filter(
-            volume_id=OuterRef('pk'),
-            approved=True,
-            is_hidden=False,
-            deleted_at__isnull=True
-        ).order_by('-updated_at').values('title', 'updated_at')[:1]
-
-        # Get volumes with approved novels, ordered by their latest chapter update
-        volumes = Volume.objects.select_related('novel').filter(
-            novel__approval_status=ApprovalStatus.APPROVED.value,
-            novel__deleted_at__isnull=True,
-            chapters__approved=True,
-            chapters__is_hidden=False,
-            chapters__deleted_at__isnull=True
-        ).annotate(
-            recent_chapter_title=Subquery(latest_chapter_subquery.values('title')),
-            latest_chapter_update=Subquery(latest_chapter_subquery.values('updated_at'))
-        ).filter(
-            recent_chapter_title__isnull=False
-        ).distinct().order_by('-latest_chapter_update')[:limit]
-        
+        """Get recently updated novels with their latest chapters for homepage cards"""
+        novels = NovelService.get_approved_novels().filter(
+            latest_chapter_at__isnull=False
+        ).select_related('latest_chapter', 'latest_volume').order_by('-latest_chapter_at')[:limit]
+
         return [{
-            'name': vol.novel.name,  
-            'slug': vol.novel.slug,  
-            'image_url': vol.novel.image_url,
+            'name': novel.name,
+            'slug': novel.slug,
+            'image_url': novel.image_url,
             'recent_volume': {
-                'name': vol.name
-            },
+                'name': novel.latest_volume.name
+            } if novel.latest_volume else None,
             'recent_chapter': {
-                'title': vol.recent_chapter_title
-            } if vol.recent_chapter_title else None
-        } for vol in volumes]
+                'title': novel.latest_chapter.title
+            } if novel.latest_chapter else None
+        } for novel in novels]
 
     @staticmethod
     def get_user_novels_with_stats(user):
@@ -140,36 +114,43 @@ class NovelService:
         }
 
     @staticmethod
-    def get_novel_detail(novel_slug, user=None):
-        """Get novel detail with tags and volumes"""
-        try:
-            novel = Novel.objects.select_related('author', 'artist', 'created_by').prefetch_related('tags').get(slug=novel_slug)
-        except Novel.DoesNotExist:
-            return None
+    def get_novel_detail(novel_slug, user=None, novel=None):
+        """
+        Get novel detail with tags and volumes.
+
+        Pass `novel` when the view already loaded it (request.novel) to skip
+        the lookup. Readers get the volumes of the cached TOC; the owner,
+        who also sees unapproved and hidden chapters, gets them from two
+        queries (volumes, then all chapters) instead of one per volume.
+        """
+        if novel is None:
+            try:
+                novel = Novel.objects.select_related('author', 'artist', 'created_by').get(slug=novel_slug)
+            except Novel.DoesNotExist:
+                return None
             
         # Check permissions
-        if user != novel.created_by:
+        is_owner = bool(user and user.is_authenticated and novel.created_by_id == user.pk)
+        if not is_owner:
             if novel.approval_status != ApprovalStatus.APPROVED.value:
                 return None
         
         tags = list(novel.tags.all())
-        volumes = Volume.objects.filter(novel=novel).prefetch_related("chapters").order_by('position', 'created_at')
-        is_owner = user and user.is_authenticated and novel.created_by == user
-        
-        # Process volumes and chapters
-        for volume in volumes:
-            if is_owner:
-                volume.chapter_list = list(volume.chapters.filter(deleted_at__isnull=True).order_by('position', 'created_at'))
-            else:
-                volume.chapter_list = list(volume.chapters.filter(
-                    approved=True, is_hidden=False, deleted_at__isnull=True
-                ).order_by('position', 'created_at'))
-            
-            volume.remaining_chapters = max(len(volume.chapter_list) - MAX_CHAPTER_LIST, 0)
+        if is_owner:
+            volumes = list(Volume.objects.filter(novel=novel).order_by('position', 'created_at'))
+            chapter_lists = {volume.id: [] for volume in volumes}
+            for chapter in Chapter.objects.filter(
+                volume__novel=novel, deleted_at__isnull=True
+            ).order_by('position', 'created_at'):
+                chapter_lists[chapter.volume_id].append(chapter)
+            for volume in volumes:
+                volume.chapter_list = chapter_lists[volume.id]
+                volume.remaining_chapters = max(len(volume.chapter_list) - MAX_CHAPTER_LIST, 0)
+        else:
+            volumes = ChapterTocService.get_volumes(novel.pk)
 
         can_add_chapter = (
-            user and user.is_authenticated and
-            novel.created_by == user and
+            is_owner and
             novel.approval_status == ApprovalStatus.APPROVED.value
         )
 
@@ -226,27 +207,14 @@ class NovelService:
 
     @staticmethod
     def search_novels(query):
-        """Search novels by multiple fields"""
+        """Search novels by name, other names, author, artist, tags and summary (ranked)"""
         if not query:
             return Novel.objects.none()
-            
-        novels = Novel.objects.filter(
-            Q(name__icontains=query) |
-            Q(summary__icontains=query) |
-            Q(author__name__icontains=query) |
-            Q(artist__name__icontains=query) |
-            Q(other_names__icontains=query) |
-            Q(tags__name__icontains=query),
-            approval_status=ApprovalStatus.APPROVED.value,
-            deleted_at__isnull=True
-        ).select_related('author', 'artist').prefetch_related('tags').distinct().order_by('-view_count')
-        
-        # Process data for template
-        for novel in novels:
-            novel.tag_list = list(novel.tags.all())
-            novel.rating_display = getattr(novel, 'rating_avg', DEFAULT_RATING_AVERAGE) if hasattr(novel, 'rating_avg') and novel.rating_avg > 0 else DEFAULT_RATING_AVERAGE
-            
-        return novels
+
+        # tag_list/rating_display are set by the caller on the page it renders
+        return NovelSearchService.search(query).select_related(
+            'author', 'artist'
+        ).prefetch_related('tags')
 
     @staticmethod
     def get_admin_novels_paginated(search_query=None, progress_status=None, tag_id=None, approval_status=None, page=1):
@@ -483,9 +451,11 @@ class FavoriteService:
         fav = Favorite.objects.filter(user=user, novel=novel).first()
         if fav:
             fav.delete()
+            NovelStatsService.favorite_changed(novel, -1)
             return False
         else:
             Favorite.objects.create(user=user, novel=novel)
+            NovelStatsService.favorite_changed(novel, 1)
             return True
 
 
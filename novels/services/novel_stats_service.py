@@ -0,0 +1,92 @@
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+from interactions.models import Review
+from novels.models import Novel, Favorite
+
+
+class NovelStatsService:
+    """
+    Maintain Novel.rating_sum / rating_count / rating_avg and favorite_count.
+
+    Every change is applied as F() delta UPDATEs on the novel row, so
+    ranking queries can sort on the stored columns without aggregating reviews
+    or favorites. reconcile() repairs any drift (admin edits, raw SQL) in bulk.
+    """
+
+    @staticmethod
+    def _apply_rating_delta(novel_id, sum_delta, count_delta):
+        # MySQL evaluates SET assignments left to right, so the average is
+        # computed by a second UPDATE from the stored columns
+        with transaction.atomic():
+            novels = Novel.objects.filter(pk=novel_id)
+            novels.update(
+                rating_sum=F('rating_sum') + sum_delta,
+                rating_count=F('rating_count') + count_delta,
+            )
+            novels.update(
+                rating_avg=Case(
+                    When(
+                        rating_count__gt=0,
+                        then=Cast(F('rating_sum'), FloatField()) / F('rating_count')
+                    ),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                ),
+            )
+
+    @staticmethod
+    def review_added(review):
+        NovelStatsService._apply_rating_delta(review.novel_id, review.rating, 1)
+
+    @staticmethod
+    def review_rating_changed(review, old_rating):
+        if review.rating != old_rating:
+            NovelStatsService._apply_rating_delta(review.novel_id, review.rating - old_rating, 0)
+
+    @staticmethod
+    def review_removed(review):
+        NovelStatsService._apply_rating_delta(review.novel_id, -review.rating, -1)
+
+    @staticmethod
+    def favorite_changed(novel, delta):
+        """Apply a +1/-1 favorite delta and refresh novel.favorite_count"""
+        Novel.objects.filter(pk=novel.pk).update(favorite_count=F('favorite_count') + delta)
+        novel.refresh_from_db(fields=['favorite_count'])
+        return novel.favorite_count
+
+    @staticmethod
+    def reconcile(novel_ids):
+        """Recompute the stored aggregates of the given novels, returns how many changed"""
+        ratings = {
+            row['novel_id']: (row['total'], row['count'])
+            for row in Review.objects.filter(
+                novel_id__in=novel_ids, is_active=True
+            ).values('novel_id').annotate(total=Sum('rating'), count=Count('id'))
+        }
+        favorites = dict(
+            Favorite.objects.filter(novel_id__in=novel_ids).values('novel_id').annotate(
+                count=Count('id')
+            ).values_list('novel_id', 'count')
+        )
+
+        changed = []
+        for novel in Novel.objects.filter(id__in=novel_ids).only(
+            'id', 'rating_sum', 'rating_count', 'rating_avg', 'favorite_count'
+        ):
+            rating_sum, rating_count = ratings.get(novel.id, (0, 0))
+            expected = (
+                rating_sum,
+                rating_count,
+                rating_sum / rating_count if rating_count else 0.0,
+                favorites.get(novel.id, 0),
+            )
+            current = (novel.rating_sum, novel.rating_count, novel.rating_avg, novel.favorite_count)
+            if expected != current:
+                novel.rating_sum, novel.rating_count, novel.rating_avg, novel.favorite_count = expected
+                changed.append(novel)
+
+        Novel.objects.bulk_update(
+            changed, ['rating_sum', 'rating_count', 'rating_avg', 'favorite_count']
+        )
+        return len(changed)
@@ -0,0 +1,185 @@
+import logging
+import re
+import threading
+import time
+from datetime import timedelta
+from django.db import close_old_connections
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from novels.models import Novel
+from novels.utils import fold_search_text
+from novels.utils.prefix_index import PrefixIndex
+from constants import (
+    ApprovalStatus,
+    SUGGEST_MAX_SCAN,
+    SUGGEST_REFRESH_SECONDS,
+    SUGGEST_FULL_REBUILD_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NovelSuggestionService:
+    """
+    Search-as-you-type suggestions served from a per-process PrefixIndex.
+
+    The index is loaded once per worker, updated in place by the novel/author
+    signals of this worker, and caught up with changes made by other workers
+    every SUGGEST_REFRESH_SECONDS by a background sync of recently updated
+    novels (a full reload runs every SUGGEST_FULL_REBUILD_SECONDS). Lookups
+    never query the database once the index is loaded.
+    """
+
+    index = PrefixIndex()
+    _novels = {}
+    _loaded_at = None
+    _synced_at = None
+    _refresh_lock = threading.Lock()
+
+    @staticmethod
+    def _keys(novel):
+        """Folded lookup keys: name and its word suffixes, other names, author names"""
+        keys = []
+        name_words = fold_search_text(novel.name).split()
+        keys.extend(' '.join(name_words[i:]) for i in range(len(name_words)))
+        for other_name in re.split(r'[,;/\n]', novel.other_names or ''):
+            keys.append(fold_search_text(other_name))
+        if novel.author:
+            keys.append(fold_search_text(novel.author.name))
+            keys.append(fold_search_text(novel.author.pen_name))
+        return keys
+
+    @staticmethod
+    def _is_listed(novel):
+        return (
+            novel.approval_status == ApprovalStatus.APPROVED.value
+            and novel.deleted_at is None
+        )
+
+    @staticmethod
+    def _queryset():
+        return Novel.objects.select_related('author').only(
+            'id', 'name', 'slug', 'other_names', 'view_count',
+            'approval_status', 'deleted_at', 'author__name', 'author__pen_name'
+        )
+
+    @staticmethod
+    def _novel_data(novel):
+        return {
+            'name': novel.name,
+            'slug': novel.slug,
+            'url': reverse('novels:novel_detail', kwargs={'novel_slug': novel.slug}),
+        }
+
+    @staticmethod
+    def _apply(novels):
+        """Add/replace listed novels and drop the others"""
+        service = NovelSuggestionService
+        for novel in novels:
+            if service._is_listed(novel):
+                service._novels[novel.id] = service._novel_data(novel)
+                service.index.add(novel.id, service._keys(novel), novel.view_count)
+            else:
+                service._novels.pop(novel.id, None)
+                service.index.remove(novel.id)
+
+    @staticmethod
+    def load():
+        """Rebuild the whole index from the database"""
+        service = NovelSuggestionService
+        synced_at = timezone.now()
+        novels = list(service._queryset().filter(
+            approval_status=ApprovalStatus.APPROVED.value,
+            deleted_at__isnull=True
+        ))
+        service._novels = {novel.id: service._novel_data(novel) for novel in novels}
+        service.index.load(
+            (novel.id, service._keys(novel), novel.view_count) for novel in novels
+        )
+        service._loaded_at = time.monotonic()
+        service._synced_at = synced_at
+        return len(novels)
+
+    @staticmethod
+    def sync():
+        """Apply novels (or their authors) changed since the last sync"""
+        service = NovelSuggestionService
+        since, synced_at = service._synced_at, timezone.now()
+        service._apply(service._queryset().filter(
+            Q(updated_at__gte=since) | Q(author__updated_at__gte=since)
+        ))
+        service._synced_at = synced_at
+
+    @staticmethod
+    def reset():
+        """Forget the loaded index (the next lookup reloads it)"""
+        service = NovelSuggestionService
+        service.index = PrefixIndex()
+        service._novels = {}
+        service._loaded_at = None
+        service._synced_at = None
+
+    @staticmethod
+    def _refresh_in_background(full):
+        try:
+            if full:
+                NovelSuggestionService.load()
+            else:
+                NovelSuggestionService.sync()
+        except Exception as e:
+            logger.exception("Error refreshing novel suggestions: %s", e)
+        finally:
+            NovelSuggestionService._refresh_lock.release()
+            close_old_connections()
+
+    @staticmethod
+    def ensure_fresh():
+        """Load on first use, then refresh off the request path when due"""
+        service = NovelSuggestionService
+        if service._loaded_at is None:
+            with service._refresh_lock:
+                if service._loaded_at is None:
+                    service.load()
+            return
+
+        if time.monotonic() - service._loaded_at >= SUGGEST_FULL_REBUILD_SECONDS:
+            full = True
+        elif timezone.now() - service._synced_at >= timedelta(seconds=SUGGEST_REFRESH_SECONDS):
+            full = False
+        else:
+            return
+
+        if service._refresh_lock.acquire(blocking=False):
+            threading.Thread(
+                target=service._refresh_in_background, args=(full,), daemon=True
+            ).start()
+
+    @staticmethod
+    def suggest(query, limit):
+        """Top `limit` listed novels whose name/other name/author starts with `query`"""
+        prefix = fold_search_text(query)
+        if not prefix:
+            return []
+        NovelSuggestionService.ensure_fresh()
+        novels = NovelSuggestionService._novels
+        ids = NovelSuggestionService.index.search(prefix, limit, SUGGEST_MAX_SCAN)
+        return [novels[novel_id] for novel_id in ids if novel_id in novels]
+
+    @staticmethod
+    def novel_changed(novel):
+        """Incremental update from this worker's signals (no-op until loaded)"""
+        if NovelSuggestionService._loaded_at is not None:
+            NovelSuggestionService._apply([novel])
+
+    @staticmethod
+    def novel_removed(novel_id):
+        NovelSuggestionService._novels.pop(novel_id, None)
+        NovelSuggestionService.index.remove(novel_id)
+
+    @staticmethod
+    def author_changed(author):
+        if NovelSuggestionService._loaded_at is not None:
+            NovelSuggestionService._apply(
+                NovelSuggestionService._queryset().filter(author=author)
+            )
@@ -0,0 +1,83 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from novels.models import Novel, Volume, Chapter, Tag, Author, Artist
+from novels.services import (
+    HomeSnapshotService,
+    NovelSearchService,
+    NovelSuggestionService,
+    ChunkCacheService,
+    ChapterTocService,
+)
+from interactions.models import Comment
+
+
+@receiver(post_save, sender=Novel)
+@receiver(post_delete, sender=Novel)
+@receiver(post_save, sender=Chapter)
+@receiver(post_delete, sender=Chapter)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_home_snapshot(sender, **kwargs):
+    """Mark the homepage snapshot stale when a listed object changes"""
+    HomeSnapshotService.invalidate()
+
+
+@receiver(post_save, sender=Novel)
+def index_saved_novel(sender, instance, raw=False, **kwargs):
+    """Keep the search document of a novel in sync with its fields"""
+    if not raw:
+        NovelSearchService.index_novel(instance)
+        NovelSuggestionService.novel_changed(instance)
+
+
+@receiver(post_delete, sender=Novel)
+def unindex_deleted_novel(sender, instance, **kwargs):
+    NovelSearchService.remove_novels([instance.pk])
+    NovelSuggestionService.novel_removed(instance.pk)
+
+
+@receiver(m2m_changed, sender=Novel.tags.through)
+def index_novel_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    """Reindex novels whose tag list changed (from either side of the relation)"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        NovelSearchService.index_novel(instance)
+    elif pk_set:
+        NovelSearchService.index_novels(pk_set)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Artist)
+def index_related_novels(sender, instance, created=False, raw=False, **kwargs):
+    """A renamed tag/author/artist changes the documents of all its novels"""
+    if created or raw:
+        return
+    NovelSearchService.index_novels(instance.novels.values_list('id', flat=True))
+    if sender is Author:
+        NovelSuggestionService.author_changed(instance)
+
+
+@receiver(post_save, sender=Chapter)
+@receiver(post_delete, sender=Chapter)
+def refresh_chunk_cache_pointer(sender, instance, created=False, raw=False, **kwargs):
+    """Visibility or content_version may have changed, or the chapter is gone"""
+    if not raw:
+        ChunkCacheService.chapter_changed(instance, created)
+
+
+@receiver(post_save, sender=Chapter)
+@receiver(post_delete, sender=Chapter)
+def invalidate_chapter_toc(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Approve, hide, delete, move or rename: the novel's TOC is stale"""
+    if not raw:
+        ChapterTocService.chapter_changed(instance, update_fields)
+
+
+@receiver(post_save, sender=Volume)
+@receiver(post_delete, sender=Volume)
+def invalidate_volume_toc(sender, instance, raw=False, **kwargs):
+    """Volume names and positions are part of the TOC"""
+    if not raw:
+        ChapterTocService.novel_changed(instance.novel_id)
@@ -1,6 +1,6 @@
 from django import template
 from django.utils.translation import gettext_lazy as _
-from constants import ApprovalStatus
+from constants import ApprovalStatus, ChapterProcessingStatus
 
 register = template.Library()
 
@@ -37,6 +37,10 @@ def chapter_status_label(chapter):
         return _("Đã duyệt")
     elif chapter.rejected_reason:
         return _("Bị từ chối")
+    elif chapter.processing_status == ChapterProcessingStatus.FAILED.value:
+        return _("Xử lý lỗi")
+    elif chapter.processing_status != ChapterProcessingStatus.READY.value:
+        return _("Đang xử lý")
     else:
         return _("Chờ duyệt")
 
@@ -46,6 +50,10 @@ def chapter_status_icon(chapter):
         return "bx-check"
     elif chapter.rejected_reason:
         return "bx-x"
+    elif chapter.processing_status == ChapterProcessingStatus.FAILED.value:
+        return "bx-error"
+    elif chapter.processing_status != ChapterProcessingStatus.READY.value:
+        return "bx-loader-alt"
     else:
         return "bx-time"
 
@@ -55,6 +63,8 @@ def chapter_status_class(chapter):
         return "status-approved"
     elif chapter.rejected_reason:
         return "status-rejected"
+    elif chapter.processing_status == ChapterProcessingStatus.FAILED.value:
+        return "status-rejected"
     else:
         return "status-pending"
 
@@ -9,7 +9,7 @@ from unittest.mock import patch, Mock
 
 from novels.models import Novel, Volume, Chapter, Author, Artist, Tag
 from novels.forms import ChapterForm
-from constants import ApprovalStatus, UserRole, MAX_CHUNK_SIZE
+from constants import ApprovalStatus, UserRole, ChapterJobKind, ChapterProcessingStatus
 import warnings
 
 warnings.filterwarnings("ignore", message="No directory at:")
@@ -221,10 +221,9 @@ class ChapterFormValidationTests(ChapterFormTestCase):
 class ChapterFormSaveTests(ChapterFormTestCase):
     """Test ChapterForm save functionality"""
     
-    @patch('novels.utils.ChunkManager.create_html_chunks_for_chapter')
-    def test_form_save_with_existing_volume(self, mock_create_chunks):
+    @patch('novels.forms.chapter_form.ChapterJobService.enqueue_processing')
+    def test_form_save_with_existing_volume(self, mock_enqueue):
         """Test form save with existing volume"""
-        mock_create_chunks.return_value = 2
         
         form_data = {
             'title': 'New Chapter Title',
@@ -243,13 +242,12 @@ class ChapterFormSaveTests(ChapterFormTestCase):
         self.assertEqual(chapter.position, expected_position) # First chapter since volume was empty
         self.assertFalse(chapter.approved)
         
-        # Check chunks were created
-        mock_create_chunks.assert_called_once()
+        # Check chunking was queued
+        mock_enqueue.assert_called_once()
     
-    @patch('novels.utils.ChunkManager.create_html_chunks_for_chapter')
-    def test_form_save_with_new_volume(self, mock_create_chunks):
+    @patch('novels.forms.chapter_form.ChapterJobService.enqueue_processing')
+    def test_form_save_with_new_volume(self, mock_enqueue):
         """Test form save with new volume"""
-        mock_create_chunks.return_value = 3
         
         form_data = {
             'title': 'New Chapter Title',
@@ -272,8 +270,8 @@ class ChapterFormSaveTests(ChapterFormTestCase):
         self.assertEqual(chapter.volume, new_volume)
         self.assertEqual(chapter.position, 1)
         
-        # Check chunks were created
-        mock_create_chunks.assert_called_once()
+        # Check chunking was queued
+        mock_enqueue.assert_called_once()
     
     def test_save_without_novel_raises_error(self):
         """Test that save() raises ValueError when novel is None"""
@@ -308,7 +306,7 @@ class ChapterFormEdgeCaseTests(ChapterFormTestCase):
         }
         form = ChapterForm(novel=self.novel, data=form_data)
         
-        with patch('novels.utils.ChunkManager.create_html_chunks_for_chapter'):
+        with patch('novels.forms.chapter_form.ChapterJobService.enqueue_processing'):
             chapter = form.save()
         
         # Check that new volume has correct position
@@ -335,7 +333,7 @@ class ChapterFormEdgeCaseTests(ChapterFormTestCase):
         }
         form = ChapterForm(novel=self.novel, data=form_data)
         
-        with patch('novels.utils.ChunkManager.create_html_chunks_for_chapter'):
+        with patch('novels.forms.chapter_form.ChapterJobService.enqueue_processing'):
             chapter = form.save()
         
         # Should be position 4 (after 3 existing chapters)
@@ -353,29 +351,20 @@ class ChapterFormEdgeCaseTests(ChapterFormTestCase):
         self.assertFalse(form.is_valid())
         self.assertIn('Select a valid choice', str(form.errors))
     
-    @patch('novels.utils.ChunkManager.create_html_chunks_for_chapter')
-    def test_html_chunker_integration(self, mock_chunk):
-        """Test HTML chunker integration in save method"""
+    def test_save_queues_content_for_processing(self):
+        """Test save stores the raw content in a processing job instead of chunking"""
         form_data = {
             'title': 'HTML Test Chapter',
             'volume_choice': str(self.volume.id),
             'content': '<h1>Title</h1><p>Paragraph 1</p><p>Paragraph 2</p>'
         }
         form = ChapterForm(novel=self.novel, data=form_data)
+        self.assertTrue(form.is_valid())
         
-        with patch('novels.forms.chapter_form.HtmlChunker') as mock_chunker_class:
-            mock_chunker_instance = Mock()
-            mock_chunker_class.return_value = mock_chunker_instance
-            mock_chunk.return_value = 3
-            
-            chapter = form.save()
-            
-            # Verify HTML chunker was created with correct parameters
-            mock_chunker_class.assert_called_once_with(max_chunk_size=MAX_CHUNK_SIZE)
-            
-            # Verify chunk creation was called with HTML chunker
-            mock_chunk.assert_called_once_with(
-                chapter=chapter,
-                content=form_data['content'],
-                chunker=mock_chunker_instance
-            )
+        chapter = form.save()
+        
+        self.assertEqual(chapter.chunks.count(), 0)
+        self.assertEqual(chapter.processing_status, ChapterProcessingStatus.QUEUED.value)
+        job = chapter.jobs.get()
+        self.assertEqual(job.kind, ChapterJobKind.PROCESS.value)
+        self.assertEqual(job.content, form_data['content'])
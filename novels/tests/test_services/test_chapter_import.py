@@ -0,0 +1,127 @@
+"""
+Unit tests for the bulk chapter import
+"""
+import os
+import shutil
+import tempfile
+import zipfile
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from novels.models import Novel, Volume, Chapter
+from novels.services import ChapterImportService
+from novels.utils import ChunkManager
+from constants import ApprovalStatus
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+CHAPTER_FILES = {
+    'Tập 1/001 - Mở đầu.html': '<p>Một hai ba</p>\n<p>bốn năm</p>',
+    'Tập 1/002 - Gặp gỡ.html': '<p>Chương hai</p>',
+    'Tập 1/010 - Chia tay.html': '<p>Chương mười</p>',
+    'Tập 2/01_ket_thuc.txt': 'Dòng đầu.\n\nDòng cuối.',
+    'Lời tựa.htm': '<p>Lời tựa</p>',
+    'notes.md': 'not a chapter',
+    '.DS_Store': 'junk',
+}
+
+
+class ChapterImportTestCase(TestCase):
+    def setUp(self):
+        self.novel = Novel.objects.create(
+            name="Imported Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.directory = tempfile.mkdtemp()
+        for name, content in CHAPTER_FILES.items():
+            path = os.path.join(self.directory, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def imported(self):
+        return list(Chapter.objects.filter(volume__novel=self.novel).order_by(
+            'volume__position', 'position'
+        ).values_list('volume__name', 'position', 'title'))
+
+
+class ImportChaptersTests(ChapterImportTestCase):
+    def test_directory_import(self):
+        result = ChapterImportService.import_chapters(self.novel, self.directory, workers=0, batch_size=2)
+
+        self.assertEqual(result, {'total': 5, 'imported': 5, 'skipped': 0})
+        self.assertEqual(self.imported(), [
+            ('Tập 1', 1, 'Lời tựa'),
+            ('Tập 1', 2, 'Mở đầu'),
+            ('Tập 1', 3, 'Gặp gỡ'),
+            ('Tập 1', 4, 'Chia tay'),
+            ('Tập 2', 1, 'ket thuc'),
+        ])
+        chapter = Chapter.objects.get(title='Mở đầu')
+        self.assertEqual(chapter.word_count, 5)
+        self.assertEqual(chapter.chunk_count, 1)
+        self.assertFalse(chapter.approved)
+        self.assertEqual(Chapter.objects.get(title='ket thuc').get_content(), 'Dòng đầu.\n\nDòng cuối.')
+
+    def test_zip_import_in_process_pool(self):
+        archive = os.path.join(self.directory, 'novel.zip')
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for name, content in CHAPTER_FILES.items():
+                zf.writestr(f'novel/{name}', content)
+
+        result = ChapterImportService.import_chapters(self.novel, archive, workers=2)
+
+        self.assertEqual(result['imported'], 5)
+        # The archive's top directory holds the top-level files
+        self.assertIn(('novel', 1, 'Lời tựa'), self.imported())
+
+    def test_progress_is_reported_per_batch(self):
+        progress = []
+        ChapterImportService.import_chapters(
+            self.novel, self.directory, workers=0, batch_size=2,
+            progress=lambda done, total, elapsed: progress.append((done, total))
+        )
+        self.assertEqual(progress, [(2, 5), (4, 5), (5, 5)])
+
+    def test_resume_after_failure(self):
+        original = ChunkManager.write_chunks
+        calls = []
+
+        def fail_on_third_chapter(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise RuntimeError("disk full")
+            return original(*args)
+
+        with patch.object(ChunkManager, 'write_chunks', side_effect=fail_on_third_chapter):
+            with self.assertRaisesMessage(CommandError, "run the command again to resume"):
+                call_command(
+                    'import_chapters', self.novel.slug, self.directory,
+                    '--workers', '0', '--batch-size', '2', stdout=StringIO()
+                )
+
+        # The first batch was committed, the failed one rolled back
+        self.assertEqual(len(self.imported()), 2)
+
+        out = StringIO()
+        call_command('import_chapters', self.novel.slug, self.directory, '--workers', '0', stdout=out)
+
+        self.assertIn("Imported 3 of 5 chapters", out.getvalue())
+        self.assertIn("(2 already present)", out.getvalue())
+        self.assertEqual([title for _, _, title in self.imported()],
+                         ['Lời tựa', 'Mở đầu', 'Gặp gỡ', 'Chia tay', 'ket thuc'])
+        self.assertEqual(Volume.objects.filter(novel=self.novel).count(), 2)
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesMessage(CommandError, "does not exist"):
+            call_command('import_chapters', 'missing-novel', self.directory, stdout=StringIO())
+        with self.assertRaisesMessage(CommandError, "does not exist"):
+            call_command('import_chapters', self.novel.slug, '/no/such/path', stdout=StringIO())
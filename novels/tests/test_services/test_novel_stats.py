@@ -0,0 +1,128 @@
+"""
+Unit tests for the incrementally maintained novel rating/favorite aggregates
+"""
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from interactions.models import Review
+from interactions.services import ReviewService
+from novels.models import Novel, Favorite
+from novels.services import NovelStatsService
+from novels.services.novel_service import FavoriteService
+from constants import ApprovalStatus
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+User = get_user_model()
+
+
+class NovelStatsTestCase(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f'reader{i}@example.com',
+                username=f'reader{i}',
+                password='testpass123'
+            )
+            for i in range(3)
+        ]
+        self.novel = Novel.objects.create(
+            name="Rated Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+
+    def assertStats(self, rating_sum, rating_count, favorite_count=0):
+        self.novel.refresh_from_db()
+        self.assertEqual(self.novel.rating_sum, rating_sum)
+        self.assertEqual(self.novel.rating_count, rating_count)
+        self.assertAlmostEqual(
+            self.novel.rating_avg, rating_sum / rating_count if rating_count else 0.0
+        )
+        self.assertEqual(self.novel.favorite_count, favorite_count)
+
+
+class ReviewAggregationTests(NovelStatsTestCase):
+    def create_review(self, user, rating):
+        return ReviewService.create_review(
+            user, self.novel.slug, {'rating': str(rating), 'content': 'Review'}
+        )
+
+    def test_create_review_updates_rating(self):
+        self.create_review(self.users[0], 5)
+        self.assertStats(5, 1)
+
+        self.create_review(self.users[1], 2)
+        self.assertStats(7, 2)
+
+    def test_edit_review_applies_rating_difference(self):
+        review = self.create_review(self.users[0], 5)
+        self.create_review(self.users[1], 3)
+
+        ReviewService.edit_review(self.users[0], self.novel.slug, review.id, 1, 'Changed my mind')
+        self.assertStats(4, 2)
+
+    def test_create_then_edit_matches_reconcile(self):
+        review = self.create_review(self.users[0], 5)
+        ReviewService.edit_review(self.users[0], self.novel.slug, review.id, 2, 'Changed my mind')
+
+        self.novel.refresh_from_db()
+        self.assertEqual(self.novel.rating_avg, 2.0)
+        self.assertEqual(NovelStatsService.reconcile([self.novel.id]), 0)
+
+    def test_delete_review_removes_rating(self):
+        review = self.create_review(self.users[0], 5)
+        self.create_review(self.users[1], 3)
+
+        ReviewService.delete_review(self.novel.slug, review.id)
+        self.assertStats(3, 1)
+
+    def test_deleting_last_review_resets_average(self):
+        review = self.create_review(self.users[0], 4)
+
+        ReviewService.delete_review(self.novel.slug, review.id)
+        self.assertStats(0, 0)
+
+    def test_invalid_review_leaves_stats_untouched(self):
+        self.create_review(self.users[0], 9)
+        self.assertStats(0, 0)
+
+
+class FavoriteAggregationTests(NovelStatsTestCase):
+    def test_toggle_like_updates_favorite_count(self):
+        FavoriteService.toggle_like(self.users[0], self.novel)
+        FavoriteService.toggle_like(self.users[1], self.novel)
+        self.assertEqual(self.novel.favorite_count, 2)
+
+        FavoriteService.toggle_like(self.users[0], self.novel)
+        self.assertEqual(self.novel.favorite_count, 1)
+        self.assertStats(0, 0, favorite_count=1)
+
+
+class ReconcileTests(NovelStatsTestCase):
+    def setUp(self):
+        super().setUp()
+        # Written directly, bypassing the services
+        Review.objects.create(user=self.users[0], novel=self.novel, rating=5, content="A")
+        Review.objects.create(user=self.users[1], novel=self.novel, rating=2, content="B")
+        Review.objects.create(
+            user=self.users[2], novel=self.novel, rating=1, content="C", is_active=False
+        )
+        Favorite.objects.create(user=self.users[0], novel=self.novel)
+
+    def test_reconcile_repairs_drift(self):
+        changed = NovelStatsService.reconcile([self.novel.id])
+
+        self.assertEqual(changed, 1)
+        self.assertStats(7, 2, favorite_count=1)
+        self.assertEqual(NovelStatsService.reconcile([self.novel.id]), 0)
+
+    def test_reconcile_command(self):
+        out = StringIO()
+        call_command('reconcile_novel_stats', stdout=out)
+
+        self.assertIn("repaired for 1 of 1 novels", out.getvalue())
+        self.assertStats(7, 2, favorite_count=1)
@@ -0,0 +1,126 @@
+"""
+Unit tests for the novel full-text search index
+"""
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from novels.models import Novel, Author, Tag, NovelSearchDocument
+from novels.services import NovelService, NovelSearchService
+from novels.utils import fold_search_text
+from constants import ApprovalStatus
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+
+class SearchIndexTestCase(TestCase):
+    def setUp(self):
+        self.author = Author.objects.create(name="Nguyễn Nhật Ánh")
+        self.tag = Tag.objects.create(name="Học đường", slug="hoc-duong")
+        self.title_match = Novel.objects.create(
+            name="Kính Vạn Hoa",
+            summary="Chuyện trường lớp",
+            author=self.author,
+            approval_status=ApprovalStatus.APPROVED.value,
+            view_count=1
+        )
+        self.summary_match = Novel.objects.create(
+            name="Mắt Biếc",
+            summary="Một câu chuyện về kính vạn hoa của tuổi thơ",
+            approval_status=ApprovalStatus.APPROVED.value,
+            view_count=100
+        )
+        self.draft = Novel.objects.create(
+            name="Kính Vạn Hoa (bản nháp)",
+            summary="Draft",
+            approval_status=ApprovalStatus.DRAFT.value
+        )
+
+    def search(self, query):
+        return list(NovelService.search_novels(query))
+
+
+class FoldSearchTextTests(TestCase):
+    def test_folds_vietnamese_diacritics(self):
+        self.assertEqual(fold_search_text("Đêm Trắng, Tiểu Thuyết!"), "dem trang tieu thuyet")
+
+    def test_empty_text(self):
+        self.assertEqual(fold_search_text(None), "")
+
+
+class NovelSearchServiceTests(SearchIndexTestCase):
+    def test_matches_without_diacritics(self):
+        self.assertIn(self.title_match, self.search("kinh van hoa"))
+
+    def test_title_matches_rank_first(self):
+        results = self.search("kính vạn")
+        self.assertEqual(results, [self.title_match, self.summary_match])
+
+    def test_prefix_matching(self):
+        self.assertIn(self.title_match, self.search("kin"))
+
+    def test_unapproved_novels_are_not_indexed(self):
+        self.assertFalse(NovelSearchDocument.objects.filter(novel=self.draft).exists())
+        self.assertNotIn(self.draft, self.search("ban nhap"))
+
+    def test_approval_adds_novel_to_index(self):
+        self.draft.approval_status = ApprovalStatus.APPROVED.value
+        self.draft.save()
+        self.assertIn(self.draft, self.search("ban nhap"))
+
+    def test_soft_delete_removes_novel(self):
+        self.title_match.deleted_at = self.title_match.created_at
+        self.title_match.save()
+        self.assertEqual(self.search("truong lop"), [])
+
+    def test_author_rename_reindexes_novels(self):
+        self.assertIn(self.title_match, self.search("nhat anh"))
+
+        self.author.name = "Tác giả khác"
+        self.author.save()
+        self.assertEqual(self.search("nhat anh"), [])
+        self.assertIn(self.title_match, self.search("tac gia khac"))
+
+    def test_tag_changes_reindex_novels(self):
+        self.title_match.tags.add(self.tag)
+        self.assertIn(self.title_match, self.search("hoc duong"))
+
+        self.title_match.tags.remove(self.tag)
+        self.assertEqual(self.search("hoc duong"), [])
+
+        self.tag.novels.add(self.summary_match)
+        self.assertIn(self.summary_match, self.search("hoc duong"))
+
+    def test_upsert_without_conflict_target(self):
+        # MySQL: ON DUPLICATE KEY UPDATE, bulk_create rejects unique_fields there
+        with patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+                patch.object(NovelSearchDocument.objects, 'bulk_create') as bulk_create:
+            NovelSearchService.index_novel(self.title_match)
+
+        self.assertTrue(bulk_create.call_args.kwargs['update_conflicts'])
+        self.assertNotIn('unique_fields', bulk_create.call_args.kwargs)
+
+    def test_reindex_without_upsert_support(self):
+        with patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+                patch.object(connection.features, 'supports_update_conflicts', False):
+            self.title_match.summary = "Phiên bản mới"
+            self.title_match.save()
+
+        self.assertEqual(NovelSearchDocument.objects.filter(novel=self.title_match).count(), 1)
+        self.assertIn(self.title_match, self.search("phien ban moi"))
+
+    def test_empty_query(self):
+        self.assertEqual(self.search("   !!!"), [])
+
+    def test_rebuild_command(self):
+        NovelSearchService.remove_novels([self.title_match.id])
+        self.assertEqual(self.search("truong lop"), [])
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn("2 novels indexed", out.getvalue())
+        self.assertIn(self.title_match, self.search("truong lop"))
@@ -0,0 +1,141 @@
+"""
+Unit tests for compressed chunk storage
+"""
+from io import StringIO
+from unittest import skipIf
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from novels.models import Novel, Volume, Chapter, Chunk
+from novels.services import ChapterService, ChunkCacheService
+from novels.utils import ChunkCodec, ChunkManager, chunk_codec
+from constants import ApprovalStatus, CHUNK_CODEC_RAW, CHUNK_CODEC_ZLIB, CHUNK_CODEC_ZSTD
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+PARAGRAPH = "<p>" + "Một đoạn văn dài của chương truyện. " * 40 + "</p>"
+
+
+def chunk_rows(count):
+    return [(f"<h2>Phần {position}</h2>{PARAGRAPH}", 322) for position in range(1, count + 1)]
+
+
+class ChunkCodecTests(SimpleTestCase):
+    def test_zlib_round_trip(self):
+        content, codec, compressed = ChunkCodec.encode(PARAGRAPH, CHUNK_CODEC_ZLIB)
+
+        self.assertEqual((content, codec), ('', CHUNK_CODEC_ZLIB))
+        self.assertLess(len(compressed), len(PARAGRAPH.encode('utf-8')) / 3)
+        self.assertEqual(ChunkCodec.decode(codec, content, memoryview(compressed)), PARAGRAPH)
+
+    def test_incompressible_content_stays_raw(self):
+        self.assertEqual(ChunkCodec.encode("<p>Hi</p>", CHUNK_CODEC_ZLIB), ("<p>Hi</p>", CHUNK_CODEC_RAW, None))
+
+    @skipIf(chunk_codec.zstandard is None, "zstandard is not installed")
+    def test_zstd_round_trip(self):
+        content, codec, compressed = ChunkCodec.encode(PARAGRAPH, CHUNK_CODEC_ZSTD)
+
+        self.assertEqual(codec, CHUNK_CODEC_ZSTD)
+        self.assertEqual(ChunkCodec.decode(codec, content, compressed), PARAGRAPH)
+
+    @skipIf(chunk_codec.zstandard is not None, "zstandard is installed")
+    def test_zstd_needs_zstandard(self):
+        with self.assertRaisesMessage(ValueError, "zstandard"):
+            ChunkCodec.encode(PARAGRAPH, CHUNK_CODEC_ZSTD)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            ChunkCodec.encode(PARAGRAPH, 'brotli')
+
+    @override_settings(CHUNK_STORAGE_CODEC=CHUNK_CODEC_ZLIB)
+    def test_storage_codec_setting(self):
+        self.assertEqual(ChunkCodec.storage_codec(), CHUNK_CODEC_ZLIB)
+        self.assertEqual(ChunkCodec.encode(PARAGRAPH)[1], CHUNK_CODEC_ZLIB)
+
+
+class CompressedChunkTestCase(TestCase):
+    def setUp(self):
+        self.novel = Novel.objects.create(
+            name="Compressed Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.chapter = Chapter.objects.create(
+            volume=self.volume, title="Chapter 1", position=1, approved=True
+        )
+        self.rows = chunk_rows(3)
+        self.content = '\n'.join(content for content, _ in self.rows)
+
+
+@override_settings(CHUNK_STORAGE_CODEC=CHUNK_CODEC_ZLIB)
+class CompressedWriteTests(CompressedChunkTestCase):
+    def test_chunks_are_stored_compressed_and_read_transparently(self):
+        ChunkManager.write_chunks(self.chapter, self.rows, 966)
+
+        self.assertEqual(set(Chunk.objects.values_list('codec', flat=True)), {CHUNK_CODEC_ZLIB})
+        self.assertEqual(set(Chunk.objects.values_list('content', flat=True)), {''})
+        self.assertEqual(self.chapter.get_content(), self.content)
+        self.assertEqual(self.chapter.char_count, len(self.content) - 2)
+        self.assertEqual(Chunk.objects.first().get_content(), self.rows[0][0])
+
+        chapter = Chapter.objects.get(pk=self.chapter.pk)
+        cached = ChunkCacheService.get_chapter_content(chapter)
+        self.assertEqual([chunk['content'] for chunk in cached['chunks']], [row[0] for row in self.rows])
+
+        review = ChapterService.get_chapter_review_context(chapter)
+        self.assertEqual(review['chunks'][1]['content'], self.rows[1][0])
+
+    def test_unchanged_compressed_chunks_are_not_rewritten(self):
+        ChunkManager.write_chunks(self.chapter, self.rows, 966)
+        version = self.chapter.content_version
+
+        ChunkManager.write_chunks(self.chapter, self.rows, 966)
+
+        self.assertEqual(self.chapter.content_version, version)
+
+    def test_stats_refresh_measures_decoded_content(self):
+        ChunkManager.write_chunks(self.chapter, self.rows, 966)
+        Chapter.objects.filter(pk=self.chapter.pk).update(char_count=0)
+
+        self.assertEqual(ChunkManager.refresh_chunk_stats([self.chapter.pk]), 1)
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.char_count, len(self.content) - 2)
+
+    def test_load_more_serves_decoded_chunks(self):
+        ChunkManager.write_chunks(self.chapter, self.rows, 966)
+
+        response = self.client.get(
+            reverse('novels:load_more_chunks', kwargs={'chapter_id': self.chapter.id}), {'start': 2}
+        )
+
+        self.assertEqual(response.json()['chunks'][0]['content'], self.rows[1][0])
+
+
+class CompressChunksCommandTests(CompressedChunkTestCase):
+    def test_convert_and_back(self):
+        ChunkManager.write_chunks(self.chapter, self.rows + [("<p>Hi</p>", 1)], 967)
+        version = Chapter.objects.get(pk=self.chapter.pk).content_version
+        out = StringIO()
+
+        call_command('compress_chunks', '--codec', 'zlib', '--batch-size', '2', stdout=out)
+
+        self.assertIn("Converted 3 chunks to zlib", out.getvalue())
+        self.assertEqual(
+            list(Chunk.objects.order_by('position').values_list('codec', flat=True)),
+            [CHUNK_CODEC_ZLIB] * 3 + [CHUNK_CODEC_RAW]
+        )
+        chapter = Chapter.objects.get(pk=self.chapter.pk)
+        self.assertEqual(chapter.content_version, version)
+        self.assertEqual(chapter.get_content(), self.content + "\n<p>Hi</p>")
+
+        call_command('compress_chunks', '--codec', 'raw', stdout=StringIO())
+        self.assertEqual(set(Chunk.objects.values_list('codec', flat=True)), {CHUNK_CODEC_RAW})
+        self.assertEqual(chapter.get_content(), self.content + "\n<p>Hi</p>")
+
+    def test_unknown_codec(self):
+        with self.assertRaises(CommandError):
+            call_command('compress_chunks', '--codec', 'brotli', stdout=StringIO())
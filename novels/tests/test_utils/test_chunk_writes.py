@@ -0,0 +1,92 @@
+"""
+Unit tests for the bulk chunk write path of ChunkManager
+"""
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from novels.models import Novel, Volume, Chapter, Chunk
+from novels.utils import ChunkManager
+from constants import ApprovalStatus
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+
+def chunk_rows(count, prefix="Chunk"):
+    return [(f"<p>{prefix} {position}</p>", 2) for position in range(1, count + 1)]
+
+
+class ChunkWriteTestCase(TestCase):
+    def setUp(self):
+        self.novel = Novel.objects.create(
+            name="Bulk Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.chapter = Chapter.objects.create(
+            volume=self.volume, title="Chapter 1", slug="bulk-chapter-1", position=1
+        )
+
+    def stored(self):
+        return list(self.chapter.chunks.order_by('position').values_list('position', 'content'))
+
+    def count_writes(self, chunks_data):
+        with CaptureQueriesContext(connection) as queries:
+            ChunkManager.write_chunks(self.chapter, chunks_data, 2 * len(chunks_data))
+        return sum(
+            1 for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE')) and 'novels_chunk' in query['sql']
+        )
+
+
+class BulkWriteTests(ChunkWriteTestCase):
+    def test_insert_is_batched(self):
+        self.assertEqual(self.count_writes(chunk_rows(150)), 1)
+        self.assertEqual(self.chapter.chunks.count(), 150)
+        self.assertEqual(self.stored()[-1], (150, "<p>Chunk 150</p>"))
+
+    def test_only_changed_positions_are_rewritten(self):
+        ChunkManager.write_chunks(self.chapter, chunk_rows(5), 10)
+        ids = dict(self.chapter.chunks.values_list('position', 'id'))
+
+        edited = chunk_rows(5)
+        edited[2] = ("<p>Edited</p>", 1)
+        self.assertEqual(self.count_writes(edited), 1)
+
+        self.assertEqual(dict(self.chapter.chunks.values_list('position', 'id')), ids)
+        self.assertEqual(self.stored()[2], (3, "<p>Edited</p>"))
+
+    def test_shrink_and_grow(self):
+        ChunkManager.write_chunks(self.chapter, chunk_rows(5), 10)
+
+        ChunkManager.write_chunks(self.chapter, chunk_rows(2), 4)
+        self.assertEqual([position for position, _ in self.stored()], [1, 2])
+
+        ChunkManager.write_chunks(self.chapter, chunk_rows(4, "New"), 8)
+        self.assertEqual(self.stored(), [(i, f"<p>New {i}</p>") for i in range(1, 5)])
+        self.assertEqual(self.chapter.chunk_count, 4)
+
+    def test_unchanged_rewrite_keeps_content_version(self):
+        ChunkManager.write_chunks(self.chapter, chunk_rows(3), 6)
+        version = self.chapter.content_version
+
+        self.assertEqual(self.count_writes(chunk_rows(3)), 0)
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.content_version, version)
+
+        ChunkManager.write_chunks(self.chapter, chunk_rows(4), 8)
+        self.assertEqual(self.chapter.content_version, version + 1)
+
+
+class BenchmarkChunkWritesCommandTests(ChunkWriteTestCase):
+    def test_benchmark_rolls_back(self):
+        out = StringIO()
+        call_command('benchmark_chunk_writes', '--sizes', '20KB', stdout=out)
+
+        self.assertIn("bulk insert", out.getvalue())
+        self.assertEqual(Novel.objects.count(), 1)
+        self.assertEqual(Chunk.objects.count(), 0)
@@ -0,0 +1,98 @@
+"""
+Unit tests for the chunker benchmark suite
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from novels.utils import HtmlChunker
+from novels.utils.chunker_benchmark import (
+    parse_size, build_corpus, run_benchmarks, find_regressions, CORPUS_BUILDERS
+)
+
+
+class CorpusTests(SimpleTestCase):
+    def test_parse_size(self):
+        self.assertEqual(parse_size("100KB"), 100 * 1024)
+        self.assertEqual(parse_size("1.5mb"), int(1.5 * 1024 * 1024))
+        self.assertEqual(parse_size("500"), 500)
+        with self.assertRaises(ValueError):
+            parse_size("big")
+
+    def test_corpus_is_deterministic_and_sized(self):
+        corpus = build_corpus(["5KB", "20KB"], seed=7)
+
+        self.assertEqual(len(corpus), 2 * len(CORPUS_BUILDERS))
+        self.assertEqual(corpus, build_corpus(["5KB", "20KB"], seed=7))
+        for document in corpus:
+            expected = parse_size(document.name.rsplit('-', 1)[1])
+            self.assertGreaterEqual(len(document.content), expected)
+            self.assertLess(len(document.content), expected + 2048)
+
+    def test_tinymce_documents_chunk_cleanly(self):
+        document = next(doc for doc in build_corpus(["50KB"]) if doc.kind == 'tinymce')
+
+        chunks = HtmlChunker(max_chunk_size=5000).split_into_chunks(document.content)
+
+        self.assertTrue(all(len(chunk) <= 5000 for chunk, _ in chunks))
+        self.assertIn("&nbsp;", document.content)
+
+
+class RunBenchmarksTests(SimpleTestCase):
+    def test_results(self):
+        results = run_benchmarks(build_corpus(["20KB"]), repeat=1)
+
+        self.assertEqual(
+            {(row['target'], row['document']) for row in results},
+            {
+                ('html_chunker', 'synthetic-20KB'), ('html_chunker', 'tinymce-20KB'),
+                ('simple_chunker', 'plain-20KB'),
+                ('count_words', 'plain-20KB'), ('count_words', 'tinymce-20KB'),
+            }
+        )
+        html = next(row for row in results if row['document'] == 'synthetic-20KB')
+        self.assertGreater(html['throughput'], 0)
+        self.assertGreater(html['peak_memory_kb'], 0)
+        self.assertEqual(html['chunks'], 3)
+        self.assertLessEqual(html['chunk_sizes']['max'], 10000)
+
+    def test_find_regressions(self):
+        baseline = [{'target': 'html_chunker', 'document': 'tinymce-1MB', 'throughput': 10.0}]
+
+        self.assertEqual(find_regressions(
+            [{'target': 'html_chunker', 'document': 'tinymce-1MB', 'throughput': 8.0}], baseline, 0.25
+        ), [])
+        regressions = find_regressions(
+            [{'target': 'html_chunker', 'document': 'tinymce-1MB', 'throughput': 7.0}], baseline, 0.25
+        )
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("-30%", regressions[0])
+
+
+class BenchmarkChunkersCommandTests(SimpleTestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_save_and_compare(self):
+        options = ['--sizes', '10KB', '--target', 'count_words', '--repeat', '1']
+        call_command('benchmark_chunkers', *options, '--save', self.path, stdout=StringIO())
+
+        with open(self.path) as f:
+            baseline = json.load(f)
+        self.assertEqual(len(baseline), 2)
+
+        for row in baseline:
+            row['throughput'] *= 1000
+        with open(self.path, 'w') as f:
+            json.dump(baseline, f)
+
+        with self.assertRaisesMessage(CommandError, "Throughput regressed"):
+            call_command('benchmark_chunkers', *options, '--baseline', self.path, stdout=StringIO())
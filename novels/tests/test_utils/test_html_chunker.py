@@ -0,0 +1,103 @@
+"""
+Unit tests for the single-pass HTML chunker
+"""
+from django.test import SimpleTestCase
+
+from novels.utils import HtmlChunker
+from novels.utils.html_chunker import WordCounter
+from novels.utils.helpers import count_words
+
+
+class WordCounterTests(SimpleTestCase):
+    def test_matches_split_across_pieces(self):
+        text = "  Một ngày kia,  anh ấy\nđi xa  "
+        for cut in range(len(text) + 1):
+            counter = WordCounter()
+            counter.feed(text[:cut])
+            counter.feed(text[cut:])
+            self.assertEqual(counter.count, count_words(text), cut)
+
+
+class HtmlChunkerTests(SimpleTestCase):
+    def test_groups_top_level_blocks_up_to_max_size(self):
+        paragraphs = [f"<p>{'word ' * 4}{i}</p>" for i in range(6)]
+        size = len(paragraphs[0])
+        chunker = HtmlChunker(max_chunk_size=size * 2)
+
+        chunks = chunker.split_into_chunks(''.join(paragraphs))
+
+        self.assertEqual([chunk for chunk, _ in chunks], [
+            paragraphs[0] + paragraphs[1],
+            paragraphs[2] + paragraphs[3],
+            paragraphs[4] + paragraphs[5],
+        ])
+        # "...4</p><p>word..." reads as one word, as with get_text()
+        self.assertEqual([words for _, words in chunks], [9, 9, 9])
+
+    def test_chunks_are_source_slices(self):
+        content = '<p style="text-align: center;">Tiêu&nbsp;đề<br>mới</p>\n<p>Đoạn &amp; văn</p>'
+
+        chunks, total = HtmlChunker().split_with_word_count(content)
+
+        self.assertEqual(chunks, [(
+            '<p style="text-align: center;">Tiêu&nbsp;đề<br>mới</p> <p>Đoạn &amp; văn</p>', 5
+        )])
+        self.assertEqual(total, 5)
+
+    def test_total_counts_words_split_across_chunks(self):
+        content = "<p>one two</p><p>three</p><p>four</p>"
+        chunker = HtmlChunker(max_chunk_size=len("<p>one two</p>"))
+
+        chunks, total = chunker.split_with_word_count(content)
+
+        self.assertEqual([words for _, words in chunks], [2, 1, 1])
+        # Like get_text(): adjacent paragraphs without whitespace run together
+        self.assertEqual(total, 2)
+
+    def test_scripts_and_comments_are_not_words(self):
+        content = "<p>real words</p><script>var x = 1;</script><!-- a note --><style>p {}</style>"
+
+        chunks, total = HtmlChunker().split_with_word_count(content)
+
+        self.assertEqual(chunks, [(content, 2)])
+        self.assertEqual(total, 2)
+
+    def test_oversize_paragraph_is_split_by_words(self):
+        content = "<p>" + "word " * 100 + "</p>"
+        chunker = HtmlChunker(max_chunk_size=100)
+
+        chunks = chunker.split_into_chunks(content)
+
+        self.assertTrue(all(len(chunk) <= 100 for chunk, _ in chunks))
+        self.assertTrue(all(chunk.startswith("<p>") for chunk, _ in chunks))
+        self.assertEqual(sum(words for _, words in chunks), 100)
+
+    def test_oversize_container_is_split_by_children(self):
+        paragraphs = [f"<p>{'word ' * 8}{i}</p>" for i in range(4)]
+        content = '<div class="chapter">' + ''.join(paragraphs) + '</div>'
+        chunker = HtmlChunker(max_chunk_size=len(paragraphs[0]) * 2)
+
+        chunks = chunker.split_into_chunks(content)
+
+        self.assertEqual([chunk for chunk, _ in chunks], [
+            paragraphs[0] + paragraphs[1],
+            paragraphs[2] + paragraphs[3],
+        ])
+
+    def test_top_level_text_and_unclosed_tags(self):
+        content = "intro text <p>first <p>nested</p> tail"
+
+        chunks, total = HtmlChunker().split_with_word_count(content)
+
+        self.assertEqual(chunks, [(content, 5)])
+        self.assertEqual(total, 5)
+
+    def test_iter_chunks_matches_split(self):
+        content = ''.join(f"<p>{'từ ' * 50}{i}</p>" for i in range(200))
+        chunker = HtmlChunker(max_chunk_size=1000)
+
+        self.assertEqual(list(chunker.iter_chunks(content)), chunker.split_into_chunks(content))
+
+    def test_empty_content(self):
+        self.assertEqual(HtmlChunker().split_with_word_count("  "), ([], 0))
+        self.assertEqual(HtmlChunker().split_into_chunks("<p> </p>"), [])
@@ -0,0 +1,106 @@
+"""
+Unit tests for the buffered view count pipeline
+"""
+from unittest.mock import patch
+
+from django.db import connection, DatabaseError
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from common.utils.view_counter import ViewCountBuffer
+from novels.models import Novel
+from constants import ApprovalStatus
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+
+class ViewCountBufferTests(TestCase):
+    def setUp(self):
+        self.novel = Novel.objects.create(
+            name="Viewed Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value,
+            view_count=5
+        )
+        self.other_novel = Novel.objects.create(
+            name="Other Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.buffer = ViewCountBuffer(dedup_seconds=60, max_pending=10)
+
+    def test_flush_applies_aggregated_increments(self):
+        for _ in range(3):
+            self.buffer.record(Novel, self.novel.id)
+        self.buffer.record(Novel, self.other_novel.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            flushed = self.buffer.flush()
+
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(flushed, 4)
+        self.novel.refresh_from_db()
+        self.other_novel.refresh_from_db()
+        self.assertEqual(self.novel.view_count, 8)
+        self.assertEqual(self.other_novel.view_count, 1)
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_same_viewer_is_deduplicated(self):
+        self.assertTrue(self.buffer.record(Novel, self.novel.id, "u:1"))
+        self.assertFalse(self.buffer.record(Novel, self.novel.id, "u:1"))
+        self.assertTrue(self.buffer.record(Novel, self.novel.id, "u:2"))
+
+        self.buffer.flush()
+        self.novel.refresh_from_db()
+        self.assertEqual(self.novel.view_count, 7)
+        self.assertEqual(self.buffer.metrics()['deduplicated'], 1)
+
+    def test_dedup_memory_is_capped(self):
+        buffer = ViewCountBuffer(dedup_seconds=60, max_pending=10, max_seen=2)
+        for viewer_key in ("u:1", "u:2", "u:3"):
+            buffer.record(Novel, self.novel.id, viewer_key)
+
+        self.assertEqual(len(buffer._seen), 2)
+        # The oldest viewer was forgotten and counts again
+        self.assertTrue(buffer.record(Novel, self.novel.id, "u:1"))
+        self.assertFalse(buffer.record(Novel, self.novel.id, "u:3"))
+
+    def test_failed_flush_requeues_increments(self):
+        self.buffer.record(Novel, self.novel.id)
+        self.buffer.record(Novel, self.novel.id)
+
+        with patch.object(ViewCountBuffer, '_apply', side_effect=DatabaseError("locked")):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.metrics()['pending'], 2)
+        self.assertEqual(self.buffer.metrics()['dropped'], 0)
+
+        self.assertEqual(self.buffer.flush(), 2)
+        self.novel.refresh_from_db()
+        self.assertEqual(self.novel.view_count, 7)
+
+    def test_full_buffer_drops_increments(self):
+        buffer = ViewCountBuffer(max_pending=1)
+        self.assertTrue(buffer.record(Novel, self.novel.id))
+        self.assertFalse(buffer.record(Novel, self.other_novel.id))
+
+        metrics = buffer.metrics()
+        self.assertEqual(metrics['dropped'], 1)
+        self.assertEqual(metrics['pending'], 1)
+
+    def test_flush_metrics(self):
+        self.buffer.record(Novel, self.novel.id)
+        self.buffer.flush()
+
+        metrics = self.buffer.metrics()
+        self.assertEqual(metrics['flush_count'], 1)
+        self.assertEqual(metrics['flushed'], 1)
+        self.assertGreaterEqual(metrics['max_flush_seconds'], metrics['last_flush_seconds'])
+
+    def test_shutdown_flushes_remaining_views(self):
+        self.buffer.record(Novel, self.novel.id)
+        self.buffer.shutdown()
+
+        self.novel.refresh_from_db()
+        self.assertEqual(self.novel.view_count, 6)
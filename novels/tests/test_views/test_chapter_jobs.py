@@ -0,0 +1,231 @@
+"""
+Unit tests for the chapter job queue and the process_chapter_jobs worker
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase
+from django.utils import timezone
+
+from interactions.models.notification import Notification
+from novels.models import Novel, Volume, Chapter, ChapterJob, Favorite
+from novels.services import ChapterJobService, ChapterService
+from constants import (
+    ApprovalStatus,
+    UserRole,
+    CHAPTER_JOB_MAX_ATTEMPTS,
+    CHAPTER_JOB_LOCK_TIMEOUT,
+    ChapterJobKind,
+    ChapterJobStatus,
+    ChapterProcessingStatus,
+)
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+User = get_user_model()
+
+CONTENT = "<p>one two three</p>\n<p>four five</p>"
+
+
+class ChapterJobTestCase(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username='author', email='author@example.com', password='password123',
+            role=UserRole.USER.value
+        )
+        self.novel = Novel.objects.create(
+            name="Job Novel",
+            summary="Summary",
+            created_by=self.author,
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.chapter = Chapter.objects.create(volume=self.volume, title="Chapter 1", position=1)
+
+    def job_status(self, job):
+        job.refresh_from_db()
+        return job.status
+
+
+class ProcessJobTests(ChapterJobTestCase):
+    def test_worker_chunks_queued_content(self):
+        job = ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+        self.assertEqual(self.chapter.processing_status, ChapterProcessingStatus.QUEUED.value)
+
+        result = ChapterJobService.run_pending()
+
+        self.assertEqual(result, {'claimed': 1, 'done': 1, 'failed': 0})
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.processing_status, ChapterProcessingStatus.READY.value)
+        self.assertEqual(self.chapter.word_count, 5)
+        self.assertEqual(self.chapter.chunk_count, 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ChapterJobStatus.DONE.value)
+        self.assertEqual(job.content, '')
+        self.assertIsNotNone(job.finished_at)
+
+    def test_pending_job_is_reused(self):
+        first = ChapterJobService.enqueue_processing(self.chapter, "<p>old</p>")
+        second = ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(ChapterJob.objects.count(), 1)
+        ChapterJobService.run_pending()
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.word_count, 5)
+
+    def test_reprocessing_is_idempotent(self):
+        ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+        ChapterJobService.run_pending()
+        self.chapter.refresh_from_db()
+        version = self.chapter.content_version
+
+        # No content: re-chunk what is stored
+        ChapterJobService.enqueue_processing(self.chapter)
+        ChapterJobService.run_pending()
+
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.content_version, version)
+        self.assertEqual(self.chapter.chunks.count(), 1)
+        self.assertEqual(self.chapter.word_count, 5)
+
+    def test_superseded_job_is_skipped(self):
+        older = ChapterJob.objects.create(
+            chapter=self.chapter, kind=ChapterJobKind.PROCESS.value, content="<p>old</p>",
+            status=ChapterJobStatus.RUNNING.value, locked_at=timezone.now()
+        )
+        ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+
+        older.refresh_from_db()
+        self.assertTrue(ChapterJobService.run(older))
+        self.assertEqual(self.chapter.chunks.count(), 0)
+
+    def test_failure_is_retried_with_backoff(self):
+        job = ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+
+        with patch('novels.services.chapter_job_service.ChunkManager.create_html_chunks_for_chapter',
+                   side_effect=RuntimeError("boom")), \
+                self.assertLogs('novels.services.chapter_job_service', level='ERROR'):
+            result = ChapterJobService.run_pending()
+
+        self.assertEqual(result['failed'], 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ChapterJobStatus.PENDING.value)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.last_error, "RuntimeError: boom")
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertEqual(job.content, CONTENT)
+        # Not due yet
+        self.assertEqual(ChapterJobService.run_pending()['claimed'], 0)
+
+        ChapterJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        ChapterJobService.run_pending()
+        self.assertEqual(self.job_status(job), ChapterJobStatus.DONE.value)
+
+    def test_job_fails_after_max_attempts(self):
+        job = ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+        ChapterJob.objects.filter(pk=job.pk).update(attempts=CHAPTER_JOB_MAX_ATTEMPTS - 1)
+
+        with patch('novels.services.chapter_job_service.ChunkManager.create_html_chunks_for_chapter',
+                   side_effect=RuntimeError("boom")), \
+                self.assertLogs('novels.services.chapter_job_service', level='ERROR'):
+            ChapterJobService.run_pending()
+
+        self.assertEqual(self.job_status(job), ChapterJobStatus.FAILED.value)
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.processing_status, ChapterProcessingStatus.FAILED.value)
+
+        self.assertEqual(ChapterJobService.retry_failed(), 1)
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.processing_status, ChapterProcessingStatus.QUEUED.value)
+        ChapterJobService.run_pending()
+        self.assertEqual(self.job_status(job), ChapterJobStatus.DONE.value)
+
+    def test_abandoned_running_job_is_reclaimed(self):
+        job = ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+        self.assertEqual(len(ChapterJobService.claim()), 1)
+        # Still locked by the first worker
+        self.assertEqual(ChapterJobService.claim(), [])
+
+        stale = timezone.now() - timedelta(seconds=CHAPTER_JOB_LOCK_TIMEOUT + 1)
+        ChapterJob.objects.filter(pk=job.pk).update(locked_at=stale)
+        claimed = ChapterJobService.claim()
+
+        self.assertEqual([claimed_job.pk for claimed_job in claimed], [job.pk])
+        self.assertEqual(claimed[0].attempts, 2)
+
+
+class NotifyJobTests(ChapterJobTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reader = User.objects.create_user(
+            username='reader', email='reader@example.com', password='password123',
+            role=UserRole.USER.value
+        )
+        Favorite.objects.create(user=self.reader, novel=self.novel)
+        ChapterService.approve_chapter(self.chapter)
+
+    @patch('interactions.services.notification_service.send_notifications')
+    def test_notification_is_sent_once(self, mock_send):
+        ChapterJobService.enqueue_approved_notification(self.chapter)
+        ChapterJobService.run_pending()
+        ChapterJobService.enqueue_approved_notification(self.chapter)
+        ChapterJobService.run_pending()
+
+        self.assertEqual(Notification.objects.filter(user=self.reader, object_id=self.chapter.id).count(), 1)
+        self.assertEqual(mock_send.call_count, 1)
+
+
+class ChapterJobVisibilityTests(ChapterJobTestCase):
+    def render_label(self):
+        self.chapter.refresh_from_db()
+        return Template("{% load status_filters %}{{ chapter|chapter_status_label }}").render(
+            Context({'chapter': self.chapter})
+        )
+
+    def test_author_sees_processing_state(self):
+        ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+        self.assertEqual(self.render_label(), "Đang xử lý")
+
+        Chapter.objects.filter(pk=self.chapter.pk).update(
+            processing_status=ChapterProcessingStatus.FAILED.value
+        )
+        self.assertEqual(self.render_label(), "Xử lý lỗi")
+
+        Chapter.objects.filter(pk=self.chapter.pk).update(
+            processing_status=ChapterProcessingStatus.READY.value
+        )
+        self.assertEqual(self.render_label(), "Chờ duyệt")
+
+    def test_unprocessed_chapters_are_not_in_admin_queue(self):
+        ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+
+        self.assertIsNone(ChapterService.get_earliest_unapproved_chapter())
+        self.assertEqual(len(ChapterService.get_pending_chapters_for_admin()), 0)
+
+        ChapterJobService.run_pending()
+        self.assertEqual(ChapterService.get_earliest_unapproved_chapter(), self.chapter)
+
+
+class ProcessChapterJobsCommandTests(ChapterJobTestCase):
+    def test_command_runs_due_jobs(self):
+        ChapterJobService.enqueue_processing(self.chapter, CONTENT)
+        out = StringIO()
+
+        call_command('process_chapter_jobs', '--batch-size', '1', stdout=out)
+
+        self.assertIn("Ran 1 chapter jobs", out.getvalue())
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.word_count, 5)
+
+    @patch('novels.management.commands.process_chapter_jobs.time.sleep', side_effect=KeyboardInterrupt)
+    @patch('novels.management.commands.process_chapter_jobs.close_old_connections')
+    def test_loop_recycles_connections_between_polls(self, close_old_connections, sleep):
+        with self.assertRaises(KeyboardInterrupt):
+            call_command('process_chapter_jobs', '--loop', stdout=StringIO())
+
+        close_old_connections.assert_called_once()
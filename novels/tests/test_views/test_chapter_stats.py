@@ -0,0 +1,105 @@
+"""
+Unit tests for the chunk statistics stored on chapters
+"""
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from novels.models import Novel, Volume, Chapter, Chunk
+from novels.utils import ChunkManager
+from constants import ApprovalStatus, WORDS_PER_MINUTE
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+
+class ChapterStatsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.novel = Novel.objects.create(
+            name="Stats Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.chapter = Chapter.objects.create(
+            volume=self.volume, title="Chapter 1", slug="stats-chapter-1", position=1, approved=True
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+
+class ChunkingStoresStatsTests(ChapterStatsTestCase):
+    def test_normal_chunking(self):
+        content = "\n\n".join(" ".join(["word"] * 10) for _ in range(3))
+        ChunkManager.create_normal_chunks_for_chapter(self.chapter, content)
+
+        self.chapter.refresh_from_db()
+        chunks = list(self.chapter.chunks.order_by('position'))
+        word_counts = [chunk.word_count for chunk in chunks]
+        self.assertEqual(self.chapter.chunk_count, len(chunks))
+        self.assertEqual(self.chapter.avg_chunk_words, sum(word_counts) / len(word_counts))
+        self.assertEqual(self.chapter.max_chunk_words, max(word_counts))
+        self.assertEqual(self.chapter.char_count, sum(len(chunk.content) for chunk in chunks))
+        self.assertEqual(self.chapter.reading_minutes, 30 / WORDS_PER_MINUTE)
+
+    def test_html_chunking(self):
+        ChunkManager.create_html_chunks_for_chapter(self.chapter, "<p>one two three</p><p>four five</p>")
+
+        self.chapter.refresh_from_db()
+        chunks = list(self.chapter.chunks.all())
+        self.assertEqual(self.chapter.chunk_count, len(chunks))
+        self.assertEqual(self.chapter.char_count, sum(len(chunk.content) for chunk in chunks))
+        self.assertEqual(self.chapter.reading_minutes, self.chapter.word_count / WORDS_PER_MINUTE)
+
+
+class BackfillChapterStatsTests(ChapterStatsTestCase):
+    def setUp(self):
+        super().setUp()
+        for position, words in enumerate([10, 30, 20], 1):
+            Chunk.objects.create(
+                chapter=self.chapter, position=position, content="x" * words, word_count=words
+            )
+        Chapter.objects.filter(pk=self.chapter.pk).update(word_count=60)
+
+    def test_backfill_command(self):
+        out = StringIO()
+        call_command('backfill_chapter_stats', stdout=out)
+
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.chunk_count, 3)
+        self.assertEqual(self.chapter.avg_chunk_words, 20)
+        self.assertEqual(self.chapter.max_chunk_words, 30)
+        self.assertEqual(self.chapter.char_count, 60)
+        self.assertEqual(self.chapter.reading_minutes, 60 / WORDS_PER_MINUTE)
+        self.assertIn("1 of 1 chapters", out.getvalue())
+
+        # Chapters with stored statistics are skipped unless --all is given
+        out = StringIO()
+        call_command('backfill_chapter_stats', stdout=out)
+        self.assertIn("0 of 0 chapters", out.getvalue())
+        call_command('backfill_chapter_stats', '--all', stdout=out)
+        self.assertIn("0 of 1 chapters", out.getvalue())
+
+    def test_chapter_detail_reads_stored_stats(self):
+        ChunkManager.refresh_chunk_stats([self.chapter.pk])
+        url = reverse('novels:chapter_detail', kwargs={
+            'novel_slug': self.novel.slug,
+            'chapter_slug': self.chapter.slug
+        })
+        self.client.get(url)  # Warm the chunk cache
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertFalse([q for q in queries.captured_queries if 'novels_chunk' in q['sql']])
+
+        self.assertEqual(response.context['avg_chunk_size'], 20)
+        self.assertEqual(response.context['max_chunk_words'], 30)
+        self.assertEqual(response.context['char_count'], 60)
+        self.assertEqual(response.context['estimated_reading_time'], 60 / WORDS_PER_MINUTE)
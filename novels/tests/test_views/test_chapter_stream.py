@@ -0,0 +1,129 @@
+"""
+Unit tests for the streaming chapter renderer
+"""
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from novels.models import Novel, Volume, Chapter, Chunk
+from novels.utils import ChunkManager
+from constants import ApprovalStatus, UserRole, CHUNK_STREAM_MARKER, CHAPTER_STREAM_MODE
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+User = get_user_model()
+
+
+class ChapterStreamTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.novel = Novel.objects.create(
+            name="Streamed Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.chapter = Chapter.objects.create(
+            volume=self.volume, title="Chapter 1", slug="streamed-chapter-1", position=1
+        )
+        for position in range(1, 13):
+            Chunk.objects.create(
+                chapter=self.chapter, position=position, content=f"<p>Part {position}</p>"
+            )
+        # Chunks written directly: store their statistics as ChunkManager would
+        ChunkManager.refresh_chunk_stats([self.chapter.id])
+        self.chapter.refresh_from_db()
+
+    def tearDown(self):
+        cache.clear()
+
+    def read_stream(self, response):
+        self.assertIsInstance(response, StreamingHttpResponse)
+        parts = [part.decode() for part in response.streaming_content]
+        return parts, ''.join(parts)
+
+
+class ReaderStreamTests(ChapterStreamTestCase):
+    def setUp(self):
+        super().setUp()
+        self.chapter.approved = True
+        self.chapter.save()
+        self.url = reverse('novels:chapter_detail', kwargs={
+            'novel_slug': self.novel.slug,
+            'chapter_slug': self.chapter.slug
+        })
+
+    def test_stream_mode_writes_every_chunk_in_order(self):
+        response = self.client.get(self.url, {'mode': CHAPTER_STREAM_MODE})
+        parts, page = self.read_stream(response)
+
+        positions = [page.index(f"<p>Part {i}</p>") for i in range(1, 13)]
+        self.assertEqual(positions, sorted(positions))
+        self.assertNotIn(CHUNK_STREAM_MARKER, page)
+        # Page head, one part per chunk, page tail
+        self.assertEqual(len(parts), 14)
+        self.assertEqual(response['X-Accel-Buffering'], 'no')
+
+    def test_stream_mode_disables_lazy_loading(self):
+        response = self.client.get(self.url, {'mode': CHAPTER_STREAM_MODE})
+        _, page = self.read_stream(response)
+
+        self.assertIn("totalChunks: 12", page)
+        self.assertIn("loadedChunks: 12", page)
+
+    def test_stream_mode_skips_chunk_cache(self):
+        with patch('novels.views.public.chapter_view.ChunkCacheService.get_chapter_content') as get_content:
+            response = self.client.get(self.url, {'mode': CHAPTER_STREAM_MODE})
+            self.read_stream(response)
+
+        get_content.assert_not_called()
+
+    def test_default_mode_is_paged(self):
+        response = self.client.get(self.url)
+
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+        self.assertContains(response, "<p>Part 5</p>")
+        self.assertNotContains(response, "<p>Part 6</p>")
+
+    async def test_stream_mode_under_asgi_is_async(self):
+        response = await self.async_client.get(self.url, {'mode': CHAPTER_STREAM_MODE})
+
+        self.assertTrue(response.is_async)
+        parts = [part.decode() async for part in response.streaming_content]
+        page = ''.join(parts)
+        self.assertEqual(len(parts), 14)
+        self.assertLess(page.index("<p>Part 1</p>"), page.index("<p>Part 12</p>"))
+
+
+class AdminReviewStreamTests(ChapterStreamTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user(
+            username='reviewer',
+            email='reviewer@example.com',
+            password='password123',
+            role=UserRole.WEBSITE_ADMIN.value
+        )
+        self.client.login(email='reviewer@example.com', password='password123')
+
+    def test_review_page_streams_chunks(self):
+        response = self.client.get(
+            reverse('admin:chapter_review', kwargs={'chapter_slug': self.chapter.slug})
+        )
+        _, page = self.read_stream(response)
+
+        self.assertIn("<p>Part 1</p>", page)
+        self.assertIn("<p>Part 12</p>", page)
+        self.assertLess(page.index("<p>Part 1</p>"), page.index("<p>Part 12</p>"))
+
+
+class ChapterContentTests(ChapterStreamTestCase):
+    def test_get_content_joins_streamed_chunks(self):
+        content = self.chapter.get_content()
+        self.assertTrue(content.startswith("<p>Part 1</p>\n<p>Part 2</p>"))
+        self.assertTrue(content.endswith("<p>Part 12</p>"))
@@ -0,0 +1,173 @@
+"""
+Unit tests for the cached chapter table of contents (navigation, sidebar and novel detail)
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from novels.models import Novel, Volume, Chapter
+from novels.services import ChapterService, ChapterTocService
+from constants import ApprovalStatus, UserRole
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+User = get_user_model()
+
+
+class ChapterTocTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123',
+            role=UserRole.USER.value
+        )
+        self.novel = Novel.objects.create(
+            name="Toc Novel",
+            summary="Summary",
+            created_by=self.owner,
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume1 = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.volume2 = Volume.objects.create(novel=self.novel, name="Volume 2", position=2)
+        self.ch1 = self.chapter(self.volume1, 1)
+        self.ch2 = self.chapter(self.volume1, 2)
+        self.pending = self.chapter(self.volume1, 3, approved=False)
+        self.ch3 = self.chapter(self.volume2, 1)
+
+    def tearDown(self):
+        cache.clear()
+
+    def chapter(self, volume, position, approved=True):
+        return Chapter.objects.create(
+            volume=volume, title=f"{volume.name} / {position}", position=position, approved=approved
+        )
+
+    def toc_ids(self):
+        return [entry['id'] for entry in ChapterTocService.get_chapters(self.novel.id)]
+
+    def navigation_ids(self, chapter):
+        navigation = ChapterService.get_chapter_navigation(chapter)
+        return tuple(entry and entry['id'] for entry in (navigation['prev_chapter'], navigation['next_chapter']))
+
+
+class ChapterTocTests(ChapterTocTestCase):
+    def test_visible_chapters_in_reading_order(self):
+        self.assertEqual(self.toc_ids(), [self.ch1.id, self.ch2.id, self.ch3.id])
+        entry = ChapterTocService.get_chapters(self.novel.id)[2]
+        self.assertEqual(entry['volume']['name'], "Volume 2")
+        self.assertEqual(entry['slug'], self.ch3.slug)
+
+    def test_navigation_crosses_volumes(self):
+        self.assertEqual(self.navigation_ids(self.ch1), (None, self.ch2.id))
+        self.assertEqual(self.navigation_ids(self.ch2), (self.ch1.id, self.ch3.id))
+        self.assertEqual(self.navigation_ids(self.ch3), (self.ch2.id, None))
+        # A chapter outside the TOC is placed by its position
+        self.assertEqual(self.navigation_ids(self.pending), (self.ch2.id, self.ch3.id))
+
+    def test_warm_navigation_does_not_query_database(self):
+        ChapterTocService.get_toc(self.novel.id)
+        chapter = Chapter.objects.select_related('volume').get(pk=self.ch2.pk)
+        with self.assertNumQueries(0):
+            self.navigation_ids(chapter)
+            ChapterTocService.get_chapters(self.novel.id)
+
+    def test_changes_invalidate_toc(self):
+        self.toc_ids()
+
+        ChapterService.approve_chapter(self.pending)
+        self.assertEqual(self.toc_ids(), [self.ch1.id, self.ch2.id, self.pending.id, self.ch3.id])
+
+        ChapterService.set_chapter_hidden(self.ch2, True)
+        self.assertEqual(self.toc_ids(), [self.ch1.id, self.pending.id, self.ch3.id])
+
+        ChapterService.soft_delete_chapter(self.pending)
+        self.assertEqual(self.toc_ids(), [self.ch1.id, self.ch3.id])
+
+        self.volume1.position = 3
+        self.volume1.save()
+        self.assertEqual(self.toc_ids(), [self.ch3.id, self.ch1.id])
+
+        self.ch3.delete()
+        self.assertEqual(self.toc_ids(), [self.ch1.id])
+
+    def test_stats_updates_keep_toc(self):
+        toc = ChapterTocService.get_toc(self.novel.id)
+        self.ch1.word_count = 10
+        self.ch1.save(update_fields=['word_count'])
+        self.assertEqual(ChapterTocService.get_toc(self.novel.id)['version'], toc['version'])
+
+    def test_stale_toc_is_not_served_after_eviction(self):
+        toc = ChapterTocService.get_toc(self.novel.id)
+        cache.delete(ChapterTocService._version_key(self.novel.id))
+        ChapterService.set_chapter_hidden(self.ch1, True)
+
+        self.assertNotEqual(ChapterTocService.get_toc(self.novel.id)['version'], toc['version'])
+        self.assertEqual(self.toc_ids(), [self.ch2.id, self.ch3.id])
+
+
+class ChapterDetailSidebarTests(ChapterTocTestCase):
+    def url(self, chapter):
+        return reverse('novels:chapter_detail', kwargs={
+            'novel_slug': self.novel.slug, 'chapter_slug': chapter.slug
+        })
+
+    def test_reader_sidebar_and_navigation_come_from_toc(self):
+        response = self.client.get(self.url(self.ch2))
+
+        self.assertEqual([entry['id'] for entry in response.context['all_chapters']],
+                         [self.ch1.id, self.ch2.id, self.ch3.id])
+        self.assertEqual(response.context['prev_chapter']['id'], self.ch1.id)
+        self.assertEqual(response.context['next_chapter']['id'], self.ch3.id)
+        self.assertContains(response, "Volume 2 - Volume 2 / 1")
+
+    def test_owner_sidebar_lists_unapproved_chapters(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(self.url(self.ch2))
+
+        self.assertIn(self.pending, list(response.context['all_chapters']))
+
+
+class NovelDetailTocTests(ChapterTocTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('novels:novel_detail', kwargs={'novel_slug': self.novel.slug})
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_reader_sees_cached_visible_chapters(self):
+        response = self.client.get(self.url)
+
+        volumes = response.context['volumes']
+        self.assertEqual([volume['name'] for volume in volumes], ["Volume 1", "Volume 2"])
+        self.assertEqual([entry['id'] for entry in volumes[0]['chapter_list']], [self.ch1.id, self.ch2.id])
+        self.assertContains(response, self.ch3.title)
+        self.assertNotContains(response, self.pending.title)
+
+    def test_query_count_does_not_grow_with_volumes(self):
+        self.client.get(self.url)
+        baseline = self.count_queries()
+
+        for position in range(3, 8):
+            self.chapter(Volume.objects.create(novel=self.novel, name=f"Volume {position}", position=position), 1)
+        self.client.get(self.url)
+
+        self.assertEqual(self.count_queries(), baseline)
+
+    def test_owner_sees_all_chapters(self):
+        self.client.force_login(self.owner)
+        self.client.get(self.url)
+        baseline = self.count_queries()
+        Volume.objects.create(novel=self.novel, name="Volume 3", position=3)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['volumes'][0].chapter_list, [self.ch1, self.ch2, self.pending])
+        self.assertContains(response, self.pending.title)
+        self.assertEqual(self.count_queries(), baseline)
@@ -0,0 +1,198 @@
+"""
+Unit tests for the chunk delivery cache
+"""
+import gzip
+import json
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from common.utils.keyset import encode_cursor
+from novels.models import Novel, Volume, Chapter, Chunk
+from novels.services import ChapterService, ChunkCacheService
+from novels.utils import ChunkManager
+from constants import ApprovalStatus, CHUNK_RESPONSE_MAX_AGE, MAX_CHUNK_WINDOW_LIMIT
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+
+class ChunkCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.novel = Novel.objects.create(
+            name="Cached Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.chapter = Chapter.objects.create(
+            volume=self.volume, title="Chapter 1", slug="cached-chapter-1", position=1, approved=True
+        )
+        for position in range(1, 8):
+            Chunk.objects.create(
+                chapter=self.chapter, position=position,
+                content=f"<p>Chunk {position}</p>", word_count=position * 10
+            )
+        # Chunks written directly: store their statistics as ChunkManager would
+        ChunkManager.refresh_chunk_stats([self.chapter.id])
+        self.chapter.refresh_from_db()
+        self.url = reverse('novels:load_more_chunks', kwargs={'chapter_id': self.chapter.id})
+
+    def tearDown(self):
+        cache.clear()
+
+
+class LoadMoreChunksTests(ChunkCacheTestCase):
+    def test_window_and_has_more(self):
+        data = self.client.get(self.url, {'start': 3, 'limit': 3}).json()
+
+        self.assertEqual([chunk['position'] for chunk in data['chunks']], [3, 4, 5])
+        self.assertTrue(data['has_more'])
+        self.assertEqual(data['next_start'], 6)
+
+        data = self.client.get(self.url, {'start': 6, 'limit': 3}).json()
+        self.assertEqual([chunk['position'] for chunk in data['chunks']], [6, 7])
+        self.assertFalse(data['has_more'])
+
+    def test_next_cursor_walks_windows(self):
+        data = self.client.get(self.url, {'limit': 3}).json()
+        positions = [chunk['position'] for chunk in data['chunks']]
+        while data['next_cursor']:
+            data = self.client.get(self.url, {'cursor': data['next_cursor'], 'limit': 3}).json()
+            positions += [chunk['position'] for chunk in data['chunks']]
+
+        self.assertEqual(positions, list(range(1, 8)))
+        self.assertFalse(data['has_more'])
+
+    def test_limit_is_bounded_and_bad_input_rejected(self):
+        Chunk.objects.bulk_create(
+            Chunk(chapter=self.chapter, position=position, content="<p>More</p>", word_count=1)
+            for position in range(8, MAX_CHUNK_WINDOW_LIMIT + 10)
+        )
+        data = self.client.get(self.url, {'start': 1, 'limit': 10 ** 6}).json()
+        self.assertEqual(len(data['chunks']), MAX_CHUNK_WINDOW_LIMIT)
+
+        for params in ({'start': 'x'}, {'limit': 'x'}, {'cursor': 'garbage'}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+    def test_warm_requests_do_not_query_database(self):
+        self.client.get(self.url, {'start': 1, 'limit': 5})
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'start': 6, 'limit': 5})
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_revalidation(self):
+        response = self.client.get(self.url, {'start': 1})
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertIn(f'max-age={CHUNK_RESPONSE_MAX_AGE}', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+
+        response = self.client.get(
+            self.url, {'start': 1}, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_unpublished_chapter_is_private(self):
+        self.chapter.is_hidden = True
+        self.chapter.save()
+
+        response = self.client.get(self.url)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_missing_chapter(self):
+        url = reverse('novels:load_more_chunks', kwargs={'chapter_id': 999999})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class ChunkCacheInvalidationTests(ChunkCacheTestCase):
+    def test_rewrite_bumps_version_and_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        ChunkManager.update_chapter_chunks(self.chapter, "Rewritten content")
+        self.assertEqual(self.chapter.content_version, 2)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['chunks'][0]['content'], "Rewritten content")
+
+    def test_deleted_chapter_is_not_served_from_cache(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        # Chunks restrict the delete: they go first, as in clear_seed_data
+        Chunk.objects.filter(chapter=self.chapter).delete()
+        self.chapter.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_queryset_delete_drops_pointer(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        Chunk.objects.filter(chapter=self.chapter).delete()
+        Chapter.objects.filter(volume=self.volume).delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_cached_content(self):
+        content = ChunkCacheService.get_chapter_content(self.chapter)
+
+        self.assertEqual(content['total_chunks'], 7)
+        self.assertEqual(content['positions'], list(range(1, 8)))
+
+    def test_chapter_detail_uses_cached_chunks(self):
+        url = reverse('novels:chapter_detail', kwargs={
+            'novel_slug': self.novel.slug,
+            'chapter_slug': self.chapter.slug
+        })
+        response = self.client.get(url)
+
+        self.assertEqual(response.context['total_chunks'], 7)
+        self.assertEqual(response.context['loaded_chunks'], 5)
+        self.assertContains(response, "<p>Chunk 5</p>")
+        self.assertNotContains(response, "<p>Chunk 6</p>")
+
+
+class PrecompressedWindowTests(ChunkCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        # Big enough for gzip to pay off
+        Chunk.objects.filter(chapter=self.chapter).update(content="<p>" + "Lorem ipsum dolor. " * 50 + "</p>")
+
+    def test_gzip_is_served_to_clients_that_accept_it(self):
+        response = self.client.get(self.url, {'start': 1}, HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/'))
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual([chunk['position'] for chunk in data['chunks']], [1, 2, 3, 4, 5])
+
+        response = self.client.get(self.url, {'start': 1}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_identity_without_accept_encoding(self):
+        response = self.client.get(self.url, {'start': 1}, HTTP_ACCEPT_ENCODING='gzip;q=0')
+
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(len(response.json()['chunks']), 5)
+
+    def test_negotiate_encoding(self):
+        available = {'identity': b'', 'gzip': b''}
+
+        self.assertEqual(ChunkCacheService.negotiate_encoding('br, gzip', available), 'gzip')
+        self.assertEqual(ChunkCacheService.negotiate_encoding('*', available), 'gzip')
+        self.assertEqual(ChunkCacheService.negotiate_encoding('deflate', available), 'identity')
+        self.assertEqual(ChunkCacheService.negotiate_encoding('', available), 'identity')
+        self.assertEqual(ChunkCacheService.negotiate_encoding('br', {**available, 'br': b''}), 'br')
+
+    def test_approval_warms_reader_windows(self):
+        self.chapter.approved = False
+        self.chapter.save()
+
+        ChapterService.approve_chapter(self.chapter)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.url, {'cursor': encode_cursor([6]), 'limit': 5}, HTTP_ACCEPT_ENCODING='gzip'
+            )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
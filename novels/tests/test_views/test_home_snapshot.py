@@ -0,0 +1,95 @@
+"""
+Unit tests for the precomputed homepage snapshot
+"""
+import time
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from novels.models import Novel, Volume, Chapter
+from novels.services import HomeSnapshotService, LatestChapterService
+from interactions.models import Comment
+from constants import (
+    ApprovalStatus,
+    ProgressStatus,
+    UserRole,
+    HOME_SNAPSHOT_CACHE_KEY,
+    HOME_SNAPSHOT_FRESH_SECONDS,
+)
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+User = get_user_model()
+
+
+class HomeSnapshotTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader',
+            email='reader@example.com',
+            password='password123',
+            role=UserRole.USER.value
+        )
+        self.novel = Novel.objects.create(
+            name="Finished Novel",
+            summary="Finished summary",
+            approval_status=ApprovalStatus.APPROVED.value,
+            progress_status=ProgressStatus.COMPLETED.value,
+            view_count=10,
+        )
+        self.volume = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.chapter = Chapter.objects.create(
+            volume=self.volume, title="Chapter 1", position=1, approved=True
+        )
+        LatestChapterService.refresh(self.novel)
+        Comment.objects.create(novel=self.novel, user=self.user, content="Great read")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_build_snapshot_sections(self):
+        snapshot = HomeSnapshotService.build_snapshot()
+
+        self.assertEqual(snapshot['trend_novels'][0]['slug'], self.novel.slug)
+        self.assertEqual(snapshot['finish_novels'][0]['recent_volume'], {'name': "Volume 1"})
+        self.assertEqual(snapshot['finish_novels'][0]['recent_chapter'], {'title': "Chapter 1"})
+        self.assertEqual(snapshot['newupdate_novels'][0]['slug'], self.novel.slug)
+        self.assertEqual(snapshot['comments'][0]['comment'], "Great read")
+
+    def test_home_served_from_cache(self):
+        url = reverse('novels:home')
+        self.client.get(url)
+        self.assertIsNotNone(cache.get(HOME_SNAPSHOT_CACHE_KEY))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Finished Novel")
+        self.assertContains(response, "Great read")
+
+    @patch.object(HomeSnapshotService, 'schedule_rebuild')
+    def test_change_marks_snapshot_stale(self, mock_schedule):
+        HomeSnapshotService.get_snapshot()
+        mock_schedule.assert_not_called()
+
+        self.novel.name = "Renamed Novel"
+        self.novel.save()
+
+        snapshot = HomeSnapshotService.get_snapshot()
+        mock_schedule.assert_called_once()
+        # The stale snapshot is still served while the rebuild runs
+        self.assertEqual(snapshot['trend_novels'][0]['name'], "Finished Novel")
+
+    @patch.object(HomeSnapshotService, 'schedule_rebuild')
+    def test_expired_snapshot_is_revalidated(self, mock_schedule):
+        snapshot = HomeSnapshotService.rebuild()
+        snapshot['built_at'] = time.time() - HOME_SNAPSHOT_FRESH_SECONDS - 1
+        cache.set(HOME_SNAPSHOT_CACHE_KEY, snapshot)
+
+        HomeSnapshotService.get_snapshot()
+        mock_schedule.assert_called_once()
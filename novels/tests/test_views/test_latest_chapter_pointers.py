@@ -0,0 +1,132 @@
+"""
+Unit tests for the denormalized Novel.latest_chapter pointers
+"""
+from io import StringIO
+from unittest.mock import patch
+from django.contrib import admin
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from novels.admin import ChapterAdmin
+from novels.models import Novel, Volume, Chapter
+from novels.services import ChapterService, LatestChapterService
+from constants import ApprovalStatus, UserRole
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+User = get_user_model()
+
+
+class LatestChapterPointerTestCase(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='password123',
+            role=UserRole.USER.value
+        )
+        self.novel = Novel.objects.create(
+            name="Pointer Novel",
+            summary="Summary",
+            created_by=self.owner,
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume1 = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.volume2 = Volume.objects.create(novel=self.novel, name="Volume 2", position=2)
+        self.chapter1 = Chapter.objects.create(
+            volume=self.volume1, title="Chapter 1", slug="pointer-chapter-1", position=1
+        )
+        self.chapter2 = Chapter.objects.create(
+            volume=self.volume2, title="Chapter 2", slug="pointer-chapter-2", position=1
+        )
+
+    def assertPointer(self, chapter):
+        self.novel.refresh_from_db()
+        self.assertEqual(self.novel.latest_chapter, chapter)
+        self.assertEqual(self.novel.latest_volume, chapter.volume if chapter else None)
+
+
+class LatestChapterServiceTests(LatestChapterPointerTestCase):
+    def test_approve_moves_pointer_forward(self):
+        ChapterService.approve_chapter(self.chapter1)
+        self.assertPointer(self.chapter1)
+
+        ChapterService.approve_chapter(self.chapter2)
+        self.assertPointer(self.chapter2)
+        self.assertEqual(self.novel.latest_chapter_at, self.chapter2.updated_at)
+
+    def test_hide_falls_back_to_previous_chapter(self):
+        ChapterService.approve_chapter(self.chapter1)
+        ChapterService.approve_chapter(self.chapter2)
+
+        ChapterService.set_chapter_hidden(self.chapter2, True)
+        self.assertPointer(self.chapter1)
+
+        ChapterService.set_chapter_hidden(self.chapter2, False)
+        self.assertPointer(self.chapter2)
+
+    def test_reject_clears_pointer(self):
+        ChapterService.approve_chapter(self.chapter1)
+        ChapterService.reject_chapter(self.chapter1, "Bad chapter")
+        self.assertPointer(None)
+        self.assertIsNone(self.novel.latest_chapter_at)
+
+    def test_pointer_update_keeps_novel_updated_at(self):
+        updated_at = Novel.objects.get(pk=self.novel.pk).updated_at
+        ChapterService.approve_chapter(self.chapter1)
+        self.novel.refresh_from_db()
+        self.assertEqual(self.novel.updated_at, updated_at)
+
+
+class LatestChapterDeleteViewTests(LatestChapterPointerTestCase):
+    def test_delete_view_recomputes_pointer(self):
+        ChapterService.approve_chapter(self.chapter1)
+        ChapterService.approve_chapter(self.chapter2)
+        self.client.login(username='owner@example.com', password='password123')
+
+        url = reverse('novels:chapter_delete', kwargs={
+            'novel_slug': self.novel.slug,
+            'chapter_slug': self.chapter2.slug
+        })
+        self.client.post(url)
+
+        self.assertPointer(self.chapter1)
+
+
+@patch('novels.admin.messages')
+class ChapterAdminActionTests(LatestChapterPointerTestCase):
+    def setUp(self):
+        super().setUp()
+        ChapterService.approve_chapter(self.chapter1)
+        ChapterService.approve_chapter(self.chapter2)
+        self.model_admin = ChapterAdmin(Chapter, admin.site)
+        self.selected = Chapter.objects.filter(pk=self.chapter2.pk)
+
+    def test_soft_delete_and_restore_move_pointer(self, messages):
+        self.model_admin.soft_delete_chapters(None, self.selected)
+        self.assertPointer(self.chapter1)
+
+        self.model_admin.restore_chapters(None, self.selected)
+        self.assertPointer(self.chapter2)
+
+    def test_hide_and_unhide_move_pointer(self, messages):
+        self.model_admin.hide_chapters(None, self.selected)
+        self.assertPointer(self.chapter1)
+
+        self.model_admin.unhide_chapters(None, self.selected)
+        self.assertPointer(self.chapter2)
+
+
+class RebuildLatestChaptersCommandTests(LatestChapterPointerTestCase):
+    def test_command_backfills_pointers(self):
+        Chapter.objects.filter(pk__in=[self.chapter1.pk, self.chapter2.pk]).update(approved=True)
+        self.assertPointer(None)
+
+        out = StringIO()
+        call_command('rebuild_latest_chapters', stdout=out)
+
+        self.assertPointer(self.chapter2)
+        self.assertIn("repaired for 1 of 1 novels", out.getvalue())
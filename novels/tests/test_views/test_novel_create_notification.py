@@ -25,7 +25,7 @@ class NovelCreateNotificationTests(TestCase):
             role=UserRole.USER.value,
         )
 
-    @patch("novels.views.public.novel_view.send_notification_to_user")
+    @patch("interactions.services.notification_service.send_notifications")
     def test_create_pending_novel_triggers_admin_notification(self, mock_send):
         self.client.login(username="user@example.com", password="password123")
 
@@ -49,8 +49,28 @@ class NovelCreateNotificationTests(TestCase):
         notif = notifications.first()
         self.assertIn("Test Novel", notif.content)
 
-        # Kiểm tra hàm send_notification_to_user được gọi
+        # Kiểm tra SSE được gửi trong một lần publish
         mock_send.assert_called_once()
-        call_args = mock_send.call_args[1]  # lấy kwargs
-        self.assertEqual(call_args["user_id"], self.admin.id)
-        self.assertEqual(call_args["notification"].related_object, novel)
+        sent = mock_send.call_args[0][0]
+        self.assertEqual([n.user_id for n in sent], [self.admin.id])
+        self.assertEqual(sent[0].related_object, novel)
+
+    @patch("interactions.services.notification_service.send_notifications")
+    def test_all_admins_are_notified_with_one_insert(self, mock_send):
+        User.objects.create_user(
+            username="admin2",
+            email="admin2@example.com",
+            password="password123",
+            role=UserRole.WEBSITE_ADMIN.value,
+        )
+        self.client.login(username="user@example.com", password="password123")
+
+        self.client.post(reverse("novels:novel_create"), {
+            "name": "Second Novel",
+            "slug": "second-novel",
+            "summary": "Another test novel"
+        })
+
+        self.assertEqual(Notification.objects.filter(user__role=UserRole.WEBSITE_ADMIN.value).count(), 2)
+        mock_send.assert_called_once()
+        self.assertEqual(len(mock_send.call_args[0][0]), 2)
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.urls import reverse
-from novels.models import Novel
+from novels.models import Novel, Volume, Chapter
+from novels.services import NovelService, LatestChapterService
 from constants import ProgressStatus, ApprovalStatus
 from django.utils import timezone
 from datetime import timedelta
@@ -53,3 +54,53 @@ class NovelViewsTest(TestCase):
 
         novels = response.context["finish_novels"]
         self.assertTrue(all(n.progress_status == ProgressStatus.COMPLETED.value for n in novels))
+
+
+class FinishedNovelsLatestChapterTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.novels = []
+        for i in range(5):
+            novel = Novel.objects.create(
+                name=f"Finished {i}",
+                slug=f"finished-{i}",
+                summary="Demo summary",
+                approval_status=ApprovalStatus.APPROVED.value,
+                progress_status=ProgressStatus.COMPLETED.value,
+            )
+            for v in range(1, 3):
+                volume = Volume.objects.create(novel=novel, name=f"Vol {v}", position=v)
+                for c in range(1, 3):
+                    Chapter.objects.create(
+                        volume=volume, title=f"Chap {v}.{c}", position=c, approved=True,
+                        slug=f"finished-{i}-chap-{v}-{c}"
+                    )
+            cls.novels.append(novel)
+
+        # A newer hidden chapter must not be picked as the latest one
+        Chapter.objects.create(
+            volume=Volume.objects.get(novel=cls.novels[0], position=1),
+            title="Hidden", position=3, approved=True, is_hidden=True,
+            slug="finished-0-hidden"
+        )
+        LatestChapterService.rebuild([novel.id for novel in cls.novels])
+
+    def test_latest_volume_and_chapter_attached(self):
+        novels = NovelService.get_finished_novels_with_chapters()
+
+        self.assertEqual(len(novels), 5)
+        for novel in novels:
+            self.assertEqual(novel.recent_volume.name, "Vol 2")
+            self.assertEqual(novel.recent_chapter.title, "Chap 2.2")
+
+    def test_constant_query_count(self):
+        with self.assertNumQueries(1):
+            novels = NovelService.get_finished_novels_with_chapters()
+            [novel.recent_volume.name for novel in novels]
+
+    def test_finish_novels_page_cards(self):
+        response = self.client.get(reverse("novels:finish_novels"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Chap 2.2")
+        self.assertNotContains(response, "Hidden")
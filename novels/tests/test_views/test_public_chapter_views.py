@@ -9,6 +9,7 @@ from django.contrib.messages import get_messages
 from unittest.mock import patch, Mock
 
 from novels.models import Novel, Volume, Chapter, Author, Chunk
+from novels.utils import ChunkManager
 from constants import ApprovalStatus, UserRole
 import warnings
 
@@ -78,6 +79,7 @@ class ChapterPublicViewTestCase(TestCase):
             position=2,
             word_count=3
         )
+        ChunkManager.refresh_chunk_stats([self.chapter.id])
 
 
 class ChapterDetailPublicViewTests(ChapterPublicViewTestCase):
@@ -178,7 +180,8 @@ class ChapterDetailPublicViewTests(ChapterPublicViewTestCase):
         })
         response = self.client.get(url)
         
-        self.assertEqual(response.context['next_chapter'], next_chapter)
+        self.assertEqual(response.context['next_chapter']['id'], next_chapter.id)
+        self.assertEqual(response.context['next_chapter']['slug'], next_chapter.slug)
         self.assertIsNone(response.context['prev_chapter'])
     
     def test_chapter_detail_invalid_novel_slug(self):
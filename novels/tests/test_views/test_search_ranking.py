@@ -0,0 +1,15 @@
+"""
+View tests for ranked novel search
+"""
+from django.urls import reverse
+
+from novels.tests.test_services.test_search_index import SearchIndexTestCase
+
+
+class SearchViewRankingTests(SearchIndexTestCase):
+    def test_search_view_uses_rank_order(self):
+        response = self.client.get(reverse('novels:search_novels'), {'q': 'kinh van hoa'})
+        content = response.content.decode()
+
+        self.assertLess(content.index("Kính Vạn Hoa"), content.index("Mắt Biếc"))
+        self.assertNotIn("bản nháp", content)
@@ -0,0 +1,152 @@
+"""
+Unit tests for the search-as-you-type suggestion endpoint
+"""
+import time
+from unittest.mock import patch
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from novels.models import Novel, Author
+from novels.services import NovelSuggestionService
+from novels.utils.prefix_index import PrefixIndex
+from constants import ApprovalStatus, SUGGEST_FULL_REBUILD_SECONDS
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+
+class PrefixIndexTests(TestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.load([
+            (1, ["kinh van hoa", "van hoa", "hoa"], 10),
+            (2, ["mat biec", "biec"], 50),
+            (3, ["van phong"], 30),
+        ])
+
+    def test_prefix_lookup_ordered_by_score(self):
+        self.assertEqual(self.index.search("van", 10, 100), [3, 1])
+        self.assertEqual(self.index.search("van", 1, 100), [3])
+
+    def test_add_replaces_previous_keys(self):
+        self.index.add(1, ["toi thay hoa vang"], 10)
+        self.assertEqual(self.index.search("van", 10, 100), [3])
+        self.assertEqual(self.index.search("toi", 10, 100), [1])
+
+    def test_remove(self):
+        self.index.remove(2)
+        self.assertEqual(self.index.search("m", 10, 100), [])
+        self.assertNotIn(2, self.index)
+
+    def test_max_scan_bounds_the_walk(self):
+        self.assertEqual(len(self.index.search("", 10, 100)), 0)
+        self.assertEqual(len(self.index.search("v", 10, 1)), 1)
+
+
+class SuggestionTestCase(TestCase):
+    def setUp(self):
+        NovelSuggestionService.reset()
+        self.author = Author.objects.create(name="Nguyễn Nhật Ánh")
+        self.popular = Novel.objects.create(
+            name="Kính Vạn Hoa",
+            other_names="Kaleidoscope",
+            summary="Summary",
+            author=self.author,
+            approval_status=ApprovalStatus.APPROVED.value,
+            view_count=500
+        )
+        self.other = Novel.objects.create(
+            name="Vạn Dặm",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value,
+            view_count=10
+        )
+        self.draft = Novel.objects.create(
+            name="Vạn Lý",
+            summary="Summary",
+            approval_status=ApprovalStatus.DRAFT.value,
+            view_count=1000
+        )
+        self.url = reverse('novels:suggest_novels')
+
+    def tearDown(self):
+        NovelSuggestionService.reset()
+
+    def names(self, query, **params):
+        response = self.client.get(self.url, {'q': query, **params})
+        return [result['name'] for result in response.json()['results']]
+
+
+class SuggestNovelsViewTests(SuggestionTestCase):
+    def test_matches_word_prefix_without_diacritics(self):
+        self.assertEqual(self.names("van"), ["Kính Vạn Hoa", "Vạn Dặm"])
+
+    def test_matches_other_names_and_author(self):
+        self.assertEqual(self.names("kaleido"), ["Kính Vạn Hoa"])
+        self.assertEqual(self.names("nguyen nhat"), ["Kính Vạn Hoa"])
+
+    def test_limit_and_empty_query(self):
+        self.assertEqual(self.names("van", limit=1), ["Kính Vạn Hoa"])
+        self.assertEqual(self.names(""), [])
+
+    def test_result_payload(self):
+        response = self.client.get(self.url, {'q': 'kinh'})
+        self.assertEqual(response.json()['results'], [{
+            'name': "Kính Vạn Hoa",
+            'slug': self.popular.slug,
+            'url': reverse('novels:novel_detail', kwargs={'novel_slug': self.popular.slug}),
+        }])
+
+    def test_warm_index_does_not_query_database(self):
+        self.names("van")
+        with self.assertNumQueries(0):
+            self.names("kinh")
+
+
+class SuggestionIndexSyncTests(SuggestionTestCase):
+    def setUp(self):
+        super().setUp()
+        NovelSuggestionService.load()
+
+    def test_approval_and_rename_update_index(self):
+        self.draft.approval_status = ApprovalStatus.APPROVED.value
+        self.draft.save()
+        self.assertIn("Vạn Lý", self.names("van ly"))
+
+        self.draft.name = "Thiên Lý"
+        self.draft.save()
+        self.assertEqual(self.names("van ly"), [])
+        self.assertEqual(self.names("thien"), ["Thiên Lý"])
+
+    def test_soft_delete_and_delete_remove_novel(self):
+        self.other.deleted_at = self.other.created_at
+        self.other.save()
+        self.assertEqual(self.names("van dam"), [])
+
+        NovelSuggestionService.novel_removed(self.popular.id)
+        self.assertEqual(self.names("kinh"), [])
+
+    def test_author_rename_updates_index(self):
+        self.author.name = "Tác giả mới"
+        self.author.save()
+        self.assertEqual(self.names("nguyen"), [])
+        self.assertEqual(self.names("tac gia"), ["Kính Vạn Hoa"])
+
+    def test_sync_picks_up_changes_from_other_workers(self):
+        # update() skips signals, like a save made by another worker
+        Novel.objects.filter(pk=self.other.pk).update(name="Đường Xa", updated_at=timezone.now())
+        self.assertEqual(self.names("duong"), [])
+
+        NovelSuggestionService.sync()
+        self.assertEqual(self.names("duong"), ["Đường Xa"])
+
+    @patch('novels.services.novel_suggestion_service.threading.Thread')
+    def test_expired_index_is_refreshed_in_background(self, mock_thread):
+        NovelSuggestionService._loaded_at = time.monotonic() - SUGGEST_FULL_REBUILD_SECONDS
+        # Served from the current index while the reload is scheduled
+        self.assertEqual(self.names("kinh"), ["Kính Vạn Hoa"])
+
+        self.assertEqual(mock_thread.call_args.kwargs['args'], (True,))
+        mock_thread.return_value.start.assert_called_once()
+        NovelSuggestionService._refresh_lock.release()
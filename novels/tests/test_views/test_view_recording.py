@@ -0,0 +1,43 @@
+"""
+View tests for recording chapter and novel views
+"""
+from django.test import TestCase
+from django.urls import reverse
+from unittest.mock import patch
+
+from novels.models import Novel, Volume, Chapter
+from constants import ApprovalStatus
+import warnings
+
+warnings.filterwarnings("ignore", message="No directory at:")
+
+
+class ViewCountRecordingViewTests(TestCase):
+    def setUp(self):
+        self.novel = Novel.objects.create(
+            name="Viewed Novel",
+            summary="Summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        volume = Volume.objects.create(novel=self.novel, name="Volume 1", position=1)
+        self.chapter = Chapter.objects.create(
+            volume=volume, title="Chapter 1", slug="viewed-chapter-1", position=1, approved=True
+        )
+
+    @patch('novels.views.public.chapter_view.record_view')
+    def test_chapter_detail_records_chapter_and_novel(self, mock_record):
+        url = reverse('novels:chapter_detail', kwargs={
+            'novel_slug': self.novel.slug,
+            'chapter_slug': self.chapter.slug
+        })
+        self.client.get(url)
+
+        recorded = [call.args[1] for call in mock_record.call_args_list]
+        self.assertEqual(recorded, [self.chapter, self.novel])
+
+    @patch('novels.views.public.novel_view.record_view')
+    def test_novel_detail_records_novel(self, mock_record):
+        self.client.get(reverse('novels:novel_detail', kwargs={'novel_slug': self.novel.slug}))
+
+        mock_record.assert_called_once()
+        self.assertEqual(mock_record.call_args.args[1], self.novel)
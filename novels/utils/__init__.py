@@ -1,4 +1,6 @@
 from .simple_chunker import SimpleChunker
 from .html_chunker import HtmlChunker
+from .chunk_codec import ChunkCodec
 from .chunk_manager import ChunkManager
+from .chapter_streamer import ChapterStreamer
 from .helpers import *
@@ -0,0 +1,111 @@
+import os
+import re
+import tarfile
+import zipfile
+from typing import List, NamedTuple, Tuple
+from .helpers import count_words
+from .html_chunker import HtmlChunker
+from .simple_chunker import SimpleChunker
+
+CHAPTER_FILE_KINDS = {'.html': 'html', '.htm': 'html', '.txt': 'text'}
+
+
+class ChapterSource(NamedTuple):
+    key: str  # Path of the file inside the directory/archive
+    volume_name: str  # Parent directory name, '' for top-level files
+    title: str
+    kind: str  # 'html' or 'text'
+
+
+def _natural_key(path: str):
+    """Sort "chuong-2" before "chuong-10" """
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', path)]
+
+
+def _source_for(path: str):
+    """ChapterSource for a file path inside the import, or None if it is not a chapter"""
+    parts = [part for part in path.replace('\\', '/').split('/') if part and part != '.']
+    if not parts or any(part.startswith(('.', '__MACOSX')) for part in parts):
+        return None
+    stem, extension = os.path.splitext(parts[-1])
+    kind = CHAPTER_FILE_KINDS.get(extension.lower())
+    if kind is None:
+        return None
+    # "001 - Mở đầu" / "01_mo_dau" -> "Mở đầu" / "mo dau"
+    title = re.sub(r'^\d+\s*[-._)]*\s*', '', stem).replace('_', ' ').strip() or stem
+    volume_name = parts[-2] if len(parts) > 1 else ''
+    return ChapterSource('/'.join(parts), volume_name, title, kind)
+
+
+class ChapterSourceReader:
+    """
+    Read chapter files from a directory, a .zip or a tar archive.
+
+    Files are chapters (.html/.htm chunked as HTML, .txt as plain text), the
+    directory holding a file is its volume, and chapters are returned in
+    natural path order. Use as a context manager so archives get closed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._archive = None
+        self._paths_by_key = {}
+
+    def __enter__(self):
+        if os.path.isdir(self.path):
+            pass
+        elif zipfile.is_zipfile(self.path):
+            self._archive = zipfile.ZipFile(self.path)
+        elif tarfile.is_tarfile(self.path):
+            self._archive = tarfile.open(self.path)
+        else:
+            raise ValueError(f"{self.path} is not a directory, zip or tar archive")
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._archive is not None:
+            self._archive.close()
+
+    def _paths(self) -> List[str]:
+        if isinstance(self._archive, zipfile.ZipFile):
+            return [info.filename for info in self._archive.infolist() if not info.is_dir()]
+        if isinstance(self._archive, tarfile.TarFile):
+            return [member.name for member in self._archive.getmembers() if member.isfile()]
+        return [
+            os.path.relpath(os.path.join(root, name), self.path)
+            for root, _, names in os.walk(self.path)
+            for name in names
+        ]
+
+    def sources(self) -> List[ChapterSource]:
+        sources = []
+        for path in self._paths():
+            source = _source_for(path)
+            if source is not None:
+                self._paths_by_key[source.key] = path
+                sources.append(source)
+        return sorted(sources, key=lambda source: _natural_key(source.key))
+
+    def read(self, source: ChapterSource) -> bytes:
+        path = self._paths_by_key[source.key]
+        if isinstance(self._archive, zipfile.ZipFile):
+            data = self._archive.read(path)
+        elif isinstance(self._archive, tarfile.TarFile):
+            data = self._archive.extractfile(path).read()
+        else:
+            with open(os.path.join(self.path, path), 'rb') as f:
+                data = f.read()
+        return data
+
+
+def chunk_chapter_source(kind: str, data: bytes, max_chunk_size: int) -> Tuple[List[Tuple[str, int]], int]:
+    """
+    Decode and chunk one chapter file; runs in a worker process (module-level so it can be pickled).
+
+    Returns:
+        Tuple of (list of (chunk_content, word_count), total word count)
+    """
+    content = data.decode('utf-8-sig')
+    if kind == 'html':
+        return HtmlChunker(max_chunk_size).split_with_word_count(content)
+    return SimpleChunker(max_chunk_size).split_into_chunks(content), count_words(content)
@@ -0,0 +1,71 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+from constants import CHUNK_STREAM_MARKER
+
+
+class ChapterStreamer:
+    """
+    Render a chapter page as a StreamingHttpResponse.
+
+    The page template is rendered once with CHUNK_STREAM_MARKER in place of
+    the chunk list; everything before the marker is sent immediately, then
+    chunk rows are fetched with .iterator() and written one by one, so the
+    first byte does not wait for the chapter and the full chapter is never
+    held in memory. Under ASGI the body is an async iterator: Django would
+    read a sync one to the end with sync_to_async(list) before sending it.
+    """
+
+    CHUNK_TEMPLATE = 'novels/includes/chunk.html'
+
+    @staticmethod
+    def split_page(request, template_name, context):
+        page = render_to_string(template_name, {
+            **context,
+            'stream_chunks': True,
+            'chunk_stream_marker': CHUNK_STREAM_MARKER,
+        }, request)
+        head, marker, tail = page.partition(CHUNK_STREAM_MARKER)
+        if not marker:
+            raise ValueError(f"{template_name} does not render the chunk stream marker")
+        return head, tail
+
+    @staticmethod
+    def stream_chunks(chapter):
+        chunk_template = get_template(ChapterStreamer.CHUNK_TEMPLATE)
+        for chunk in chapter.iter_chunks():
+            yield chunk_template.render({'chunk': chunk})
+
+    @staticmethod
+    async def astream_chunks(chapter):
+        chunk_template = get_template(ChapterStreamer.CHUNK_TEMPLATE)
+        async for chunk in chapter.aiter_chunks():
+            yield chunk_template.render({'chunk': chunk})
+
+    @staticmethod
+    def stream_response(request, template_name, context, chapter):
+        """
+        Args:
+            request: Current request (used for context processors)
+            template_name: Page template rendering `chunk_stream_marker` when `stream_chunks` is set
+            context: Page context
+            chapter: Chapter whose chunks are streamed
+        """
+        head, tail = ChapterStreamer.split_page(request, template_name, context)
+
+        def generate():
+            yield head
+            yield from ChapterStreamer.stream_chunks(chapter)
+            yield tail
+
+        async def agenerate():
+            yield head
+            async for part in ChapterStreamer.astream_chunks(chapter):
+                yield part
+            yield tail
+
+        body = agenerate() if isinstance(request, ASGIRequest) else generate()
+        response = StreamingHttpResponse(body, content_type='text/html; charset=utf-8')
+        # Ask nginx-style proxies to forward chunks as they are produced
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,65 @@
+import zlib
+from typing import Optional, Tuple
+from django.conf import settings
+from constants import CHUNK_CODEC_RAW, CHUNK_CODEC_ZLIB, CHUNK_CODEC_ZSTD, CHUNK_COMPRESSION_LEVEL
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, zlib ships with Python
+    zstandard = None
+
+
+class ChunkCodec:
+    """
+    Encode chunk content for storage and decode it back.
+
+    Raw chunks keep their HTML in Chunk.content. Compressed chunks keep an
+    empty Chunk.content and the UTF-8 bytes compressed with Chunk.codec in
+    Chunk.compressed_content. A chunk that would not get smaller is stored
+    raw whatever the codec.
+    """
+
+    CODECS = (CHUNK_CODEC_RAW, CHUNK_CODEC_ZLIB, CHUNK_CODEC_ZSTD)
+
+    @staticmethod
+    def storage_codec() -> str:
+        """Codec new chunks are written with (settings.CHUNK_STORAGE_CODEC)"""
+        return getattr(settings, 'CHUNK_STORAGE_CODEC', CHUNK_CODEC_RAW) or CHUNK_CODEC_RAW
+
+    @staticmethod
+    def check(codec: str):
+        if codec not in ChunkCodec.CODECS:
+            raise ValueError(f"Unknown chunk codec {codec!r} (expected one of {', '.join(ChunkCodec.CODECS)})")
+        if codec == CHUNK_CODEC_ZSTD and zstandard is None:
+            raise ValueError("The zstd chunk codec needs the zstandard package")
+
+    @staticmethod
+    def encode(content: str, codec: Optional[str] = None) -> Tuple[str, str, Optional[bytes]]:
+        """
+        Returns:
+            Tuple of (content, codec, compressed_content) to store on the Chunk
+        """
+        codec = codec or ChunkCodec.storage_codec()
+        if codec == CHUNK_CODEC_RAW:
+            return content, CHUNK_CODEC_RAW, None
+
+        ChunkCodec.check(codec)
+        data = content.encode('utf-8')
+        if codec == CHUNK_CODEC_ZLIB:
+            compressed = zlib.compress(data, CHUNK_COMPRESSION_LEVEL)
+        else:
+            compressed = zstandard.ZstdCompressor(level=CHUNK_COMPRESSION_LEVEL).compress(data)
+
+        if len(compressed) >= len(data):
+            return content, CHUNK_CODEC_RAW, None
+        return '', codec, compressed
+
+    @staticmethod
+    def decode(codec: str, content: str, compressed_content) -> str:
+        if codec == CHUNK_CODEC_RAW or not codec:
+            return content
+        if codec == CHUNK_CODEC_ZLIB:
+            return zlib.decompress(compressed_content).decode('utf-8')
+
+        ChunkCodec.check(codec)
+        return zstandard.ZstdDecompressor().decompress(bytes(compressed_content)).decode('utf-8')
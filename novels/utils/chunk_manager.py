@@ -1,10 +1,17 @@
+from django.db import transaction
+from django.db.models import F, Count, Avg, Max, Sum
+from django.db.models.functions import Length
 from .helpers import count_words
 from .simple_chunker import SimpleChunker
 from .html_chunker import HtmlChunker
+from .chunk_codec import ChunkCodec
+from constants import CHUNK_WRITE_BATCH_SIZE, CHUNK_CODEC_RAW, WORDS_PER_MINUTE
 
 
 class ChunkManager:
     """Manager class for handling chapter content chunking operations."""
+
+    STATS_FIELDS = ['chunk_count', 'avg_chunk_words', 'max_chunk_words', 'char_count', 'reading_minutes']
     
     @staticmethod
     def create_normal_chunks_for_chapter(chapter, content: str, chunker: SimpleChunker = None):
@@ -16,34 +23,15 @@ class ChunkManager:
             content: Raw content to be chunked
             chunker: Optional SimpleChunker instance
         """
-        from novels.models import Chunk
-        
         if chunker is None:
             chunker = SimpleChunker()
             
         # Calculate total word count from original content first
         total_word_count = count_words(content)
         
-        # Clear existing chunks only if chapter is saved (has a primary key)
-        if chapter.pk:
-            Chunk.objects.filter(chapter=chapter).delete()
-        
-        # Create new chunks
         chunks_data = chunker.split_into_chunks(content)
         
-        for position, (chunk_content, word_count) in enumerate(chunks_data, 1):
-            Chunk.objects.create(
-                chapter=chapter,
-                position=position,
-                content=chunk_content,
-                word_count=word_count
-            )
-        
-        # Update chapter word count with pre-calculated total
-        chapter.word_count = total_word_count
-        chapter.save(update_fields=['word_count'])
-        
-        return len(chunks_data)
+        return ChunkManager.write_chunks(chapter, chunks_data, total_word_count)
     
     @staticmethod
     def create_html_chunks_for_chapter(chapter, content: str, chunker: HtmlChunker = None):
@@ -55,48 +43,208 @@ class ChunkManager:
             content: HTML content to be chunked
             chunker: Optional HtmlChunker instance
         """
-        from novels.models import Chunk
-        from bs4 import BeautifulSoup
-        
         if chunker is None:
             chunker = HtmlChunker()
         
-        # Extract text content for word counting (preserve original HTML for chunks)
-        soup = BeautifulSoup(content, 'html.parser')
-        total_word_count = count_words(soup.get_text())
+        # Chunks, chunk word counts and the chapter word count come from one parse
+        chunks_data, total_word_count = chunker.split_with_word_count(content)
         
-        # Clear existing chunks only if chapter is saved (has a primary key)
-        if chapter.pk:
-            Chunk.objects.filter(chapter=chapter).delete()
+        return ChunkManager.write_chunks(chapter, chunks_data, total_word_count)
+    
+    @staticmethod
+    def write_chunks(chapter, chunks_data, total_word_count):
+        """
+        Write a chapter's chunks in one transaction, touching only changed positions.
         
-        # Create new chunks using HTML-aware chunking
-        chunks_data = chunker.split_into_chunks(content)
+        Positions whose content is unchanged are kept, changed positions are
+        updated with a single bulk_update, new positions are inserted with a
+        single bulk_create and positions past the new end are deleted.
+        content_version is only bumped when a chunk row actually changed.
+        Written rows are encoded with the storage codec (see ChunkCodec);
+        rows are compared on their decoded content.
         
-        for position, (chunk_content, word_count) in enumerate(chunks_data, 1):
-            # Validate that each chunk is valid HTML
-            if chunker.validate_html_chunk(chunk_content):
-                Chunk.objects.create(
-                    chapter=chapter,
-                    position=position,
-                    content=chunk_content,
-                    word_count=word_count
+        Args:
+            chapter: Chapter model instance (saved)
+            chunks_data: List of (chunk_content, word_count) in reading order
+            total_word_count: Word count of the whole chapter
+            
+        Returns:
+            Number of chunks
+        """
+        from novels.models import Chunk
+        
+        with transaction.atomic():
+            existing = {
+                position: (chunk_id, ChunkCodec.decode(codec, content, compressed_content), word_count)
+                for position, chunk_id, word_count, content, codec, compressed_content
+                in Chunk.objects.filter(chapter=chapter).values_list(
+                    'position', 'id', 'word_count', *Chunk.STORAGE_FIELDS
                 )
-            else:
-                # Fallback: wrap in paragraph tags if HTML is invalid
-                safe_content = f'<p>{chunk_content}</p>'
-                Chunk.objects.create(
+            }
+            
+            codec = ChunkCodec.storage_codec()
+            to_create = []
+            to_update = []
+            for position, (chunk_content, word_count) in enumerate(chunks_data, 1):
+                current = existing.get(position)
+                if current is not None and current[1:] == (chunk_content, word_count):
+                    continue
+                stored_content, stored_codec, compressed_content = ChunkCodec.encode(chunk_content, codec)
+                chunk = Chunk(
                     chapter=chapter,
                     position=position,
-                    content=safe_content,
+                    content=stored_content,
+                    codec=stored_codec,
+                    compressed_content=compressed_content,
                     word_count=word_count
                 )
-        
-        # Update chapter word count with pre-calculated total
-        chapter.word_count = total_word_count
-        chapter.save(update_fields=['word_count'])
+                if current is None:
+                    to_create.append(chunk)
+                else:
+                    chunk.id = current[0]
+                    to_update.append(chunk)
+            
+            deleted = 0
+            if len(existing) > len(chunks_data):
+                deleted, _ = Chunk.objects.filter(
+                    chapter=chapter, position__gt=len(chunks_data)
+                ).delete()
+            
+            if to_update:
+                Chunk.objects.bulk_update(
+                    to_update, [*Chunk.STORAGE_FIELDS, 'word_count'], batch_size=CHUNK_WRITE_BATCH_SIZE
+                )
+            
+            if to_create:
+                Chunk.objects.bulk_create(to_create, batch_size=CHUNK_WRITE_BATCH_SIZE)
+            
+            chapter.word_count = total_word_count
+            ChunkManager._save_rewritten_chapter(
+                chapter, chunks_data, content_changed=bool(to_create or to_update or deleted)
+            )
         
         return len(chunks_data)
     
+    @staticmethod
+    def _save_rewritten_chapter(chapter, chunks_data, content_changed=True):
+        """Save the word count and chunk stats, and bump content_version (invalidates cached chunks)"""
+        word_counts = [word_count for _, word_count in chunks_data]
+        ChunkManager._set_chunk_stats(
+            chapter,
+            chunk_count=len(word_counts),
+            avg_chunk_words=sum(word_counts) / len(word_counts) if word_counts else 0,
+            max_chunk_words=max(word_counts, default=0),
+            char_count=sum(len(chunk_content) for chunk_content, _ in chunks_data),
+        )
+        update_fields = ['word_count', *ChunkManager.STATS_FIELDS]
+        if content_changed:
+            chapter.content_version = F('content_version') + 1
+            update_fields.append('content_version')
+        chapter.save(update_fields=update_fields)
+        if content_changed:
+            chapter.refresh_from_db(fields=['content_version'])
+    
+    @staticmethod
+    def _set_chunk_stats(chapter, chunk_count, avg_chunk_words, max_chunk_words, char_count):
+        chapter.chunk_count = chunk_count
+        chapter.avg_chunk_words = avg_chunk_words
+        chapter.max_chunk_words = max_chunk_words
+        chapter.char_count = char_count
+        chapter.reading_minutes = chapter.word_count / WORDS_PER_MINUTE
+    
+    @staticmethod
+    def refresh_chunk_stats(chapter_ids):
+        """
+        Recompute the stored chunk statistics of the given chapters from their chunks.
+        
+        Used to backfill chapters chunked before the statistics were stored, or
+        chunks written without ChunkManager (e.g. seed data).
+        
+        Args:
+            chapter_ids: Ids of the chapters to refresh
+            
+        Returns:
+            Number of chapters whose statistics changed
+        """
+        from novels.models import Chapter, Chunk
+        
+        stats = {
+            row['chapter_id']: row
+            for row in Chunk.objects.filter(chapter_id__in=chapter_ids).values('chapter_id').annotate(
+                chunk_count=Count('id'),
+                avg_chunk_words=Avg('word_count'),
+                max_chunk_words=Max('word_count'),
+                char_count=Sum(Length('content')),
+            ).order_by()
+        }
+        # Compressed rows have an empty content column, measure them decoded
+        for chapter_id, content, codec, compressed_content in Chunk.objects.filter(
+            chapter_id__in=chapter_ids
+        ).exclude(codec=CHUNK_CODEC_RAW).values_list('chapter_id', *Chunk.STORAGE_FIELDS).iterator():
+            row = stats[chapter_id]
+            row['char_count'] = (row['char_count'] or 0) + len(
+                ChunkCodec.decode(codec, content, compressed_content)
+            )
+        
+        changed = []
+        for chapter in Chapter.objects.filter(pk__in=chapter_ids).only('word_count', *ChunkManager.STATS_FIELDS):
+            before = [getattr(chapter, field) for field in ChunkManager.STATS_FIELDS]
+            row = stats.get(chapter.pk, {})
+            ChunkManager._set_chunk_stats(
+                chapter,
+                chunk_count=row.get('chunk_count', 0),
+                avg_chunk_words=row.get('avg_chunk_words') or 0,
+                max_chunk_words=row.get('max_chunk_words') or 0,
+                char_count=row.get('char_count') or 0,
+            )
+            if before != [getattr(chapter, field) for field in ChunkManager.STATS_FIELDS]:
+                changed.append(chapter)
+        
+        Chapter.objects.bulk_update(changed, ChunkManager.STATS_FIELDS)
+        return len(changed)
+    
+    @staticmethod
+    def convert_chunk_batch(codec, after_id=0, batch_size=CHUNK_WRITE_BATCH_SIZE):
+        """
+        Re-encode the next batch of chunks not stored with `codec` (by id, after after_id).
+        
+        The decoded content does not change, so content_version is left alone.
+        
+        Returns:
+            Dict with last_id (None when there is nothing left), converted, and
+            stored_before/stored_after sizes in bytes
+        """
+        from novels.models import Chunk
+        
+        ChunkCodec.check(codec)
+        rows = list(
+            Chunk.objects.filter(id__gt=after_id).exclude(codec=codec).order_by('id').values_list(
+                'id', *Chunk.STORAGE_FIELDS
+            )[:batch_size]
+        )
+        result = {'last_id': rows[-1][0] if rows else None, 'converted': 0, 'stored_before': 0, 'stored_after': 0}
+        
+        to_update = []
+        for chunk_id, content, current_codec, compressed_content in rows:
+            decoded = ChunkCodec.decode(current_codec, content, compressed_content)
+            stored_content, stored_codec, stored_compressed = ChunkCodec.encode(decoded, codec)
+            if stored_codec == current_codec:
+                # Did not compress, already stored raw
+                continue
+            result['stored_before'] += ChunkManager._stored_size(content, compressed_content)
+            result['stored_after'] += ChunkManager._stored_size(stored_content, stored_compressed)
+            to_update.append(Chunk(
+                id=chunk_id, content=stored_content, codec=stored_codec, compressed_content=stored_compressed
+            ))
+        
+        Chunk.objects.bulk_update(to_update, list(Chunk.STORAGE_FIELDS), batch_size=CHUNK_WRITE_BATCH_SIZE)
+        result['converted'] = len(to_update)
+        return result
+    
+    @staticmethod
+    def _stored_size(content, compressed_content):
+        return len(content.encode('utf-8')) + (len(compressed_content) if compressed_content is not None else 0)
+    
     @staticmethod
     def create_chunks_for_chapter(chapter, content: str, chunker: SimpleChunker = None):
         """
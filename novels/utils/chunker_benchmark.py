@@ -0,0 +1,211 @@
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+from constants import CHUNKER_BENCHMARK_REPEAT
+from .helpers import count_words
+from .html_chunker import HtmlChunker
+from .simple_chunker import SimpleChunker
+
+SIZE_UNITS = {'KB': 1024, 'MB': 1024 * 1024}
+WORDS = (
+    "anh em bạn bè cuộc đời thành phố bầu trời con đường ngôi nhà mùa xuân "
+    "giấc mơ ký ức yêu thương nỗi nhớ hành trình đêm trăng ngày mai cô ấy "
+    "nói rằng không biết tại sao mọi thứ lại trở nên như vậy"
+).split()
+
+
+class BenchmarkDocument(NamedTuple):
+    name: str
+    kind: str
+    content: str
+
+
+def parse_size(size: str) -> int:
+    """Parse "100KB", "1MB" or a plain number of characters"""
+    size = size.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if size.endswith(unit):
+            return int(float(size[:-len(unit)]) * factor)
+    if size.isdigit():
+        return int(size)
+    raise ValueError(f"Invalid size: {size}")
+
+
+def _sentence(rng: random.Random, min_words: int = 20, max_words: int = 120) -> List[str]:
+    return rng.choices(WORDS, k=rng.randint(min_words, max_words))
+
+
+def build_synthetic_html(rng: random.Random, size: int) -> str:
+    """Plain <p> paragraphs (with the odd <strong>) until the chapter reaches `size` characters"""
+    paragraphs = []
+    length = 0
+    while length < size:
+        words = _sentence(rng)
+        paragraph = f"<p>{' '.join(words).capitalize()}.</p>"
+        if rng.random() < 0.1:
+            paragraph = f"<p><strong>{words[0]}</strong> {' '.join(words[1:])}.</p>"
+        paragraphs.append(paragraph)
+        length += len(paragraph)
+    return '\n'.join(paragraphs)
+
+
+def build_tinymce_html(rng: random.Random, size: int) -> str:
+    """Markup as TinyMCE saves it: styled paragraphs, entities, inline tags, breaks and headings"""
+    blocks = []
+    length = 0
+    while length < size:
+        words = _sentence(rng)
+        roll = rng.random()
+        if roll < 0.03:
+            block = f"<h2>{' '.join(words[:6]).capitalize()}</h2>"
+        elif roll < 0.06:
+            block = "<p>&nbsp;</p>"
+        elif roll < 0.08:
+            block = "<hr />"
+        elif roll < 0.25:
+            block = f'<p style="text-align: justify;">{" ".join(words).capitalize()}.</p>'
+        elif roll < 0.40:
+            middle = len(words) // 2
+            block = (
+                f"<p>&ldquo;{' '.join(words[:middle]).capitalize()}&rdquo;<br />"
+                f"<em>{' '.join(words[middle:])}</em>&hellip;</p>"
+            )
+        elif roll < 0.50:
+            block = f"<p><strong>{words[0]}</strong>&nbsp;{' '.join(words[1:])}.</p>"
+        else:
+            block = f"<p>{' '.join(words).capitalize()}.</p>"
+        blocks.append(block)
+        length += len(block)
+    return '\n'.join(blocks)
+
+
+def build_plain_text(rng: random.Random, size: int) -> str:
+    """Plain text paragraphs separated by blank lines"""
+    paragraphs = []
+    length = 0
+    while length < size:
+        paragraph = f"{' '.join(_sentence(rng)).capitalize()}."
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return '\n\n'.join(paragraphs)
+
+
+CORPUS_BUILDERS = {
+    'synthetic': build_synthetic_html,
+    'tinymce': build_tinymce_html,
+    'plain': build_plain_text,
+}
+
+
+def build_corpus(sizes: List[str], seed: int = 1) -> List[BenchmarkDocument]:
+    """One document of every kind per size, deterministic for a given seed"""
+    rng = random.Random(seed)
+    return [
+        BenchmarkDocument(f"{kind}-{label}", kind, builder(rng, parse_size(label)))
+        for label in sizes
+        for kind, builder in CORPUS_BUILDERS.items()
+    ]
+
+
+def benchmark_targets() -> Dict[str, Callable[[str], list]]:
+    """Benchmarked callables by name; each returns the chunks it produced (if any)"""
+    html_chunker = HtmlChunker()
+    simple_chunker = SimpleChunker()
+    return {
+        'html_chunker': html_chunker.split_into_chunks,
+        'simple_chunker': simple_chunker.split_into_chunks,
+        'count_words': lambda content: [(content, count_words(content))],
+    }
+
+
+# Which corpus kinds each target is meant for
+TARGET_KINDS = {
+    'html_chunker': ('synthetic', 'tinymce'),
+    'simple_chunker': ('plain',),
+    'count_words': ('plain', 'tinymce'),
+}
+
+
+def _chunk_size_distribution(chunks: list) -> Dict[str, int]:
+    sizes = sorted(len(chunk) for chunk, _ in chunks) or [0]
+    return {
+        'min': sizes[0],
+        'median': int(statistics.median(sizes)),
+        'p95': sizes[min(len(sizes) - 1, int(len(sizes) * 0.95))],
+        'max': sizes[-1],
+    }
+
+
+def run_benchmark(name: str, target: Callable[[str], list], document: BenchmarkDocument,
+                  repeat: int = CHUNKER_BENCHMARK_REPEAT) -> Dict:
+    """
+    Time `target` on one document (best of `repeat` runs) and measure its peak memory.
+
+    Returns:
+        Dict with target, document, size, seconds, throughput (MB/s),
+        peak_memory_kb, chunks and chunk_sizes (min/median/p95/max)
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = target(document.content)
+        timings.append(time.perf_counter() - started)
+
+    # Separate run: tracing allocations slows the code down
+    tracemalloc.start()
+    try:
+        target(document.content)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    seconds = min(timings)
+    return {
+        'target': name,
+        'document': document.name,
+        'size': len(document.content),
+        'seconds': seconds,
+        'throughput': len(document.content) / (1024 * 1024) / seconds if seconds else float('inf'),
+        'peak_memory_kb': peak // 1024,
+        'chunks': len(chunks),
+        'chunk_sizes': _chunk_size_distribution(chunks),
+    }
+
+
+def run_benchmarks(corpus: List[BenchmarkDocument], targets: List[str] = None,
+                   repeat: int = CHUNKER_BENCHMARK_REPEAT) -> List[Dict]:
+    """Run every selected target on the corpus documents of the kinds it is meant for"""
+    results = []
+    for name, target in benchmark_targets().items():
+        if targets and name not in targets:
+            continue
+        for document in corpus:
+            if document.kind in TARGET_KINDS[name]:
+                results.append(run_benchmark(name, target, document, repeat))
+    return results
+
+
+def find_regressions(results: List[Dict], baseline: List[Dict], threshold: float) -> List[str]:
+    """
+    Compare throughput against a baseline run.
+
+    Args:
+        results: Current run_benchmarks() results
+        baseline: Results of an earlier run (e.g. loaded from JSON)
+        threshold: Allowed relative throughput drop (0.25 = 25% slower)
+
+    Returns:
+        A message for every target/document that regressed past the threshold
+    """
+    previous = {(row['target'], row['document']): row['throughput'] for row in baseline}
+    regressions = []
+    for row in results:
+        before = previous.get((row['target'], row['document']))
+        if before and row['throughput'] < before * (1 - threshold):
+            regressions.append(
+                f"{row['target']} on {row['document']}: {row['throughput']:.1f} MB/s, "
+                f"baseline {before:.1f} MB/s ({row['throughput'] / before - 1:+.0%})"
+            )
+    return regressions
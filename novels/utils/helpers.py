@@ -1,3 +1,5 @@
+import re
+import unicodedata
 from datetime import datetime
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -68,3 +70,16 @@ def count_words(text: str) -> int:
     # Split by whitespace and filter out empty strings
     words = text.split()
     return len(words)
+
+
+def fold_search_text(text: str) -> str:
+    """
+    Normalize text for search: lowercase, strip Vietnamese diacritics and
+    collapse punctuation, so "Tiểu Thuyết Đêm" and "tieu thuyet dem" match.
+    """
+    if not text:
+        return ''
+    text = text.lower().replace('đ', 'd')
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(re.findall(r'\w+', text))
@@ -1,193 +1,294 @@
 import re
-from typing import List, Tuple
-from bs4 import BeautifulSoup, NavigableString
-from constants import MAX_CHUNK_SIZE, HTML_TAG_OVERHEAD, BEAUTIFULSOUP_PARSER, HTML_BLOCK_ELEMENTS
+from bisect import bisect_right
+from html.parser import HTMLParser
+from typing import Iterator, List, Tuple
+from constants import MAX_CHUNK_SIZE, HTML_TAG_OVERHEAD, HTML_BLOCK_ELEMENTS, HTML_CHUNKER_FEED_SIZE
 from .helpers import count_words
 
+# Elements that never have an end tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+# Elements whose text is not part of the readable text (not counted as words)
+NON_TEXT_ELEMENTS = {'script', 'style', 'template'}
+
+
+class WordCounter:
+    """Count words (as str.split() would) over text that arrives in pieces."""
+
+    def __init__(self):
+        self.count = 0
+        self._in_word = False
+
+    def feed(self, text: str):
+        if not text:
+            return
+        words = len(text.split())
+        # A word cut in two by a piece boundary is still one word
+        if words and self._in_word and not text[0].isspace():
+            words -= 1
+        self.count += words
+        self._in_word = not text[-1].isspace()
+
+
+class _HtmlItem:
+    """A top-level node of the document: its source HTML, readable text and inner span."""
+
+    __slots__ = ('start', 'end', 'text', 'is_text', 'has_blocks', 'inner_start', 'inner_end')
+
+    def __init__(self, start: int, is_text: bool):
+        self.start = start
+        self.end = None
+        self.text = []
+        self.is_text = is_text
+        self.has_blocks = False
+        self.inner_start = None
+        self.inner_end = None
+
+
+class _TopLevelParser(HTMLParser):
+    """
+    Event-driven parser that cuts a document into top-level items.
+
+    Items are slices of the source, so nothing is re-serialized; the parser
+    only keeps the stack of open tags of the current item. The readable text
+    of every item is collected on the way, and the words of the whole
+    document are counted as it streams through.
+    """
+
+    def __init__(self, content: str):
+        super().__init__(convert_charrefs=True)
+        self.content = content
+        self._line_starts = [0] + [match.end() for match in re.finditer('\n', content)]
+        self._stack = []
+        self._item = None
+        self.items = []
+        self.words = WordCounter()
+
+    def _offset(self) -> int:
+        lineno, column = self.getpos()
+        return self._line_starts[lineno - 1] + column
+
+    def _begin_item(self, is_text: bool) -> _HtmlItem:
+        start = self._offset()
+        self._finish_item(start)
+        self._item = _HtmlItem(start, is_text)
+        return self._item
+
+    def _finish_item(self, end: int):
+        if self._item is not None:
+            self._item.end = end
+            if self._item.inner_start is not None and self._item.inner_end is None:
+                # Root element left unclosed: its content runs to the end of the item
+                self._item.inner_end = end
+            self.items.append(self._item)
+            self._item = None
+
+    def handle_starttag(self, tag, attrs):
+        if not self._stack:
+            item = self._begin_item(is_text=False)
+            if tag not in VOID_ELEMENTS:
+                item.inner_start = item.start + len(self.get_starttag_text())
+        elif tag in HTML_BLOCK_ELEMENTS:
+            self._item.has_blocks = True
+        if tag not in VOID_ELEMENTS:
+            self._stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if not self._stack:
+            self._begin_item(is_text=False)
+        elif tag in HTML_BLOCK_ELEMENTS:
+            self._item.has_blocks = True
+
+    def handle_endtag(self, tag):
+        if tag not in self._stack:
+            # Stray end tag, ignored like BeautifulSoup does
+            return
+        while self._stack.pop() != tag:
+            pass
+        if not self._stack and self._item.inner_start is not None:
+            self._item.inner_end = self._offset()
+
+    def handle_data(self, data):
+        if not self._stack:
+            if self._item is None or not self._item.is_text:
+                self._begin_item(is_text=True)
+        elif self._stack[-1] in NON_TEXT_ELEMENTS:
+            return
+        self._item.text.append(data)
+        self.words.feed(data)
+
+    def _handle_markup(self):
+        if not self._stack:
+            self._begin_item(is_text=False)
+
+    def handle_comment(self, data):
+        self._handle_markup()
+
+    def handle_decl(self, decl):
+        self._handle_markup()
+
+    def handle_pi(self, data):
+        self._handle_markup()
+
+    def unknown_decl(self, data):
+        self._handle_markup()
+
+    def close(self):
+        super().close()
+        self._finish_item(len(self.content))
+
+    def pop_items(self) -> List[_HtmlItem]:
+        items, self.items = self.items, []
+        return items
+
+
 class HtmlChunker:
     """
     A chunker specifically designed for HTML content that ensures each chunk contains valid HTML blocks.
+
+    The document is read in a single pass by an event-driven HTMLParser:
+    top-level nodes are grouped into chunks of at most max_chunk_size
+    characters as they are parsed, and chunk word counts and the total word
+    count are taken from the same traversal.
     """
-    
+
     def __init__(self, max_chunk_size: int = MAX_CHUNK_SIZE):
         """
         Initialize the HTML chunker.
-        
+
         Args:
             max_chunk_size: Maximum size of each chunk in characters (default: MAX_CHUNK_SIZE for MySQL TEXT)
         """
         self.max_chunk_size = max_chunk_size
-        
+
     def split_into_chunks(self, content: str) -> List[Tuple[str, int]]:
         """
         Split HTML content into chunks while maintaining valid HTML structure.
-        
+
         Args:
             content: The HTML content to chunk
-            
+
         Returns:
             List of tuples containing (chunk_content, word_count)
         """
+        return self.split_with_word_count(content)[0]
+
+    def split_with_word_count(self, content: str) -> Tuple[List[Tuple[str, int]], int]:
+        """
+        Split HTML content into chunks and count the words of the whole document.
+
+        Args:
+            content: The HTML content to chunk
+
+        Returns:
+            Tuple of (list of (chunk_content, word_count), total word count)
+        """
+        if not content or not content.strip():
+            return [], 0
+
+        parser = _TopLevelParser(self._normalize_html_content(content))
+        chunks = list(self._iter_chunks(parser))
+        return chunks, parser.words.count
+
+    def iter_chunks(self, content: str) -> Iterator[Tuple[str, int]]:
+        """
+        Yield (chunk_content, word_count) as soon as each chunk is complete.
+
+        Args:
+            content: The HTML content to chunk
+        """
         if not content or not content.strip():
-            return []
-            
-        # Clean and normalize HTML content
-        content = self._normalize_html_content(content)
-        
-        # Parse HTML content
-        soup = BeautifulSoup(content, BEAUTIFULSOUP_PARSER)
-        
-        # Get all top-level elements
-        elements = list(soup.children)
-        
-        # Group elements into chunks
-        chunks = self._create_html_chunks(elements)
-        
-        # Calculate word counts for each chunk and clean up
-        result = []
-        for chunk_html in chunks:
-            if chunk_html.strip():
-                word_count = count_words(self._extract_text_from_html(chunk_html))
-                result.append((chunk_html.strip(), word_count))
-                
-        return result
-    
+            return
+        yield from self._iter_chunks(_TopLevelParser(self._normalize_html_content(content)))
+
     def _normalize_html_content(self, content: str) -> str:
         """Normalize HTML content for proper chunking."""
         # Remove excessive whitespace between tags but preserve single spaces and line breaks
         # that might be important for word separation
         content = re.sub(r'>\s*\n\s*<', '> <', content)  # Replace newlines between tags with single space
         content = re.sub(r'>\s{2,}<', '> <', content)  # Replace multiple spaces between tags with single space
-        
+
         # Normalize line breaks in text content
         content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
-        
+
         # Remove empty paragraphs
         content = re.sub(r'<p[^>]*>\s*</p>', '', content)
-        
+
         return content.strip()
-    
-    def _create_html_chunks(self, elements: List) -> List[str]:
-        """Create chunks by grouping HTML elements."""
-        chunks = []
-        current_chunk_elements = []
+
+    def _iter_items(self, parser: _TopLevelParser) -> Iterator[_HtmlItem]:
+        """Feed the document to the parser piece by piece, yielding finished top-level items."""
+        content = parser.content
+        for offset in range(0, len(content), HTML_CHUNKER_FEED_SIZE):
+            parser.feed(content[offset:offset + HTML_CHUNKER_FEED_SIZE])
+            yield from parser.pop_items()
+        parser.close()
+        yield from parser.pop_items()
+
+    def _iter_chunks(self, parser: _TopLevelParser) -> Iterator[Tuple[str, int]]:
+        """Group top-level items into chunks of at most max_chunk_size characters."""
+        content = parser.content
+        current_items = []
         current_size = 0
-        
-        for element in elements:
-            if isinstance(element, NavigableString):
-                # Include all NavigableString elements, even whitespace-only ones,
-                # as they may be important for word separation
-                element_html = str(element)
-                element_size = len(element_html)
-            else:
-                element_html = str(element)
-                element_size = len(element_html)
-            
-            # Check if adding this element would exceed the chunk size
-            if current_size + element_size > self.max_chunk_size and current_chunk_elements:
-                # Finalize current chunk
-                chunk_html = ''.join(str(elem) for elem in current_chunk_elements)
-                if chunk_html.strip():
-                    chunks.append(chunk_html)
-                
-                # Start new chunk
-                current_chunk_elements = [element]
-                current_size = element_size
-            else:
-                # Add element to current chunk
-                current_chunk_elements.append(element)
-                current_size += element_size
-        
-        # Add the final chunk if it has content
-        if current_chunk_elements:
-            chunk_html = ''.join(str(elem) for elem in current_chunk_elements)
-            if chunk_html.strip():
-                chunks.append(chunk_html)
-        
-        # Ensure chunks don't exceed max size by splitting large elements if necessary
-        final_chunks = []
-        for chunk in chunks:
-            if len(chunk) <= self.max_chunk_size:
-                final_chunks.append(chunk)
+
+        for item in self._iter_items(parser):
+            item_size = item.end - item.start
+
+            # Check if adding this item would exceed the chunk size
+            if current_size + item_size > self.max_chunk_size and current_items:
+                yield from self._finish_chunk(content, current_items)
+                current_items = [item]
+                current_size = item_size
             else:
-                # Split large chunks more aggressively
-                split_chunks = self._split_large_chunk(chunk)
-                final_chunks.extend(split_chunks)
-        
-        return final_chunks
-    
-    def _split_large_chunk(self, chunk_html: str) -> List[str]:
-        """Split a large HTML chunk that exceeds the maximum size."""
-        chunks = []
-        soup = BeautifulSoup(chunk_html, BEAUTIFULSOUP_PARSER)
-        
-        # Try to split by paragraphs first
-        paragraphs = soup.find_all(HTML_BLOCK_ELEMENTS)
-        
-        if paragraphs and len(paragraphs) > 1:
-            # Split by paragraphs
-            current_elements = []
-            current_size = 0
-            
-            for p in paragraphs:
-                p_html = str(p)
-                p_size = len(p_html)
-                
-                if current_size + p_size > self.max_chunk_size and current_elements:
-                    chunk = ''.join(current_elements)
-                    if chunk.strip():
-                        chunks.append(chunk)
-                    current_elements = [p_html]
-                    current_size = p_size
-                else:
-                    current_elements.append(p_html)
-                    current_size += p_size
-            
-            if current_elements:
-                chunk = ''.join(current_elements)
-                if chunk.strip():
-                    chunks.append(chunk)
+                current_items.append(item)
+                current_size += item_size
+
+        if current_items:
+            yield from self._finish_chunk(content, current_items)
+
+    def _finish_chunk(self, content: str, items: List[_HtmlItem]) -> Iterator[Tuple[str, int]]:
+        chunk_html = content[items[0].start:items[-1].end]
+        if not chunk_html.strip():
+            return
+
+        if len(chunk_html) <= self.max_chunk_size:
+            words = WordCounter()
+            for item in items:
+                for text in item.text:
+                    words.feed(text)
+            yield chunk_html.strip(), words.count
         else:
-            # If we can't split by paragraphs, split by text content more aggressively
-            # This is a fallback for very long single elements
-            text_content = soup.get_text()
-            if len(text_content) > self.max_chunk_size:
-                # Split the text and wrap in simple paragraphs
-                words = text_content.split()
-                current_words = []
-                current_size = 0
-                
-                for word in words:
-                    word_size = len(word) + 1  # +1 for space
-                    
-                    if current_size + word_size > self.max_chunk_size - HTML_TAG_OVERHEAD and current_words:  # Buffer for HTML tags
-                        chunk_text = ' '.join(current_words)
-                        chunks.append(f'<p>{chunk_text}</p>')
-                        current_words = [word]
-                        current_size = word_size
-                    else:
-                        current_words.append(word)
-                        current_size += word_size
-                
-                if current_words:
-                    chunk_text = ' '.join(current_words)
-                    chunks.append(f'<p>{chunk_text}</p>')
+            # Only a single top-level item can exceed the limit on its own
+            yield from self._split_large_item(content, items[0])
+
+    def _split_large_item(self, content: str, item: _HtmlItem) -> Iterator[Tuple[str, int]]:
+        """Split a top-level item that exceeds the maximum size."""
+        if item.has_blocks and item.inner_start is not None:
+            # Chunk the element's children (block by block) without its wrapper tags
+            yield from self._iter_chunks(_TopLevelParser(content[item.inner_start:item.inner_end]))
+            return
+
+        text_content = ''.join(item.text)
+        if len(text_content) <= self.max_chunk_size:
+            # Chunk is not too long after all (markup-heavy), keep it as is
+            yield content[item.start:item.end].strip(), count_words(text_content)
+            return
+
+        # Split the text and wrap in simple paragraphs
+        current_words = []
+        current_size = 0
+        for word in text_content.split():
+            word_size = len(word) + 1  # +1 for space
+
+            if current_size + word_size > self.max_chunk_size - HTML_TAG_OVERHEAD and current_words:  # Buffer for HTML tags
+                yield f"<p>{' '.join(current_words)}</p>", len(current_words)
+                current_words = [word]
+                current_size = word_size
             else:
-                # Chunk is not too long after all, keep it as is
-                chunks.append(chunk_html)
-        
-        return chunks
-    
-    def _extract_text_from_html(self, html: str) -> str:
-        """Extract plain text from HTML for word counting."""
-        soup = BeautifulSoup(html, BEAUTIFULSOUP_PARSER)
-        return soup.get_text()
-    
-    def validate_html_chunk(self, chunk_html: str) -> bool:
-        """Validate that a chunk contains valid HTML."""
-        try:
-            soup = BeautifulSoup(chunk_html, BEAUTIFULSOUP_PARSER)
-            # Check if parsing was successful and no malformed tags
-            return bool(soup)
-        except Exception:
-            return False
+                current_words.append(word)
+                current_size += word_size
+
+        if current_words:
+            yield f"<p>{' '.join(current_words)}</p>", len(current_words)
@@ -0,0 +1,90 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+
+class PrefixIndex:
+    """
+    Thread-safe prefix lookup over a sorted array of (key, item_id) pairs.
+
+    Each item can be registered under several keys (e.g. a title, each of its
+    word suffixes and its author name). Lookups binary-search the first key
+    with the prefix and walk forward, so their cost depends on the number of
+    matches rather than on the size of the index.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[str, int]] = []
+        self._keys: Dict[int, List[str]] = {}
+        self._scores: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, item_id):
+        return item_id in self._keys
+
+    def load(self, items: Iterable[Tuple[int, Iterable[str], float]]):
+        """
+        Replace the whole index.
+
+        Args:
+            items: (item_id, keys, score) triples
+        """
+        entries, keys, scores = [], {}, {}
+        for item_id, item_keys, score in items:
+            item_keys = sorted(set(filter(None, item_keys)))
+            keys[item_id] = item_keys
+            scores[item_id] = score
+            entries.extend((key, item_id) for key in item_keys)
+        entries.sort()
+        with self._lock:
+            self._entries, self._keys, self._scores = entries, keys, scores
+
+    def _remove_locked(self, item_id):
+        for key in self._keys.pop(item_id, ()):
+            position = bisect_left(self._entries, (key, item_id))
+            if position < len(self._entries) and self._entries[position] == (key, item_id):
+                del self._entries[position]
+        self._scores.pop(item_id, None)
+
+    def add(self, item_id, keys: Iterable[str], score: float = 0):
+        """Insert or replace a single item"""
+        keys = sorted(set(filter(None, keys)))
+        with self._lock:
+            self._remove_locked(item_id)
+            for key in keys:
+                insort(self._entries, (key, item_id))
+            self._keys[item_id] = keys
+            self._scores[item_id] = score
+
+    def remove(self, item_id):
+        with self._lock:
+            self._remove_locked(item_id)
+
+    def search(self, prefix: str, limit: int, max_scan: int) -> List[int]:
+        """
+        Return up to `limit` item ids having a key that starts with `prefix`,
+        highest score first.
+
+        Args:
+            prefix: Normalized prefix to look up
+            limit: Number of ids to return
+            max_scan: Upper bound on the number of entries walked
+        """
+        if not prefix:
+            return []
+        matches = set()
+        with self._lock:
+            position = bisect_left(self._entries, (prefix,))
+            end = min(len(self._entries), position + max_scan)
+            while position < end:
+                key, item_id = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                matches.add(item_id)
+                position += 1
+            scores = self._scores
+            return heapq.nlargest(limit, matches, key=lambda item_id: (scores.get(item_id, 0), -item_id))
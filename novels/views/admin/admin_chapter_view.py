@@ -6,7 +6,8 @@ from django.urls import reverse
 from sympy import Q
 from common.decorators import website_admin_required
 from novels.models.chapter import Chapter
-from novels.services import ChapterService
+from novels.services import ChapterService, ChapterJobService
+from novels.utils import ChapterStreamer
 from django.core.paginator import Paginator
 from constants import (
     PAGINATOR_COMMON_LIST,
@@ -16,7 +17,6 @@ from constants import (
     DEFAULT_PAGE_NUMBER,
     DATE_FORMAT_DMY,
 )
-from novels.views.public.chapter_view import notify_favorites_chapter_approved
 
 @website_admin_required
 def request_chapter_admin(request):
@@ -81,7 +81,7 @@ def approve_chapter_view(request, chapter_slug):
     
     ChapterService.approve_chapter(chapter)
     if not was_approved and chapter.approved:
-        notify_favorites_chapter_approved(chapter)
+        ChapterJobService.enqueue_approved_notification(chapter)
 
     messages.success(request, _('Chương "%(title)s" đã được duyệt thành công!') % {'title': chapter.title})
     return redirect('admin:chapter_review', chapter_slug=chapter.slug)
@@ -118,7 +118,8 @@ def chapter_review(request, chapter_slug):
         messages.error(request, _('Chương không tồn tại.'))
         return redirect('admin:request_chapter_admin')
     
-    context = ChapterService.get_chapter_review_context(chapter)
+    # Long chapters are streamed to the reviewer instead of being built in memory
+    context = ChapterService.get_chapter_review_context(chapter, stream=True)
     
     context.update({
         'DATE_FORMAT_DMYHI': DATE_FORMAT_DMYHI,
@@ -136,4 +137,6 @@ def chapter_review(request, chapter_slug):
     else:
         context['unapproved_chapter_url'] = None
 
-    return render(request, 'admin/pages/chapter_review.html', context)
+    return ChapterStreamer.stream_response(
+        request, 'admin/pages/chapter_review.html', context, chapter
+    )
@@ -1,36 +1,54 @@
 import json
 import logging
+from datetime import datetime, timezone as dt_timezone
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, Http404
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_http_methods, condition
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
-from django.contrib.contenttypes.models import ContentType
-from common.utils.sse import send_notification_to_user
-from interactions.models.notification import Notification
+from common.utils.view_counter import record_view
+from common.utils.keyset import decode_cursor, InvalidCursor
 from novels.models import Novel, Chapter
-from novels.models.reading_favorite import Favorite
 from novels.models.volume import Volume
-from django.urls import reverse
-from asgiref.sync import async_to_sync
-from novels.services import ChapterService, ReadingService
+from novels.services import ChapterService, ReadingService, ChunkCacheService
 from novels.forms import ChapterForm
+from novels.utils import ChapterStreamer
 from constants import (
-    MAX_LIMIT_CHUNKS, START_POSITION_DEFAULT, PROGRESS_DEFAULT,
-    DATE_FORMAT_DMY, ApprovalStatus
+    MAX_LIMIT_CHUNKS, MAX_CHUNK_WINDOW_LIMIT, START_POSITION_DEFAULT, PROGRESS_DEFAULT,
+    DATE_FORMAT_DMY, ApprovalStatus, CHUNK_RESPONSE_MAX_AGE,
+    CHAPTER_STREAM_MODE
 )
 from common.decorators import require_active_novel
 
 @require_active_novel
 def chapter_detail_view(request, novel_slug, chapter_slug):
-    """Chapter detail view with lazy loading"""
+    """Chapter detail view with lazy loading (or the whole chapter streamed with ?mode=stream)"""
     chapter = ChapterService.get_chapter_for_user(chapter_slug, novel_slug, request.user)
     
-    initial_chunks = chapter.chunks.filter(
-        position__lte=MAX_LIMIT_CHUNKS
-    ).order_by('position')
+    # Buffered, flushed in bulk by the view count flusher
+    record_view(request, chapter)
+    record_view(request, chapter.volume.novel)
+    
+    # Chunk statistics are stored on the chapter
+    stats = ChapterService.get_chapter_chunks_stats(chapter)
+    stream = request.GET.get('mode') == CHAPTER_STREAM_MODE
+    if stream:
+        # Every chunk is written into the streamed page, nothing to lazy-load
+        initial_chunks, next_cursor = [], None
+        loaded_chunks = stats['total_chunks']
+    else:
+        # The first window comes from the chunk cache
+        content = ChunkCacheService.get_chapter_content(chapter)
+        initial_window = ChunkCacheService.get_window(
+            content, START_POSITION_DEFAULT, MAX_LIMIT_CHUNKS
+        )
+        initial_chunks = initial_window['chunks']
+        next_cursor = initial_window['next_cursor']
+        loaded_chunks = len(initial_chunks)
     
     # Get navigation
     navigation = ChapterService.get_chapter_navigation(chapter)
@@ -38,11 +56,8 @@ def chapter_detail_view(request, novel_slug, chapter_slug):
     # Get reading history
     reading_history = ReadingService.get_or_create_reading_history(request.user, chapter)
     
-    # Get all chapters for sidebar
-    all_chapters = ChapterService.get_all_chapters_for_novel(chapter.volume.novel, request.user)
-    
-    # Get chunk statistics
-    chunk_stats = ChapterService.get_chapter_chunks_stats(chapter)
+    # Sidebar chapters come from the same cached TOC as the navigation
+    all_chapters = ChapterService.get_sidebar_chapters(chapter.volume.novel, request.user)
     
     context = {
         "chapter": chapter,
@@ -53,45 +68,76 @@ def chapter_detail_view(request, novel_slug, chapter_slug):
         "prev_chapter": navigation['prev_chapter'],
         "reading_history": reading_history,
         "all_chapters": all_chapters,
-        "total_chunks": chunk_stats['total_chunks'],
-        "loaded_chunks": initial_chunks.count(),
-        "all_chunks_for_stats": chunk_stats['all_chunks'],
-        "avg_chunk_size": chunk_stats['avg_chunk_size'],
-        "max_chunk_words": chunk_stats['max_chunk_words'],
-        "estimated_reading_time": chunk_stats['estimated_reading_time'],
+        "total_chunks": stats['total_chunks'],
+        "loaded_chunks": loaded_chunks,
+        "next_cursor": next_cursor,
+        "avg_chunk_size": stats['avg_chunk_size'],
+        "max_chunk_words": stats['max_chunk_words'],
+        "char_count": stats['char_count'],
+        "estimated_reading_time": stats['estimated_reading_time'],
         "DATE_FORMAT_DMY": DATE_FORMAT_DMY
     }
+    if stream:
+        return ChapterStreamer.stream_response(
+            request, "novels/pages/chapter_details.html", context, chapter
+        )
     return render(request, "novels/pages/chapter_details.html", context)
 
+def _chunks_etag(request, chapter_id):
+    pointer = ChunkCacheService.get_pointer(chapter_id)
+    return ChunkCacheService.etag(chapter_id, pointer) if pointer else None
+
+def _chunks_last_modified(request, chapter_id):
+    pointer = ChunkCacheService.get_pointer(chapter_id)
+    if not pointer:
+        return None
+    content = ChunkCacheService.get_content(chapter_id, pointer['version'])
+    return datetime.fromtimestamp(content['built_at'], tz=dt_timezone.utc)
+
 @require_http_methods(["GET"])
+@condition(etag_func=_chunks_etag, last_modified_func=_chunks_last_modified)
 def load_more_chunks(request, chapter_id):
-    """AJAX endpoint to load more chunks"""
-    chapter = get_object_or_404(Chapter, id=chapter_id)
-    start_position = int(request.GET.get('start', START_POSITION_DEFAULT))
-    limit = int(request.GET.get('limit', MAX_LIMIT_CHUNKS))
-    
-    chunks = chapter.chunks.filter(
-        position__gte=start_position,
-        position__lt=start_position + limit
-    ).order_by('position')
-    
-    chunks_data = []
-    for chunk in chunks:
-        chunks_data.append({
-            'position': chunk.position,
-            'content': chunk.content,
-            'word_count': chunk.word_count,
-        })
-    
-    has_more = chapter.chunks.filter(
-        position__gte=start_position + limit
-    ).exists()
-    
-    return JsonResponse({
-        'chunks': chunks_data,
-        'has_more': has_more,
-        'next_start': start_position + limit
-    })
+    """
+    AJAX endpoint to load more chunks (served from the chunk cache).
+
+    The window is addressed by the opaque `cursor` of the previous window
+    (or a plain `start` position); `limit` is capped at MAX_CHUNK_WINDOW_LIMIT.
+    """
+    pointer = ChunkCacheService.get_pointer(chapter_id)
+    if pointer is None:
+        raise Http404
+    try:
+        if request.GET.get('cursor'):
+            start_position = int(decode_cursor(request.GET['cursor'])[1][0])
+        else:
+            start_position = int(request.GET.get('start', START_POSITION_DEFAULT))
+        limit = int(request.GET.get('limit', MAX_LIMIT_CHUNKS))
+    except (InvalidCursor, IndexError, TypeError, ValueError):
+        return HttpResponseBadRequest()
+    limit = max(1, min(limit, MAX_CHUNK_WINDOW_LIMIT))
+
+    content = ChunkCacheService.get_content(chapter_id, pointer['version'])
+    # Past the last chunk every window is the same empty one
+    last_position = content['positions'][-1] if content['positions'] else 0
+    start_position = max(START_POSITION_DEFAULT, min(start_position, last_position + 1))
+    # The window is JSON-encoded and compressed once, then served as cached bytes
+    payloads = ChunkCacheService.get_window_payloads(
+        chapter_id, pointer['version'], content, start_position, limit
+    )
+    encoding = ChunkCacheService.negotiate_encoding(request.headers.get('Accept-Encoding', ''), payloads)
+    response = HttpResponse(payloads[encoding], content_type='application/json')
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if encoding != 'identity':
+        response['Content-Encoding'] = encoding
+        # Same representation, different bytes: only a weak validator is correct
+        response['ETag'] = f"W/{quote_etag(ChunkCacheService.etag(chapter_id, pointer))}"
+
+    # Windows of a published chapter are identical for every reader
+    if pointer['public']:
+        patch_cache_control(response, public=True, max_age=CHUNK_RESPONSE_MAX_AGE)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 @login_required
 @require_http_methods(["POST"])
@@ -170,8 +216,7 @@ def chapter_delete_view(request, novel_slug, chapter_slug):
         return redirect('novels:novel_detail', novel_slug=novel_slug)
     
     # Perform soft delete
-    chapter.deleted_at = timezone.now()
-    chapter.save(update_fields=['deleted_at'])
+    ChapterService.soft_delete_chapter(chapter)
     
     messages.success(request, _("Chapter đã được xóa thành công."))
     return redirect('novels:novel_detail', novel_slug=novel_slug)
@@ -182,37 +227,4 @@ def chapter_upload_rules(request):
 
 logger = logging.getLogger(__name__)
 
-def notify_favorites_chapter_approved(chapter):
-    try:
-        novel = chapter.volume.novel
-        favorites_qs = Favorite.objects.filter(novel=novel).select_related("user")
-        content_type = ContentType.objects.get_for_model(chapter)
-
-        for fav in favorites_qs:
-            user = fav.user
-            notification = Notification.objects.create(
-                user=user,
-                type="NEW_CHAPTER",
-                title=_("Truyện '%(novel_name)s' có chương mới") % {"novel_name": novel.name},
-                content=_("Chương '%(chapter_title)s' vừa được duyệt và hiển thị.") % {"chapter_title": chapter.title},
-                content_type=content_type,
-                object_id=chapter.id,
-            )
-
-            redirect_url = reverse(
-                "novels:chapter_detail",
-                kwargs={"novel_slug": novel.slug, "chapter_slug": chapter.slug},
-            )
-
-            try:
-                async_to_sync(send_notification_to_user)(
-                    user_id=user.id,
-                    notification=notification,
-                    redirect_url=redirect_url,
-                )
-            except Exception as e:
-                logger.exception("Lỗi khi gửi SSE cho user %s: %s", user.id, e)
-
-    except Exception as e:
-        logger.exception("Lỗi khi tạo notification: %s", e)
 
@@ -9,7 +9,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from novels.models import Novel, Tag, novel
 from novels.models.reading_favorite import Favorite
-from novels.services import NovelService
+from novels.services import NovelService, NovelSuggestionService
 from novels.forms import NovelForm
 from django.core.paginator import Paginator
 from interactions.services import ReviewService
@@ -19,23 +19,23 @@ from constants import (
     MAX_TRUNCATED_REJECTED_REASON_LENGTH, PAGINATION_PAGE_RANGE,
     SUMMARY_TRUNCATE_WORDS, DEFAULT_RATING_AVERAGE, MIN_RATE, MAX_RATE,
     MAX_LENGTH_REVIEW_CONTENT, NOVEL_PER_PAGE, DEFAULT_PAGE_NUMBER,
-    NotificationTypeChoices, UserRole
+    NotificationTypeChoices, UserRole, SUGGEST_RESULTS_LIMIT, SUGGEST_MAX_RESULTS
 )
 from common.decorators import require_active_novel
 from novels.services.novel_service import FavoriteService, get_liked_novels
 from interactions.services.notification_service import NotificationService
-from common.utils import send_notification_to_user
-from asgiref.sync import async_to_sync
-from accounts.models.user import User
+from common.utils import record_view
 
 @require_active_novel
 def novel_detail(request, novel_slug):
     """Novel detail page using service"""
-    novel_data = NovelService.get_novel_detail(novel_slug, request.user)
+    # require_active_novel already loaded the novel
+    novel_data = NovelService.get_novel_detail(novel_slug, request.user, novel=request.novel)
 
     if not novel_data:
         return redirect("novels:home")
-    novel = get_object_or_404(Novel, slug=novel_slug)
+    novel = novel_data['novel']
+    record_view(request, novel)
     is_favorited = False
     if request.user.is_authenticated:
         is_favorited = Favorite.objects.filter(user=request.user, novel=novel).exists()
@@ -43,7 +43,7 @@ def novel_detail(request, novel_slug):
     
     user_has_reviewed = False
     if request.user.is_authenticated:
-        user_has_reviewed = ReviewService.has_user_reviewed_novel(request.user, novel_data['novel'])
+        user_has_reviewed = ReviewService.has_user_reviewed_novel(request.user, novel)
 
     context = {
         'is_owner': novel_data['is_owner'],
@@ -103,26 +103,16 @@ class NovelCreateView(LoginRequiredMixin, CreateView):
             self.object.tags.set(tags)
 
         if form.instance.approval_status == ApprovalStatus.PENDING.value:
-            admins = User.objects.filter(role=UserRole.WEBSITE_ADMIN.value)
-            for admin in admins:
-                # Tạo notification trong DB và gán related_object
-                notification = NotificationService.create_notification(
-                    user=admin,
-                    title=_("Có tiểu thuyết mới cần duyệt"),
-                    content=_("Người dùng %(username)s đã đăng tiểu thuyết '%(title)s'.") % {
-                        "username": self.request.user.username,
-                        "title": self.object.name,
-                    },
-                    notification_type=NotificationTypeChoices.SYSTEM,
-                )
-                # Gán đối tượng liên quan để attach_link có thể xử lý
-                notification.related_object = self.object
-
-                # Gửi SSE
-                async_to_sync(send_notification_to_user)(
-                    user_id=admin.id,
-                    notification=notification
-                )
+            NotificationService.notify_role(
+                UserRole.WEBSITE_ADMIN.value,
+                title=_("Có tiểu thuyết mới cần duyệt"),
+                content=_("Người dùng %(username)s đã đăng tiểu thuyết '%(title)s'.") % {
+                    "username": self.request.user.username,
+                    "title": self.object.name,
+                },
+                notification_type=NotificationTypeChoices.SYSTEM,
+                related_object=self.object,
+            )
 
 
         return response
@@ -336,12 +326,23 @@ def search_novels(request):
     
     return render(request, 'novels/pages/search_results.html', context)
 
+def suggest_novels(request):
+    """Search-as-you-type suggestions served from the in-memory prefix index"""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = int(request.GET.get('limit', SUGGEST_RESULTS_LIMIT))
+    except (TypeError, ValueError):
+        limit = SUGGEST_RESULTS_LIMIT
+    limit = max(1, min(limit, SUGGEST_MAX_RESULTS))
+
+    return JsonResponse({'results': NovelSuggestionService.suggest(query, limit)})
+
 @login_required
 def toggle_like(request, novel_slug):
     novel = get_object_or_404(Novel, slug=novel_slug)
     liked = FavoriteService.toggle_like(request.user, novel)
     if request.headers.get("x-requested-with") == "XMLHttpRequest":
-        return JsonResponse({"liked": liked, "count": novel.favorites.count()})
+        return JsonResponse({"liked": liked, "count": novel.favorite_count})
     return redirect('novels:novel_detail', novel_slug=novel.slug)
 
 @login_required
@@ -7,4 +7,19 @@ python manage.py collectstatic --noinput
 echo "Running database migrations..."
 python manage.py migrate --noinput
 
+echo "Creating cache table..."
+python manage.py createcachetable
+
+echo "Rebuilding search index..."
+python manage.py rebuild_search_index
+
+echo "Backfilling chapter chunk stats..."
+python manage.py backfill_chapter_stats
+
+echo "Reconciling novel rating/favorite stats..."
+python manage.py reconcile_novel_stats
+
+echo "Warming homepage snapshot..."
+python manage.py warm_home_snapshot
+
 echo "Deployment preparation complete!"
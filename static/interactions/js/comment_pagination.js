@@ -2,9 +2,10 @@ $(document).ready(function () {
     const container = $("#comment-container");
     const commentsUrl = container.data("url"); // URL từ data-url
 
-    function loadComments(page = 1) {
+    // Trang đầu: cursor rỗng; các trang sau dùng cursor do server trả về
+    function loadComments(cursor = "") {
         $.ajax({
-            url: `${commentsUrl}?page=${page}`,
+            url: `${commentsUrl}?cursor=${encodeURIComponent(cursor)}`,
             type: "GET",
             success: function (data) {
                 container.html(data.html);
@@ -19,16 +20,14 @@ $(document).ready(function () {
     loadComments();
 
     // Bắt sự kiện phân trang (match class trong template)
-    $(document).on("click", ".paging_item[data-page]:not(.disabled)", function (e) {
+    $(document).on("click", ".paging_item[data-cursor]:not(.disabled)", function (e) {
         e.preventDefault();
-        const page = $(this).data("page");
+        const cursor = $(this).attr("data-cursor");
 
-        if ($(this).hasClass("disabled") || !page) {
+        if ($(this).hasClass("disabled") || !cursor) {
         return;
         }
         
-        if (page) {
-            loadComments(page);
-        }
+        loadComments(cursor);
     });
 });
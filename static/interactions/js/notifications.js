@@ -6,6 +6,7 @@ class SSENotificationManager {
         this.reconnectDelay = 5000;
         this.notificationSound = null;
         this.keepAliveInterval = null;
+        this.lastEventId = null;
         
         this.init();
     }
@@ -27,7 +28,11 @@ class SSENotificationManager {
         }
         
         try {
-            this.eventSource = new EventSource('/interactions/sse/stream/');
+            // A new EventSource does not send Last-Event-ID, pass it so missed events are replayed
+            const url = this.lastEventId
+                ? `/interactions/sse/stream/?last_event_id=${encodeURIComponent(this.lastEventId)}`
+                : '/interactions/sse/stream/';
+            this.eventSource = new EventSource(url);
             
             this.eventSource.onopen = () => {
                 // console.log('✅ SSE Connected');
@@ -37,6 +42,9 @@ class SSENotificationManager {
             };
             
             this.eventSource.onmessage = (event) => {
+                if (event.lastEventId) {
+                    this.lastEventId = event.lastEventId;
+                }
                 try {
                     const data = JSON.parse(event.data);
                     this.handleNotification(data);
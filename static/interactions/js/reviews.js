@@ -1,7 +1,7 @@
 class NovelReviews {
     constructor(novelSlug) {
         this.novelSlug = novelSlug;
-        this.currentPage = 1;
+        this.nextCursor = '';
         this.isLoading = false;
         this.hasMore = true;
         this.currentFilters = {
@@ -225,7 +225,7 @@ class NovelReviews {
     }
     
     resetAndLoad() {
-        this.currentPage = 1;
+        this.nextCursor = '';
         this.hasMore = true;
         $('#reviews-list').empty();
         $('.load-more-container').hide();
@@ -261,13 +261,12 @@ class NovelReviews {
     async loadMoreReviews() {
         if (!this.hasMore || this.isLoading) return;
         
-        this.currentPage++;
         await this.loadReviews();
     }
     
     buildUrl() {
         const params = new URLSearchParams({
-            page: this.currentPage,
+            cursor: this.nextCursor,
             rating: this.currentFilters.rating,
             sort: this.currentFilters.sort
         });
@@ -305,6 +304,7 @@ class NovelReviews {
         
         // Update pagination state
         this.hasMore = data.has_next;
+        this.nextCursor = data.next_cursor || '';
         
         if (this.hasMore) {
             $('.load-more-container').show();
@@ -322,7 +322,7 @@ class NovelReviews {
         }
         
         // Update review count
-        $('.review-count').text(`(${data.total_reviews})`);
+        $('.review-count').text(`(${data.total_reviews}${data.total_reviews_capped ? '+' : ''})`);
     }
     
     renderReview(review) {
@@ -5,6 +5,7 @@ class ChapterReader {
         this.chapterId = data.chapterId;
         this.totalChunks = data.totalChunks;
         this.loadedChunks = data.loadedChunks;
+        this.nextCursor = data.nextCursor;
         this.isAuthenticated = data.isAuthenticated;
 
         this.currentChunk = 1;
@@ -104,14 +105,14 @@ class ChapterReader {
     }
 
     async loadMoreChunks() {
-        if (this.loadedChunks >= this.totalChunks || this.isLoading) return;
+        if (!this.nextCursor || this.isLoading) return;
 
         this.isLoading = true;
         document.getElementById('loadingIndicator').style.display = 'block';
 
         try {
             const response = await fetch(
-                `/novels/ajax/load-chunks/${this.chapterId}/?start=${this.loadedChunks}&limit=5`
+                `/novels/ajax/load-chunks/${this.chapterId}/?cursor=${encodeURIComponent(this.nextCursor)}&limit=5`
             );
             const data = await response.json();
 
@@ -123,6 +124,7 @@ class ChapterReader {
             });
 
             this.loadedChunks += data.chunks.length;
+            this.nextCursor = data.next_cursor;
 
         } catch (error) {
             console.error('Error loading chunks:', error);
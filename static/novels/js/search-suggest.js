@@ -0,0 +1,41 @@
+// Search-as-you-type suggestions for inputs with a data-suggest-url attribute
+$(document).ready(function () {
+  const DEBOUNCE_MS = 150;
+
+  $("input[data-suggest-url]").each(function () {
+    const $input = $(this);
+    const $list = $("#" + $input.attr("list"));
+    const suggestUrl = $input.data("suggest-url");
+    const novelUrls = {};
+    let timer = null;
+    let pending = null;
+
+    $input.on("input", function () {
+      const query = $input.val().trim();
+      clearTimeout(timer);
+
+      if (novelUrls[query]) {
+        // A suggestion was picked: open the novel directly
+        window.location.href = novelUrls[query];
+        return;
+      }
+      if (!query) {
+        $list.empty();
+        return;
+      }
+
+      timer = setTimeout(function () {
+        if (pending) {
+          pending.abort();
+        }
+        pending = $.getJSON(suggestUrl, { q: query }, function (data) {
+          $list.empty();
+          data.results.forEach(function (novel) {
+            novelUrls[novel.name] = novel.url;
+            $list.append($("<option>").attr("value", novel.name));
+          });
+        });
+      }, DEBOUNCE_MS);
+    });
+  });
+});